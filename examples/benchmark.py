@@ -11,6 +11,18 @@ for row in rows:
 	evaluator.evaluate(row)
 """
 
+evaluatePrepared_stmt = """
+names = [inputField.getName() for inputField in evaluator.getInputFields()]
+prepared = evaluator.prepare(names)
+for row in df[names].itertuples(index = False):
+	prepared(row)
+"""
+
+evaluateRecords_stmt = """
+rows = df.to_dict(orient = "records")
+evaluator.evaluateRecords(rows, parallelism = 1)
+"""
+
 evaluateAll_stmt = """
 evaluator.evaluateAll(df, parallelism = 1)
 """
@@ -29,6 +41,10 @@ def benchmark(evaluator, df):
 
 	_run(evaluate_stmt)
 
+	_run(evaluatePrepared_stmt)
+
+	_run(evaluateRecords_stmt)
+
 	_run(evaluateAll_stmt)
 	_run(evaluateAll_stmt.replace("parallelism = 1", "parallelism = -1"))
 
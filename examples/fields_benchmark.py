@@ -0,0 +1,65 @@
+from jpmml_evaluator import make_evaluator
+from timeit import Timer
+
+import numpy
+import pandas
+import statistics
+import sys
+
+# A softmax regression model with one probability output field per class
+def make_pmml(classes, features):
+	rng = numpy.random.default_rng(0)
+	lines = []
+	lines.append("<PMML xmlns=\"http://www.dmg.org/PMML-4_4\" version=\"4.4\">")
+	lines.append("\t<Header/>")
+	lines.append("\t<DataDictionary>")
+	for i in range(features):
+		lines.append("\t\t<DataField name=\"x{}\" optype=\"continuous\" dataType=\"double\"/>".format(i))
+	lines.append("\t\t<DataField name=\"y\" optype=\"categorical\" dataType=\"string\">")
+	for j in range(classes):
+		lines.append("\t\t\t<Value value=\"c{}\"/>".format(j))
+	lines.append("\t\t</DataField>")
+	lines.append("\t</DataDictionary>")
+	lines.append("\t<RegressionModel functionName=\"classification\" normalizationMethod=\"softmax\">")
+	lines.append("\t\t<MiningSchema>")
+	lines.append("\t\t\t<MiningField name=\"y\" usageType=\"target\"/>")
+	for i in range(features):
+		lines.append("\t\t\t<MiningField name=\"x{}\"/>".format(i))
+	lines.append("\t\t</MiningSchema>")
+	lines.append("\t\t<Output>")
+	for j in range(classes):
+		lines.append("\t\t\t<OutputField name=\"probability(c{0})\" optype=\"continuous\" dataType=\"double\" feature=\"probability\" value=\"c{0}\"/>".format(j))
+	lines.append("\t\t</Output>")
+	for j in range(classes):
+		lines.append("\t\t<RegressionTable intercept=\"{}\" targetCategory=\"c{}\">".format(rng.normal(), j))
+		for i in range(features):
+			lines.append("\t\t\t<NumericPredictor name=\"x{}\" coefficient=\"{}\"/>".format(i, rng.normal()))
+		lines.append("\t\t</RegressionTable>")
+	lines.append("\t</RegressionModel>")
+	lines.append("</PMML>")
+	return "\n".join(lines)
+
+def benchmark(evaluator, df, fields):
+	rows = df.to_dict(orient = "records")
+
+	def _run(name, func, number):
+		timings = Timer(func).repeat(repeat = 5, number = number)
+		print("{}: median {:.6f}s".format(name, statistics.median(timings) / number))
+
+	print("fields: {}".format("all" if fields is None else fields))
+	_run("evaluate", lambda: [evaluator.evaluate(row, fields = fields) for row in rows[:100]], number = 10)
+	_run("evaluateAll", lambda: evaluator.evaluateAll(df, parallelism = 1, fields = fields), number = 10)
+
+if __name__ == "__main__":
+	backend = sys.argv[1] if len(sys.argv) > 1 else "jpype"
+	classes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+	features = 10
+
+	evaluator = make_evaluator(make_pmml(classes, features), backend = backend) \
+		.verify()
+
+	rng = numpy.random.default_rng(1)
+	df = pandas.DataFrame(rng.normal(size = (10000, features)), columns = ["x{}".format(i) for i in range(features)])
+
+	benchmark(evaluator, df, None)
+	benchmark(evaluator, df, ["y", "probability(c0)"])
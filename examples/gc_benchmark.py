@@ -0,0 +1,60 @@
+from jpmml_evaluator import JVMOptions
+
+import json
+import statistics
+import subprocess
+import sys
+
+# Every garbage collector is benchmarked in a fresh Python process, because a JVM can be started only once per process
+run_stmt = """
+import json, sys, time
+
+import pandas
+
+from jpmml_evaluator import make_backend, make_evaluator, JVMOptions
+
+pmml_file, csv_file, backend, gc, max_heap, batch_size, repeat = sys.argv[1:]
+batch_size = int(batch_size)
+repeat = int(repeat)
+
+backend = make_backend(backend, jvm_options = JVMOptions(max_heap = max_heap, gc = gc))
+evaluator = make_evaluator(pmml_file, backend = backend).verify()
+
+df = pandas.read_csv(csv_file)
+df = pandas.concat([df] * (batch_size // len(df) + 1), ignore_index = True)[0:batch_size]
+
+# Warm up the JIT compiler
+for i in range(max(repeat // 10, 10)):
+	evaluator.evaluateAll(df)
+
+timings = []
+for i in range(repeat):
+	begin = time.perf_counter()
+	evaluator.evaluateAll(df)
+	timings.append(time.perf_counter() - begin)
+
+print(json.dumps(timings))
+"""
+
+def benchmark(pmml_file, csv_file, backend, gc, max_heap, batch_size, repeat):
+	output = subprocess.run([sys.executable, "-c", run_stmt, pmml_file, csv_file, backend, gc, max_heap, str(batch_size), str(repeat)], check = True, stdout = subprocess.PIPE, stderr = subprocess.DEVNULL).stdout
+	timings = sorted(json.loads(output.decode("utf-8").strip().splitlines()[-1]))
+
+	def _percentile(p):
+		return timings[min(int(len(timings) * p), len(timings) - 1)]
+
+	print("{}".format(gc))
+	print("throughput: {:.0f} rows/s".format(batch_size * len(timings) / sum(timings)))
+	print("latency: median {:.6f}s, p99 {:.6f}s, max {:.6f}s".format(statistics.median(timings), _percentile(0.99), timings[-1]))
+
+if __name__ == "__main__":
+	pmml_file = sys.argv[1]
+	csv_file = sys.argv[2]
+	backend = sys.argv[3] if len(sys.argv) > 3 else "jpype"
+	gcs = sys.argv[4].split(",") if len(sys.argv) > 4 else ["serial", "parallel", "g1", "zgc"]
+	max_heap = sys.argv[5] if len(sys.argv) > 5 else "1g"
+
+	for gc in gcs:
+		if gc.lower() not in JVMOptions.GCS:
+			raise ValueError("Garbage collector {0} not in {1}".format(gc, list(JVMOptions.GCS)))
+		benchmark(pmml_file, csv_file, backend, gc, max_heap, batch_size = 10000, repeat = 200)
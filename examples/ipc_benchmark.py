@@ -0,0 +1,82 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Simulates a pre-fork web server, where every worker process loads the same model and evaluates single records.
+# Every worker is a fresh Python process, because a JPype JVM can be started only once per process
+run_stmt = """
+import json, sys, time
+
+import pandas
+
+from jpmml_evaluator import make_evaluator
+
+pmml_file, csv_file, backend, repeat = sys.argv[1:]
+repeat = int(repeat)
+
+begin = time.perf_counter()
+evaluator = make_evaluator(pmml_file, backend = backend).verify()
+load_time = time.perf_counter() - begin
+
+# The process that hosts the JVM (the worker itself, the Py4J gateway, or the shared scoring JVM)
+jvm_pid = int(str(evaluator.backend.staticInvoke("java.lang.ProcessHandle", "current").pid()))
+
+rows = pandas.read_csv(csv_file).to_dict(orient = "records")
+
+begin = time.perf_counter()
+for i in range(repeat):
+	for row in rows:
+		evaluator.evaluate(row)
+evaluate_time = time.perf_counter() - begin
+
+print(json.dumps({"load_time" : load_time, "evaluate_time" : evaluate_time, "rows" : repeat * len(rows), "jvm_pid" : jvm_pid}), flush = True)
+
+# Keep the JVM alive until the parent process has measured its memory usage
+sys.stdin.read()
+"""
+
+def _rss_mb(pid):
+	try:
+		with open("/proc/{0}/status".format(pid)) as status:
+			for line in status:
+				if line.startswith("VmRSS:"):
+					return int(line.split()[1]) / 1024.0
+	except OSError:
+		pass
+	return None
+
+def benchmark(pmml_file, csv_file, backend, workers, repeat):
+	processes = [subprocess.Popen([sys.executable, "-c", run_stmt, pmml_file, csv_file, backend, str(repeat)], stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = subprocess.DEVNULL) for i in range(workers)]
+	results = []
+	try:
+		for process in processes:
+			line = process.stdout.readline()
+			if not line:
+				raise RuntimeError("Worker process exited with code {0}".format(process.wait()))
+			results.append(json.loads(line.decode("utf-8")))
+		# Measure the JVM memory while all workers are still alive
+		jvm_pids = set(result["jvm_pid"] for result in results)
+		jvm_rss = [_rss_mb(pid) for pid in jvm_pids]
+	finally:
+		for process in processes:
+			process.stdin.close()
+			process.wait()
+
+	rows = sum(result["rows"] for result in results)
+	print("{}".format(backend))
+	print("workers: {}, JVMs: {}".format(workers, len(jvm_pids)))
+	print("model load: median {:.3f}s, max {:.3f}s".format(statistics.median(result["load_time"] for result in results), max(result["load_time"] for result in results)))
+	print("evaluate: {:.0f} rows/s (all workers)".format(rows / max(result["evaluate_time"] for result in results)))
+	if None not in jvm_rss:
+		print("JVM memory: {:.0f} MB RSS (all JVMs)".format(sum(jvm_rss)))
+
+if __name__ == "__main__":
+	pmml_file = sys.argv[1]
+	csv_file = sys.argv[2]
+	backends = sys.argv[3].split(",") if len(sys.argv) > 3 else ["jpype", "py4j", "ipc"]
+	workers = int(sys.argv[4]) if len(sys.argv) > 4 else (os.cpu_count() or 1)
+
+	for backend in backends:
+		benchmark(pmml_file, csv_file, backend, workers = workers, repeat = 10)
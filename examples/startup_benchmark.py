@@ -0,0 +1,51 @@
+from jpmml_evaluator import cds
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Every run takes place in a fresh Python process, because a JVM can be started only once per process
+run_stmt = """
+import json, sys, time
+
+begin = time.perf_counter()
+import jpmml_evaluator
+imported = time.perf_counter()
+backend = jpmml_evaluator.make_backend(sys.argv[2])
+started = time.perf_counter()
+jpmml_evaluator.make_evaluator(sys.argv[1], backend = backend).verify()
+loaded = time.perf_counter()
+
+print(json.dumps({"import" : imported - begin, "jvm" : started - imported, "model" : loaded - started}))
+"""
+
+def benchmark(pmml_file, backend, archive, repeat):
+	env = dict(os.environ)
+	if archive is not None:
+		env["JPMML_EVALUATOR_CDS_ARCHIVE"] = archive
+	else:
+		# Point to a non-existing file, in order to disable the default archive (if any)
+		env["JPMML_EVALUATOR_CDS_ARCHIVE"] = os.devnull + ".jsa"
+	timings = []
+	for i in range(repeat):
+		output = subprocess.run([sys.executable, "-c", run_stmt, pmml_file, backend], env = env, check = True, stdout = subprocess.PIPE, stderr = subprocess.DEVNULL).stdout
+		timings.append(json.loads(output.decode("utf-8").strip().splitlines()[-1]))
+	for phase in ["import", "jvm", "model"]:
+		print("{}: median {:.3f}s".format(phase, statistics.median(timing[phase] for timing in timings)))
+
+if __name__ == "__main__":
+	pmml_file = sys.argv[1]
+	backend = sys.argv[2] if len(sys.argv) > 2 else "jpype"
+	repeat = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+
+	print("Without AppCDS archive")
+	benchmark(pmml_file, backend, None, repeat)
+
+	archive = cds.make_archive([pmml_file], path = os.path.join(os.path.dirname(os.path.abspath(pmml_file)), "startup_benchmark.jsa"))
+	try:
+		print("With AppCDS archive")
+		benchmark(pmml_file, backend, str(archive), repeat)
+	finally:
+		os.remove(archive)
@@ -0,0 +1,45 @@
+from concurrent.futures import ThreadPoolExecutor
+from jpmml_evaluator import make_evaluator
+
+import os
+import pandas
+import sys
+import time
+
+# Every thread evaluates all rows using the same (shared) evaluator
+def _evaluate(evaluator, rows, repeat):
+	for i in range(repeat):
+		for row in rows:
+			evaluator.evaluate(row)
+
+def benchmark(evaluator, rows, threads, repeat):
+	with ThreadPoolExecutor(max_workers = threads) as executor:
+		begin = time.perf_counter()
+		futures = [executor.submit(_evaluate, evaluator, rows, repeat) for i in range(threads)]
+		for future in futures:
+			future.result()
+		return (threads * repeat * len(rows)) / (time.perf_counter() - begin)
+
+if __name__ == "__main__":
+	pmml_file = sys.argv[1]
+	csv_file = sys.argv[2]
+	backend = sys.argv[3] if len(sys.argv) > 3 else "jpype"
+	max_threads = int(sys.argv[4]) if len(sys.argv) > 4 else (os.cpu_count() or 1)
+
+	evaluator = make_evaluator(pmml_file, backend = backend) \
+		.verify()
+	print(evaluator)
+
+	rows = pandas.read_csv(csv_file).to_dict(orient = "records")
+
+	# Warm up
+	benchmark(evaluator, rows, threads = 1, repeat = 10)
+
+	threads = 1
+	baseline = None
+	while threads <= max_threads:
+		throughput = benchmark(evaluator, rows, threads = threads, repeat = 10)
+		if baseline is None:
+			baseline = throughput
+		print("threads: {}, evaluate: {:.0f} rows/s, speedup: {:.2f}x".format(threads, throughput, throughput / baseline))
+		threads *= 2
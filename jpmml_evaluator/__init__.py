@@ -1,55 +1,217 @@
+import math
 import os
 import pickle
+import random
+import statistics
+import time
+import warnings
 
 from abc import abstractmethod, abstractclassmethod, ABC
-from pandas import DataFrame, Series
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
+from threading import Lock
+from weakref import WeakKeyDictionary
 
-import numpy
-
+from .batching import BatchingEvaluator
+from .sharding import ShardedEvaluator, WorkerError
+from .cache import EvaluatorCache, TranspilerCache
 from .metadata import __copyright__, __license__, __version__
 
-def _canonicalize(arguments, nan_as_missing):
-	if nan_as_missing:
-		for key, value in arguments.items():
-			arguments[key] = (None if (isinstance(value, (float, numpy.single, numpy.double)) and numpy.isnan(value)) else value)
-	return arguments
-
-def _canonicalizeAll(arguments_df, nan_as_missing):
-	if nan_as_missing:
-		arguments_df = arguments_df.replace({numpy.nan: None})
-	return arguments_df
-
 class PythonEvaluatorUtil:
 	JAVA_CLASS_NAME = "org.jpmml.evaluator.python.PythonEvaluatorUtil"
 
+	# Mirrors PythonEvaluatorUtil#MAX_PARALLELISM
+	MAX_PARALLELISM = 256
+
 	def __init__(self):
 		raise RuntimeError()
 
 	@staticmethod
-	def evaluate(backend, javaEvaluator, arguments, dropColumns):
+	def evaluate(backend, javaEvaluator, arguments, javaDropColumns, nan_as_missing = True):
 		arguments = backend.dumps(arguments)
-		dropColumns = backend.newArray("java.lang.String", dropColumns) if dropColumns else None
 		try:
-			results = backend.staticInvoke(PythonEvaluatorUtil.JAVA_CLASS_NAME, "evaluate", javaEvaluator, arguments, dropColumns)
+			results = backend.staticInvoke(PythonEvaluatorUtil.JAVA_CLASS_NAME, "evaluate", javaEvaluator, arguments, nan_as_missing, javaDropColumns)
 		except Exception as e:
 			raise backend.toJavaError(e)
 		results = backend.loads(results)
 		return results
 
 	@staticmethod
-	def evaluateAll(backend, javaEvaluator, arguments_dict, dropColumns, parallelism):
+	def evaluateAll(backend, javaEvaluator, arguments_dict, nan_as_missing, javaDropColumns, parallelism):
 		arguments_dict = backend.dumps(arguments_dict)
-		dropColumns = backend.newArray("java.lang.String", dropColumns) if dropColumns else None
 		try:
-			results_dict = backend.staticInvoke(PythonEvaluatorUtil.JAVA_CLASS_NAME, "evaluateAll", javaEvaluator, arguments_dict, dropColumns, parallelism)
+			results_dict = backend.staticInvoke(PythonEvaluatorUtil.JAVA_CLASS_NAME, "evaluateAll", javaEvaluator, arguments_dict, nan_as_missing, javaDropColumns, parallelism)
+		except Exception as e:
+			raise backend.toJavaError(e)
+		results_dict = backend.loads(results_dict)
+		return results_dict
+
+	@staticmethod
+	def evaluateRecords(backend, javaEvaluator, records, nan_as_missing, javaDropColumns, parallelism):
+		records = backend.dumps(records)
+		try:
+			results_dict = backend.staticInvoke(PythonEvaluatorUtil.JAVA_CLASS_NAME, "evaluateRecords", javaEvaluator, records, nan_as_missing, javaDropColumns, parallelism)
 		except Exception as e:
 			raise backend.toJavaError(e)
 		results_dict = backend.loads(results_dict)
 		return results_dict
 
+	@staticmethod
+	def evaluateFile(backend, javaEvaluator, input_path, output_path, sep, javaDropColumns, error_col, batch_size, parallelism):
+		try:
+			count = backend.staticInvoke(PythonEvaluatorUtil.JAVA_CLASS_NAME, "evaluateFile", javaEvaluator, os.fspath(input_path), os.fspath(output_path), sep, javaDropColumns, error_col, batch_size, parallelism)
+		except Exception as e:
+			raise backend.toJavaError(e)
+		return int(count)
+
+	@staticmethod
+	def evaluateAllColumnar(backend, javaEvaluator, arguments_table, nan_as_missing, javaDropColumns, parallelism):
+		try:
+			results_table = backend.staticInvoke(PythonEvaluatorUtil.JAVA_CLASS_NAME, "evaluateAllColumnar", javaEvaluator, arguments_table, nan_as_missing, javaDropColumns, parallelism)
+		except Exception as e:
+			raise backend.toJavaError(e)
+		results_dict = backend.loadsColumnar(results_table)
+		return results_dict
+
+	@staticmethod
+	def encodeAllBuffers(backend, arguments_df, resultFields):
+		import numpy
+		from . import columnar
+		numberOfRows = len(arguments_df)
+		columns, values, masks, other_df = columnar.splitBuffers(arguments_df)
+		resultColumns = []
+		resultValues = []
+		resultMasks = []
+		for resultField in resultFields:
+			dataType = resultField.getDataType()
+			if dataType in ("double", "float"):
+				dtype = "<f8"
+			elif dataType == "integer":
+				dtype = "<i8"
+			else:
+				continue
+			resultColumns.append(resultField.getName())
+			resultValues.append(numpy.empty(numberOfRows, dtype = dtype))
+			resultMasks.append(numpy.empty(numberOfRows, dtype = numpy.uint8))
+		return {
+			"table" : backend.dumpsColumnar(other_df),
+			"columns" : columns,
+			"values" : values,
+			"masks" : masks,
+			"resultColumns" : resultColumns,
+			"resultValues" : resultValues,
+			"resultMasks" : resultMasks
+		}
+
+	@staticmethod
+	def evaluateAllBuffers(backend, javaEvaluator, arguments_buffers, nan_as_missing, javaDropColumns, resultFields, parallelism):
+		resultColumns = arguments_buffers["resultColumns"]
+		resultValues = arguments_buffers["resultValues"]
+		resultMasks = arguments_buffers["resultMasks"]
+		# The NumPy arrays must stay referenced until the call returns
+		javaValues = backend.newArray("java.nio.Buffer", [backend.newBuffer(value) for value in arguments_buffers["values"]])
+		javaMasks = backend.newArray("java.nio.ByteBuffer", [(backend.newBuffer(mask) if mask is not None else None) for mask in arguments_buffers["masks"]])
+		javaResultValues = backend.newArray("java.nio.Buffer", [backend.newBuffer(resultValue) for resultValue in resultValues])
+		javaResultMasks = backend.newArray("java.nio.ByteBuffer", [backend.newBuffer(resultMask) for resultMask in resultMasks])
+		try:
+			results_table = backend.staticInvoke(PythonEvaluatorUtil.JAVA_CLASS_NAME, "evaluateAllBuffers", javaEvaluator, arguments_buffers["table"], backend.newArray("java.lang.String", arguments_buffers["columns"]), javaValues, javaMasks, nan_as_missing, javaDropColumns, parallelism, backend.newArray("java.lang.String", resultColumns), javaResultValues, javaResultMasks)
+		except Exception as e:
+			raise backend.toJavaError(e)
+		from . import columnar
+		results_dict = backend.loadsColumnar(results_table)
+		data = dict(zip(results_dict["columns"], results_dict["data"]))
+		for resultColumn, resultValue, resultMask in zip(resultColumns, resultValues, resultMasks):
+			data[resultColumn] = columnar.maskValues(resultValue, resultMask.view(bool))
+		columns = [resultField.getName() for resultField in resultFields]
+		results_dict["columns"] = columns
+		results_dict["data"] = [data[column] for column in columns]
+		return results_dict
+
+class JVMOptions(object):
+	""" JVM startup options.
+
+	The options take effect only if the JVM is started by the Java backend, which happens once per process (JPype and PyJNIus) or once per gateway (Py4J).
+
+	Parameters:
+	----------
+	max_heap: string, optional
+		The maximum heap size (eg. "2g"). Maps to `-Xmx`.
+
+	initial_heap: string, optional
+		The initial heap size. Maps to `-Xms`.
+
+	gc: string, optional
+		The garbage collector. One of 'serial', 'parallel', 'g1', 'zgc' or 'shenandoah'.
+
+	active_processor_count: int, optional
+		The number of CPUs that the JVM sizes its thread pools (incl. the common pool) and GC threads against.
+		Maps to `-XX:ActiveProcessorCount`. Useful in containers, where the CPU quota is lower than the number of host CPUs.
+
+	system_properties: dict, optional
+		Java system properties. Map to `-D<name>=<value>`.
+
+	flags: list of strings, optional
+		Other JVM options (eg. "-XX:TieredStopAtLevel=1"), passed as-is.
+	"""
+
+	GCS = {
+		"serial" : "-XX:+UseSerialGC",
+		"parallel" : "-XX:+UseParallelGC",
+		"g1" : "-XX:+UseG1GC",
+		"zgc" : "-XX:+UseZGC",
+		"shenandoah" : "-XX:+UseShenandoahGC"
+	}
+
+	def __init__(self, max_heap = None, initial_heap = None, gc = None, active_processor_count = None, system_properties = {}, flags = []):
+		if gc is not None and gc.lower() not in JVMOptions.GCS:
+			raise ValueError("Garbage collector {0} not in {1}".format(gc, list(JVMOptions.GCS)))
+		if active_processor_count is not None and active_processor_count < 1:
+			raise ValueError("Active processor count {0} is not positive".format(active_processor_count))
+		self.max_heap = max_heap
+		self.initial_heap = initial_heap
+		self.gc = gc
+		self.active_processor_count = active_processor_count
+		self.system_properties = dict(system_properties)
+		self.flags = list(flags)
+
+	def __repr__(self):
+		return "JVMOptions({0})".format(self.getOptions())
+
+	def getOptions(self):
+		options = []
+		if self.initial_heap is not None:
+			options.append("-Xms{0}".format(self.initial_heap))
+		if self.max_heap is not None:
+			options.append("-Xmx{0}".format(self.max_heap))
+		if self.gc is not None:
+			options.append(JVMOptions.GCS[self.gc.lower()])
+		if self.active_processor_count is not None:
+			options.append("-XX:ActiveProcessorCount={0}".format(self.active_processor_count))
+		for name, value in self.system_properties.items():
+			options.append("-D{0}={1}".format(name, value))
+		options.extend(self.flags)
+		return options
+
+def _jvmOptions(jvm_options):
+	if jvm_options is None:
+		return []
+	elif isinstance(jvm_options, JVMOptions):
+		return jvm_options.getOptions()
+	elif isinstance(jvm_options, (list, tuple)):
+		return list(jvm_options)
+	else:
+		raise TypeError()
+
+def _warnJVMStarted(jvm_options):
+	if jvm_options is not None:
+		warnings.warn("The JVM has already been started, ignoring JVM options {0}".format(_jvmOptions(jvm_options)))
+
 class JavaBackend(ABC):
 
+	transports = ["columnar", "pickle"]
+
 	def __init__(self):
 		self.javaClasses_ = {}
 
@@ -59,6 +221,30 @@ class JavaBackend(ABC):
 	def loads(self, results):
 		return pickle.loads(results)
 
+	def dumpsColumnar(self, arguments_df):
+		from . import columnar
+		return columnar.dumps(arguments_df)
+
+	def loadsColumnar(self, results):
+		from . import columnar
+		return columnar.loads(results)
+
+	def setEvaluationPool(self, threads, batch_size = 1):
+		""" Configures the JVM-wide thread pool that is used by `Evaluator.evaluateAll(..., parallelism = -1)`.
+
+		Parameters:
+		----------
+		threads: int
+			The number of threads, at most `PythonEvaluatorUtil.MAX_PARALLELISM`. If -1, use the common pool.
+
+		batch_size: int
+			The minimum number of rows per parallel task.
+		"""
+		try:
+			self.staticInvoke(PythonEvaluatorUtil.JAVA_CLASS_NAME, "setEvaluationPool", threads, batch_size)
+		except Exception as e:
+			raise self.toJavaError(e)
+
 	def _ensureJavaClass(self, className):
 		try:
 			return self.javaClasses_[className]
@@ -75,6 +261,16 @@ class JavaBackend(ABC):
 	def newArray(self, className, values):
 		raise NotImplementedError()
 
+	def newBuffer(self, values):
+		raise NotImplementedError()
+
+	def cast(self, className, javaObject):
+		return javaObject
+
+	def getDefaultCache(self):
+		""" Returns the EvaluatorCache that `make_evaluator` uses when no cache is specified (or None). """
+		return None
+
 	@abstractmethod
 	def newObject(self, className, *args):
 		raise NotImplementedError()
@@ -93,11 +289,11 @@ class JNIBackend(JavaBackend):
 		super(JNIBackend, self).__init__()
 
 	@abstractclassmethod
-	def ensureJVM(cls):
+	def ensureJVM(cls, jvm_options = None):
 		raise NotImplementedError()
 
 	@abstractclassmethod
-	def createJVM(cls, user_classpath = []):
+	def createJVM(cls, user_classpath = [], jvm_options = None):
 		raise NotImplementedError()
 
 	@abstractclassmethod
@@ -149,14 +345,243 @@ class ModelField(JavaObject):
 	def getOpType(self):
 		return self.opType
 
-def _initModelFields(backend, javaModelFields):
-	return [ModelField(backend, javaModelFields.get(i)) for i in range(javaModelFields.size())]
+def _toPythonValue(value, dataType):
+	if value is None:
+		return None
+	# Transform Java objects to Python strings, and then to Python primitives
+	value = str(value)
+	if dataType == "integer":
+		return int(value)
+	elif dataType in ("float", "double"):
+		return float(value)
+	elif dataType == "boolean":
+		return value.lower() == "true"
+	else:
+		return value
+
+class InputField(ModelField):
+
+	def __init__(self, backend, javaInputField):
+		super(InputField, self).__init__(backend, javaInputField)
+		self.discreteDomain = None
+		self.continuousDomain = None
+		if self.opType in ("categorical", "ordinal"):
+			javaValues = javaInputField.getDiscreteDomain()
+			if javaValues is not None and javaValues.size() > 0:
+				self.discreteDomain = [_toPythonValue(javaValues.get(i), self.dataType) for i in range(javaValues.size())]
+		elif self.opType == "continuous":
+			# Interval endpoints are transferred as plain values, rather than as Guava range objects
+			endpoints = backend.staticInvoke(PythonEvaluatorUtil.JAVA_CLASS_NAME, "getContinuousDomain", javaInputField)
+			if endpoints is not None:
+				endpoints = [_toPythonEndpoint(endpoint) for endpoint in endpoints]
+				self.continuousDomain = list(zip(endpoints[0::2], endpoints[1::2]))
+
+	def getDiscreteDomain(self):
+		""" Returns the list of valid values (or None, if all values are valid). """
+		return self.discreteDomain
+
+	def getContinuousDomain(self):
+		""" Returns the list of valid intervals as (lower, upper) tuples, where None stands for an unbounded endpoint (or None, if all values are valid). """
+		return self.continuousDomain
+
+def _toPythonEndpoint(endpoint):
+	endpoint = float(endpoint)
+	# Unbounded endpoints are represented by infinities
+	return endpoint if math.isfinite(endpoint) else None
+
+def _sampleValue(inputField, rng):
+	discreteDomain = inputField.getDiscreteDomain()
+	if discreteDomain:
+		return rng.choice(discreteDomain)
+	dataType = inputField.getDataType()
+	lower, upper = (0.0, 1.0)
+	continuousDomain = inputField.getContinuousDomain()
+	if continuousDomain:
+		lower, upper = rng.choice(continuousDomain)
+		if lower is None and upper is None:
+			lower, upper = (0.0, 1.0)
+		elif lower is None:
+			lower = upper - 1.0
+		elif upper is None:
+			upper = lower + 1.0
+	if dataType == "integer":
+		lower = math.ceil(lower)
+		return rng.randint(lower, max(lower, math.floor(upper)))
+	elif dataType in ("float", "double"):
+		return rng.uniform(lower, upper)
+	elif dataType == "boolean":
+		return rng.random() < 0.5
+	elif dataType == "string":
+		return "value{0}".format(rng.randint(0, 9))
+	# Temporal data types
+	return None
+
+def _sampleArguments(inputFields, numberOfRows, seed = 0):
+	rng = random.Random(seed)
+	return [{inputField.getName() : _sampleValue(inputField, rng) for inputField in inputFields} for i in range(numberOfRows)]
+
+class DataTypeError(ValueError):
+	""" Raised when DataFrame columns contain values that cannot be converted to the data types of the corresponding input fields.
+
+	The `report` attribute is a DataFrame with one row per invalid column, which holds the number of invalid values, and the row label and value of the first one.
+	"""
+
+	def __init__(self, report):
+		super(DataTypeError, self).__init__("Columns {0} contain invalid values:\n{1}".format(report.index.tolist(), report.to_string()))
+		self.report = report
+
+def _invalidValues(values, dataType):
+	# Returns a boolean mask, or None if all values are valid.
+	# Only numeric data types are checked, because JPMML-Evaluator converts any value to a string, and its boolean and temporal parsing is more lenient than any Python-side rule
+	import numpy
+	from pandas import Series
+	if dataType not in ("integer", "float", "double"):
+		return None
+	if values.dtype == "category":
+		categories = values.cat.categories
+		invalidCategories = _invalidValues(Series(categories, dtype = categories.dtype), dataType)
+		if invalidCategories is None:
+			return None
+		return values.cat.codes.isin(numpy.flatnonzero(invalidCategories.to_numpy()))
+	kind = values.dtype.kind
+	if kind in "biu":
+		return None
+	elif kind == "f":
+		numbers = values
+		invalid = None
+	elif kind in "mM":
+		return values.notna()
+	else:
+		from pandas import to_numeric
+		numbers = to_numeric(values, errors = "coerce")
+		# Java parses "NaN", whereas pandas coerces it (together with unparseable values) to NaN
+		invalid = values.notna() & numbers.isna() & (values != "NaN")
+		numbers = numbers.astype(float)
+	if dataType == "integer":
+		fractional = numbers.notna() & (numbers != numpy.floor(numbers))
+		invalid = fractional if invalid is None else (invalid | fractional)
+	return invalid
+
+def _checkDataTypes(inputFields, arguments_df):
+	from pandas import DataFrame
+	rows = []
+	for inputField in inputFields:
+		name = inputField.getName()
+		if name not in arguments_df.columns:
+			continue
+		values = arguments_df[name]
+		invalid = _invalidValues(values, inputField.getDataType())
+		if invalid is None:
+			continue
+		count = int(invalid.sum())
+		if count:
+			invalidValues = values[invalid.to_numpy()]
+			rows.append((name, inputField.getDataType(), str(values.dtype), count, invalidValues.index[0], invalidValues.iloc[0]))
+	if rows:
+		raise DataTypeError(DataFrame.from_records(rows, columns = ["field", "dataType", "dtype", "count", "first_row", "first_value"], index = "field"))
+
+class TargetField(ModelField):
+
+	def __init__(self, backend, javaTargetField):
+		super(TargetField, self).__init__(backend, javaTargetField)
+		self.categories = None
+		if self.opType in ("categorical", "ordinal"):
+			javaCategories = javaTargetField.getCategories()
+			if javaCategories is not None:
+				self.categories = [_toPythonValue(javaCategories.get(i), self.dataType) for i in range(javaCategories.size())]
+
+	def getCategories(self):
+		return self.categories
+
+def _initModelFields(backend, javaModelFields, modelFieldClass = ModelField):
+	return [modelFieldClass(backend, javaModelFields.get(i)) for i in range(javaModelFields.size())]
+
+_asyncExecutor = None
+_asyncExecutorLock = Lock()
+
+def _getAsyncExecutor():
+	global _asyncExecutor
+	with _asyncExecutorLock:
+		if _asyncExecutor is None:
+			_asyncExecutor = ThreadPoolExecutor(thread_name_prefix = "jpmml_evaluator")
+		return _asyncExecutor
+
+def _sliceChunks(chunks, chunk_size):
+	for chunk in chunks:
+		for begin in range(0, max(len(chunk), 1), chunk_size):
+			yield chunk.iloc[begin:begin + chunk_size]
+
+def _formatColumn(values, resultField):
+	from pandas import Categorical
+	import numpy
+	import pandas
+	from . import columnar
+	categories = resultField.getCategories() if isinstance(resultField, TargetField) else None
+	if isinstance(values, list) and resultField is not None:
+		dataType = resultField.getDataType()
+		if dataType in ("double", "float"):
+			try:
+				values = numpy.asarray(values, dtype = numpy.float64)
+			except (TypeError, ValueError):
+				# Keep non-numeric values (eg. the pickled values of a lax evaluator) as an object column
+				pass
+		elif dataType == "integer" and all(isinstance(value, int) or value is None for value in values):
+			values = pandas.array(values, dtype = "Int64") if None in values else numpy.asarray(values, dtype = numpy.int64)
+		elif dataType == "boolean" and all(isinstance(value, bool) or value is None for value in values):
+			values = pandas.array(values, dtype = "boolean") if None in values else numpy.asarray(values, dtype = bool)
+	if categories:
+		ordered = (resultField.getOpType() == "ordinal")
+		# Values that are not declared categories would be replaced with missing values
+		observedCategories = values.categories if isinstance(values, Categorical) else pandas.Series(values, dtype = object).dropna().unique()
+		declaredCategories = set(categories)
+		undeclaredCategories = [category for category in observedCategories if category not in declaredCategories]
+		if undeclaredCategories:
+			categories = list(categories) + undeclaredCategories
+		if isinstance(values, Categorical):
+			return values.set_categories(categories, ordered = ordered)
+		return Categorical(values, categories = categories, ordered = ordered)
+	if isinstance(values, Categorical):
+		return columnar.toObjectArray(values)
+	return values
+
+# An immutable selection of result fields, together with its Java-side representation
+_ResultSelection = namedtuple("_ResultSelection", ["dropColumns", "javaDropColumns", "resultFields"])
+
+def _selectResultFields(backend, resultFields, dropColumns):
+	if not dropColumns:
+		return _ResultSelection(None, None, tuple(resultFields))
+	dropColumns = tuple(dropColumns)
+	return _ResultSelection(dropColumns, backend.newArray("java.lang.String", dropColumns), tuple(resultField for resultField in resultFields if resultField.getName() not in dropColumns))
 
 class Evaluator(JavaObject):
+	""" A PMML model evaluator.
+
+	Evaluators are safe for concurrent use from multiple Python threads.
+	Field metadata is materialized at construction time, and the selection of result fields is replaced (never modified) by `suppressResultFields`, so that every call works with one consistent selection.
+
+	Evaluation methods accept a `fields` argument, which selects target and output fields for a single call (overriding `suppressResultFields`).
+	Unselected fields are not decoded, collected or transferred on the Java side.
+
+	Evaluation methods also accept a `prune_inputs` argument. If True (the default), arguments are projected down to input and target fields before they are transferred to the Java side.
+	"""
+
+	# The maximum number of cached per-call selections
+	MAX_RESULT_SELECTIONS = 64
 
 	def __init__(self, backend, javaEvaluator):
 		super(Evaluator, self).__init__(backend)
 		self.javaEvaluator = javaEvaluator
+		try:
+			self.inputFields = _initModelFields(backend, javaEvaluator.getInputFields(), InputField)
+			self.targetFields = _initModelFields(backend, javaEvaluator.getTargetFields(), TargetField)
+			self.outputFields = _initModelFields(backend, javaEvaluator.getOutputFields())
+		except Exception as e:
+			raise backend.toJavaError(e)
+		self.resultFieldMap = {resultField.getName() : resultField for resultField in (self.targetFields + self.outputFields)}
+		# Target field values are needed for computing residuals
+		self.argumentNames = frozenset(modelField.getName() for modelField in (self.inputFields + self.targetFields))
+		self.resultSelection = _selectResultFields(backend, self.targetFields + self.outputFields, None)
+		self.resultSelections = {}
 
 	def verify(self):
 		try:
@@ -166,44 +591,330 @@ class Evaluator(JavaObject):
 		return self
 
 	def getInputFields(self):
-		if not hasattr(self, "inputFields"):
-			self.inputFields = _initModelFields(self.backend, self.javaEvaluator.getInputFields())
 		return self.inputFields
 
 	def getTargetFields(self):
-		if not hasattr(self, "targetFields"):
-			self.targetFields = _initModelFields(self.backend, self.javaEvaluator.getTargetFields())
 		return self.targetFields
 
 	def getOutputFields(self):
-		if not hasattr(self, "outputFields"):
-			self.outputFields = _initModelFields(self.backend, self.javaEvaluator.getOutputFields())
 		return self.outputFields
 
-	def evaluate(self, arguments, nan_as_missing = True):
-		arguments = _canonicalize(arguments, nan_as_missing = nan_as_missing)
-		results = PythonEvaluatorUtil.evaluate(self.backend, self.javaEvaluator, arguments, self.dropColumns if hasattr(self, "dropColumns") else None)
+	def evaluate(self, arguments, nan_as_missing = True, fields = None, prune_inputs = True):
+		if prune_inputs:
+			arguments = self._pruneRecord(arguments)
+		results = PythonEvaluatorUtil.evaluate(self.backend, self.javaEvaluator, arguments, self._getResultSelection(fields).javaDropColumns, nan_as_missing)
 		return results
 
-	def evaluateAll(self, arguments_df, nan_as_missing = True, error_col = "errors", parallelism = -1):
-		arguments_df = _canonicalizeAll(arguments_df, nan_as_missing = nan_as_missing)
-		columns = arguments_df.columns.tolist()
-		data = []
-		for column in columns:
-			data.append(arguments_df[column].tolist())
-		arguments_dict = {
-			"columns" : columns,
-			"data" : data
-		}
-		results_dict = PythonEvaluatorUtil.evaluateAll(self.backend, self.javaEvaluator, arguments_dict, self.dropColumns if hasattr(self, "dropColumns") else None, parallelism)
+	def evaluateAll(self, arguments_df, nan_as_missing = True, error_col = "errors", parallelism = -1, transport = None, fields = None, prune_inputs = True, check_dtypes = False):
+		""" Evaluates a DataFrame.
+
+		Parameters:
+		----------
+		prune_inputs: boolean
+			If True, exclude columns that do not correspond to input or target fields.
+
+		check_dtypes: boolean
+			If True, check the values of numeric input fields before evaluation, and raise a DataTypeError (that reports all invalid columns at once) instead of failing row by row.
+		"""
+		transport = self._checkTransport(transport)
+		selection = self._getResultSelection(fields)
+		arguments = self._encodeAll(arguments_df, transport, selection, prune_inputs, check_dtypes)
+		results_dict = self._evaluateAll(arguments, transport, selection, nan_as_missing, parallelism)
+		return self._decodeAll(arguments_df, results_dict, error_col)
+
+	def prepare(self, input_names = None, output_names = None, nan_as_missing = True):
+		""" Prepares a fast path for evaluating single data records.
+
+		Input and result fields are resolved once, and data records are exchanged as tuples (instead of dicts).
+
+		Parameters:
+		----------
+		input_names: list of strings, optional
+			The names of input fields, in argument order. If None, all input fields.
+
+		output_names: list of strings, optional
+			The names of target and output fields, in result order. If None, all target and output fields (minus suppressed ones).
+
+		Returns a PreparedEvaluator.
+		"""
+		if input_names is None:
+			input_names = [inputField.getName() for inputField in self.getInputFields()]
+		if output_names is None:
+			output_names = [resultField.getName() for resultField in self.resultSelection.resultFields]
+		input_names = list(input_names)
+		output_names = list(output_names)
+		try:
+			javaPreparedEvaluator = self.backend.newObject(PreparedEvaluator.JAVA_CLASS_NAME, self.javaEvaluator, self.backend.newArray("java.lang.String", input_names), self.backend.newArray("java.lang.String", output_names), nan_as_missing)
+		except Exception as e:
+			raise self.backend.toJavaError(e)
+		return PreparedEvaluator(self.backend, javaPreparedEvaluator, input_names, output_names)
+
+	def evaluateRecords(self, records, nan_as_missing = True, parallelism = -1, fields = None, prune_inputs = True):
+		""" Evaluates a list of data records, without converting them to or from a DataFrame.
+
+		The records are transferred in one go, and evaluated in parallel on the Java side.
+		Returns a list of results dicts, where failed records are represented by JavaError objects (instead of raising them).
+		"""
+		records = list(records)
+		if not records:
+			return []
+		if prune_inputs:
+			records = [self._pruneRecord(record) for record in records]
+		results_dict = PythonEvaluatorUtil.evaluateRecords(self.backend, self.javaEvaluator, records, nan_as_missing, self._getResultSelection(fields).javaDropColumns, parallelism)
+		return [results if error is None else JavaError(self.backend, str(error[0]), error[1], None) for results, error in zip(results_dict["results"], results_dict["errors"])]
+
+	def setAsyncOptions(self, executor = None, max_concurrency = None):
+		""" Configures the evaluation of `evaluate_async` and `evaluateAll_async` calls.
+
+		Parameters:
+		----------
+		executor: Executor, optional
+			The executor that makes the (blocking) Java calls. If None, use the package-wide executor, which has the default number of threads (min(32, CPUs + 4)).
+
+		max_concurrency: int, optional
+			The maximum number of in-flight calls for this evaluator. Excess calls wait (in a cancellable way) for a free slot.
+		"""
+		if max_concurrency is not None and max_concurrency < 1:
+			raise ValueError("Max concurrency {0} is not positive".format(max_concurrency))
+		self.asyncExecutor = executor
+		self.asyncMaxConcurrency = max_concurrency
+		self.asyncSemaphores = WeakKeyDictionary()
+		return self
+
+	async def evaluate_async(self, arguments, nan_as_missing = True, fields = None, prune_inputs = True):
+		""" The coroutine version of `evaluate`.
+
+		The Java call is made in an executor thread, so that the event loop is not blocked.
+		Cancelling the coroutine cancels a pending Java call, or abandons the result of a running one.
+		"""
+		return await self._runAsync(self.evaluate, arguments, nan_as_missing = nan_as_missing, fields = fields, prune_inputs = prune_inputs)
+
+	async def evaluateAll_async(self, arguments_df, nan_as_missing = True, error_col = "errors", parallelism = -1, transport = None, fields = None, prune_inputs = True, check_dtypes = False):
+		""" The coroutine version of `evaluateAll`. See `evaluate_async`. """
+		return await self._runAsync(self.evaluateAll, arguments_df, nan_as_missing = nan_as_missing, error_col = error_col, parallelism = parallelism, transport = transport, fields = fields, prune_inputs = prune_inputs, check_dtypes = check_dtypes)
+
+	async def _runAsync(self, func, *args, **kwargs):
+		import asyncio
+		loop = asyncio.get_running_loop()
+		executor = getattr(self, "asyncExecutor", None) or _getAsyncExecutor()
+		semaphore = self._getAsyncSemaphore(loop)
+		if semaphore is None:
+			return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+		async with semaphore:
+			return await loop.run_in_executor(executor, partial(func, *args, **kwargs))
+
+	def _getAsyncSemaphore(self, loop):
+		import asyncio
+		maxConcurrency = getattr(self, "asyncMaxConcurrency", None)
+		if maxConcurrency is None:
+			return None
+		# Semaphores are bound to event loops
+		semaphore = self.asyncSemaphores.get(loop)
+		if semaphore is None:
+			semaphore = asyncio.Semaphore(maxConcurrency)
+			self.asyncSemaphores[loop] = semaphore
+		return semaphore
+
+	def evaluateIter(self, chunks, nan_as_missing = True, error_col = "errors", parallelism = -1, transport = None, chunk_size = None, prefetch = 1, fields = None, prune_inputs = True, check_dtypes = False):
+		""" Evaluates a stream of DataFrames, yielding a results DataFrame (or a tuple of results DataFrame and errors Series) per DataFrame.
+
+		The Python-side conversion of up to `prefetch` upcoming chunks overlaps with the Java-side evaluation of the current chunk.
+
+		Parameters:
+		----------
+		chunks: DataFrame or iterable of DataFrames
+			The arguments. For example, the TextFileReader that is returned by `pandas.read_csv(..., chunksize = ...)`.
+
+		chunk_size: int, optional
+			The maximum number of rows per chunk. Larger DataFrames are sliced into chunks of this size.
+
+		prefetch: int
+			The number of chunks to convert ahead of the current chunk. If 0, chunks are converted and evaluated in turn.
+
+		Other parameters are the same as for `evaluateAll`. The data type check of a chunk is part of its conversion.
+		"""
+		from pandas import DataFrame
+		if prefetch < 0:
+			raise ValueError("Prefetch {0} is negative".format(prefetch))
+		transport = self._checkTransport(transport)
+		selection = self._getResultSelection(fields)
+		if isinstance(chunks, DataFrame):
+			chunks = [chunks]
+		if chunk_size is not None:
+			if chunk_size < 1:
+				raise ValueError("Chunk size {0} is not positive".format(chunk_size))
+			chunks = _sliceChunks(chunks, chunk_size)
+		chunks = iter(chunks)
+		pending = deque()
+		executor = ThreadPoolExecutor(max_workers = 1)
+		try:
+			while True:
+				while len(pending) < (prefetch + 1):
+					arguments_df = next(chunks, None)
+					if arguments_df is None:
+						break
+					pending.append((arguments_df, executor.submit(self._encodeAll, arguments_df, transport, selection, prune_inputs, check_dtypes)))
+				if not pending:
+					break
+				arguments_df, future = pending.popleft()
+				arguments = future.result()
+				results_dict = self._evaluateAll(arguments, transport, selection, nan_as_missing, parallelism)
+				del arguments
+				yield self._decodeAll(arguments_df, results_dict, error_col)
+		finally:
+			for arguments_df, future in pending:
+				future.cancel()
+			executor.shutdown(wait = False)
+
+	def warmup(self, n = 10000, sample = None, batch_size = 100, tolerance = 0.1, patience = 3):
+		""" Warms up the JVM by evaluating argument records until the evaluation latency stabilizes.
+
+		Both the `evaluate` and the `evaluateAll` code paths are exercised. Evaluation errors are ignored.
+		Returns the number of iterations, where an iteration is a single `evaluate` call.
+
+		Parameters:
+		----------
+		n: int
+			The maximum number of iterations.
+
+		sample: DataFrame, optional
+			The arguments. If None, synthesized from the data types and the valid values (or intervals) of input fields.
+
+		batch_size: int
+			The number of iterations per round. Every round ends with an `evaluateAll` call over the records of the round.
+
+		tolerance: float
+			The maximum relative difference between the median latencies of two consecutive rounds, for the latency to be considered stable.
+
+		patience: int
+			The number of consecutive stable rounds.
+		"""
+		from pandas import DataFrame
+		if batch_size < 1:
+			raise ValueError("Batch size {0} is not positive".format(batch_size))
+		if sample is None:
+			inputFields = self.getInputFields()
+			sample = DataFrame(_sampleArguments(inputFields, batch_size), columns = [inputField.getName() for inputField in inputFields])
+		if len(sample) == 0:
+			raise ValueError("Sample is empty")
+		records = sample.to_dict(orient = "records")
+		iterations = 0
+		prevLatency = None
+		stableRounds = 0
+		while iterations < n and stableRounds < patience:
+			positions = [(iterations + i) % len(records) for i in range(min(batch_size, n - iterations))]
+			latencies = []
+			for position in positions:
+				begin = time.perf_counter()
+				try:
+					self.evaluate(records[position])
+				except JavaError:
+					pass
+				latencies.append(time.perf_counter() - begin)
+			try:
+				self.evaluateAll(sample.take(positions))
+			except JavaError:
+				pass
+			iterations += len(positions)
+			latency = statistics.median(latencies)
+			if prevLatency is not None and abs(latency - prevLatency) <= tolerance * prevLatency:
+				stableRounds += 1
+			else:
+				stableRounds = 0
+			prevLatency = latency
+		return iterations
+
+	def evaluateFile(self, input_path, output_path, sep = ",", error_col = "errors", parallelism = -1, batch_size = 10000, fields = None):
+		""" Evaluates a CSV file, and writes the results into another CSV file.
+
+		The file is read, evaluated and written on the Java side, without any data crossing into Python.
+		Returns the number of evaluated rows.
+		"""
+		if len(sep) != 1:
+			raise ValueError("Separator {0} is not a single character".format(sep))
+		return PythonEvaluatorUtil.evaluateFile(self.backend, self.javaEvaluator, input_path, output_path, sep, self._getResultSelection(fields).javaDropColumns, error_col or None, batch_size, parallelism)
+
+	def checkDataTypes(self, arguments_df):
+		""" Checks the values of numeric input fields, in a vectorized way.
+
+		Raises a DataTypeError, which reports all columns that contain values that cannot be converted to the data type of the corresponding input field.
+		Missing columns and non-numeric input fields are not checked.
+		"""
+		_checkDataTypes(self.inputFields, arguments_df)
+		return self
+
+	def _pruneRecord(self, arguments):
+		# Records that contain argument names only are passed as-is, without copying
+		if isinstance(arguments, dict) and not self.argumentNames.issuperset(arguments):
+			return {name : value for name, value in arguments.items() if name in self.argumentNames}
+		return arguments
+
+	def _pruneAll(self, arguments_df):
+		columns = [column for column in arguments_df.columns if column in self.argumentNames]
+		if len(columns) == len(arguments_df.columns):
+			return arguments_df
+		return arguments_df[columns]
+
+	def _getResultSelection(self, fields):
+		if fields is None:
+			return self.resultSelection
+		fields = tuple(fields)
+		selection = self.resultSelections.get(fields)
+		if selection is None:
+			for field in fields:
+				if field not in self.resultFieldMap:
+					raise ValueError("Field {0} not in {1}".format(field, list(self.resultFieldMap.keys())))
+			resultFields = self.targetFields + self.outputFields
+			selection = _selectResultFields(self.backend, resultFields, [resultField.getName() for resultField in resultFields if resultField.getName() not in fields])
+			# Past the limit (eg. with client-specified selections), selections are built anew on every call
+			if len(self.resultSelections) < Evaluator.MAX_RESULT_SELECTIONS:
+				self.resultSelections[fields] = selection
+		return selection
+
+	def _checkTransport(self, transport):
+		if transport is None:
+			transport = self.backend.transports[0]
+		if transport not in self.backend.transports:
+			raise ValueError("Transport {0} not in {1}".format(transport, self.backend.transports))
+		return transport
+
+	def _encodeAll(self, arguments_df, transport, selection, prune_inputs = True, check_dtypes = False):
+		# Python-side conversion only, so that it can be run in a background thread
+		if prune_inputs:
+			arguments_df = self._pruneAll(arguments_df)
+		if check_dtypes:
+			_checkDataTypes(self.inputFields, arguments_df)
+		if transport == "buffer":
+			return PythonEvaluatorUtil.encodeAllBuffers(self.backend, arguments_df, selection.resultFields)
+		elif transport == "columnar":
+			return self.backend.dumpsColumnar(arguments_df)
+		elif transport == "pickle":
+			columns = arguments_df.columns.tolist()
+			data = []
+			for column in columns:
+				data.append(arguments_df[column].tolist())
+			return {
+				"columns" : columns,
+				"data" : data
+			}
+
+	def _evaluateAll(self, arguments, transport, selection, nan_as_missing, parallelism):
+		if transport == "buffer":
+			return PythonEvaluatorUtil.evaluateAllBuffers(self.backend, self.javaEvaluator, arguments, nan_as_missing, selection.javaDropColumns, selection.resultFields, parallelism)
+		elif transport == "columnar":
+			return PythonEvaluatorUtil.evaluateAllColumnar(self.backend, self.javaEvaluator, arguments, nan_as_missing, selection.javaDropColumns, parallelism)
+		elif transport == "pickle":
+			return PythonEvaluatorUtil.evaluateAll(self.backend, self.javaEvaluator, arguments, nan_as_missing, selection.javaDropColumns, parallelism)
+
+	def _decodeAll(self, arguments_df, results_dict, error_col):
+		from pandas import DataFrame, Series
 		columns = results_dict["columns"]
 		data = results_dict["data"]
 		errors = results_dict["errors"]
-		results_df = DataFrame()
-		for idx, column in enumerate(columns):
-			results_df[column] = data[idx]
-		if len(arguments_df) == len(results_df):
-			results_df.index = arguments_df.index.copy()
+		data = [_formatColumn(values, self.resultFieldMap.get(column)) for column, values in zip(columns, data)]
+		numberOfRows = len(data[0]) if data else 0
+		index = arguments_df.index.copy() if len(arguments_df) == numberOfRows else None
+		results_df = DataFrame(dict(zip(columns, data)), columns = columns, index = index)
 		if errors is not None:
 			errors = Series(errors, name = error_col, dtype = str)
 			if len(arguments_df) == len(errors):
@@ -219,11 +930,47 @@ class Evaluator(JavaObject):
 		return self.evaluateAll(X)
 
 	def suppressResultFields(self, resultFields):
-		if resultFields:
-			self.dropColumns = [resultField.getName() for resultField in resultFields]
-		else:
-			if hasattr(self, "dropColumns"):
-				del self.dropColumns
+		""" Excludes the specified target and output fields from results.
+
+		Calls that are in progress (in other threads) keep using the previous selection.
+
+		Parameters:
+		----------
+		resultFields: list of ModelFields, optional
+			The fields to exclude. If None or empty, include all fields.
+		"""
+		dropColumns = [resultField.getName() for resultField in resultFields] if resultFields else None
+		self.resultSelection = _selectResultFields(self.backend, self.targetFields + self.outputFields, dropColumns)
+
+class PreparedEvaluator(JavaObject):
+	""" A callable that evaluates a single data record.
+
+	The data record is a tuple (or any other sequence, incl. a NumPy array) of values in input field order.
+	The results are a tuple of values in output field order.
+	"""
+	JAVA_CLASS_NAME = "org.jpmml.evaluator.python.PreparedEvaluator"
+
+	def __init__(self, backend, javaPreparedEvaluator, inputNames, outputNames):
+		super(PreparedEvaluator, self).__init__(backend)
+		self.javaPreparedEvaluator = javaPreparedEvaluator
+		self.inputNames = inputNames
+		self.outputNames = outputNames
+
+	def __call__(self, values):
+		if hasattr(values, "tolist"):
+			values = values.tolist()
+		arguments = self.backend.dumps(tuple(values))
+		try:
+			results = self.javaPreparedEvaluator.evaluate(arguments)
+		except Exception as e:
+			raise self.backend.toJavaError(e)
+		return tuple(self.backend.loads(results))
+
+	def getInputNames(self):
+		return self.inputNames
+
+	def getOutputNames(self):
+		return self.outputNames
 
 class BaseModelEvaluatorBuilder(JavaObject):
 
@@ -280,7 +1027,32 @@ class LoadingModelEvaluatorBuilder(BaseModelEvaluatorBuilder):
 		javaInputStream.close()
 		return self
 
+	def loadSerialized(self, path):
+		""" Loads a PMML object that has been saved using `saveSerialized`.
+
+		Skips XML parsing and model pre-processing.
+		"""
+		javaPMML = _loadSerializedPMML(self.backend, path)
+		javaModelEvaluatorBuilder = self.backend.newObject("org.jpmml.evaluator.ModelEvaluatorBuilder", javaPMML)
+		javaModelEvaluatorBuilder.setCheckSchema(self.javaModelEvaluatorBuilder.getCheckSchema())
+		# The PMML object is ready for use, so there is nothing left to load
+		self.javaModelEvaluatorBuilder = javaModelEvaluatorBuilder
+		self.serialized = True
+		return self
+
+	def saveSerialized(self, path):
+		""" Saves the loaded (and transformed) PMML object in Java serialization format. """
+		_saveSerializedPMML(self.backend, self.javaModelEvaluatorBuilder.getPMML(), path)
+		return self
+
 	def transform(self, javaPMMLTransformer):
+		if hasattr(self, "serialized"):
+			javaPMML = javaPMMLTransformer.apply(self.javaModelEvaluatorBuilder.getPMML())
+			javaModelEvaluatorBuilder = self.backend.newObject("org.jpmml.evaluator.ModelEvaluatorBuilder", javaPMML)
+			javaModelEvaluatorBuilder.setCheckSchema(self.javaModelEvaluatorBuilder.getCheckSchema())
+			javaModelEvaluatorBuilder.setValueFactoryFactory(self.javaModelEvaluatorBuilder.getValueFactoryFactory())
+			self.javaModelEvaluatorBuilder = javaModelEvaluatorBuilder
+			return self
 		self.javaModelEvaluatorBuilder.transform(javaPMMLTransformer)
 		return self
 
@@ -293,23 +1065,36 @@ class LoadingModelEvaluatorBuilder(BaseModelEvaluatorBuilder):
 		javaTranspilerTransformer = self.backend.newObject("org.jpmml.transpiler.TranspilerTransformer", javaTranspiler)
 		return self.transform(javaTranspilerTransformer)
 
-def make_backend(alias):
+def make_backend(alias, jvm_options = None):
+	""" Creates a Java backend.
+
+	Parameters:
+	----------
+	alias: string
+		The alias of the Java backend. One of 'jpype', 'pyjnius', 'py4j' or 'ipc'.
+
+	jvm_options: JVMOptions or list of strings, optional
+		JVM startup options. Ignored (with a warning) if the JVM has already been started.
+	"""
 	if not isinstance(alias, str):
 		raise TypeError()
 	if alias.lower() == "jpype":
 		from jpmml_evaluator.jpype import JPypeBackend
-		return JPypeBackend()
+		return JPypeBackend(jvm_options = jvm_options)
 	elif alias.lower() == "pyjnius":
 		from jpmml_evaluator.pyjnius import PyJNIusBackend
-		return PyJNIusBackend()
+		return PyJNIusBackend(jvm_options = jvm_options)
 	elif alias.lower() == "py4j":
 		from jpmml_evaluator.py4j import Py4JBackend
-		return Py4JBackend()
+		return Py4JBackend(jvm_options = jvm_options)
+	elif alias.lower() == "ipc":
+		from jpmml_evaluator.ipc import IPCBackend
+		return IPCBackend(jvm_options = jvm_options)
 	else:
-		aliases = ["jpype", "pyjnius", "py4j"]
+		aliases = ["jpype", "pyjnius", "py4j", "ipc"]
 		raise ValueError("Java backend alias {0} not in {1}".format(alias, aliases))
 
-def make_evaluator(obj, backend = "jpype", lax = False, locatable = False, reporting = False, transpile = False):
+def make_evaluator(obj, backend = "jpype", lax = False, locatable = False, reporting = False, transpile = False, cache = None, transpile_cache = None, serialized = False):
 	""" Builds an Evaluator based on a PMML file.
 
 	Parameters:
@@ -333,6 +1118,20 @@ def make_evaluator(obj, backend = "jpype", lax = False, locatable = False, repor
 
 	transpile: boolean or string
 		If not False, perform transpilation.
+
+	cache: EvaluatorCache, optional
+		If not None, return a previously built Evaluator for the same PMML content and options (if any),
+		or build a new Evaluator and add it to the cache.
+		Cached Evaluators are shared between callers.
+		If None, the default cache of the Java backend (if any). See `JavaBackend.getDefaultCache`.
+
+	transpile_cache: TranspilerCache or string, optional
+		If not None, and transpile is True, then reuse a previously transpiled JAR file for the same PMML content (if any),
+		or transpile into a new JAR file in this directory.
+
+	serialized: boolean
+		If True, the object to load is a PMML object in Java serialization format (see `LoadingModelEvaluatorBuilder.saveSerialized`),
+		either a path to a file in local filesystem or a byte array.
 	"""
 
 	if isinstance(backend, JavaBackend):
@@ -342,10 +1141,53 @@ def make_evaluator(obj, backend = "jpype", lax = False, locatable = False, repor
 	else:
 		raise TypeError()
 
+	if cache is None:
+		cache = backend.getDefaultCache()
+
+	if cache is not None:
+		if not isinstance(cache, EvaluatorCache):
+			raise TypeError()
+		pmml_bytes = _toBytes(obj)
+		key = cache.makeKey(pmml_bytes, backend, lax = lax, locatable = locatable, reporting = reporting, transpile = transpile, serialized = serialized)
+		evaluator = cache.get(key)
+		if evaluator is None:
+			evaluator = _buildEvaluator(pmml_bytes, backend, lax = lax, locatable = locatable, reporting = reporting, transpile = transpile, transpile_cache = transpile_cache, serialized = serialized)
+			cache.put(key, evaluator, len(pmml_bytes))
+		return evaluator
+
+	return _buildEvaluator(obj, backend, lax = lax, locatable = locatable, reporting = reporting, transpile = transpile, transpile_cache = transpile_cache, serialized = serialized)
+
+def _buildEvaluator(obj, backend, lax, locatable, reporting, transpile, transpile_cache, serialized):
+	# Bypasses caches, including the default cache of the Java backend
+
+	if transpile_cache is not None and transpile:
+		if isinstance(transpile, str):
+			raise ValueError("Transpilation to a user-specified file and transpilation cache are mutually exclusive")
+		if not isinstance(transpile_cache, TranspilerCache):
+			transpile_cache = TranspilerCache(transpile_cache)
+		pmml_bytes = _toBytes(obj)
+		path = transpile_cache.getPath(pmml_bytes)
+		if path.is_file():
+			evaluatorBuilder = ModelEvaluatorBuilder(backend, _loadTranspiledPMML(backend, path), lax)
+			if reporting:
+				evaluatorBuilder = evaluatorBuilder.setReportingValueFactoryFactory()
+			return evaluatorBuilder.build()
+		transpile_cache.cleanup()
+		tmp_path = transpile_cache.getTempPath(path)
+		try:
+			evaluator = _buildEvaluator(pmml_bytes, backend, lax = lax, locatable = locatable, reporting = reporting, transpile = str(tmp_path), transpile_cache = None, serialized = serialized)
+			os.replace(tmp_path, path)
+		finally:
+			if tmp_path.exists():
+				tmp_path.unlink()
+		return evaluator
+
 	evaluatorBuilder = LoadingModelEvaluatorBuilder(backend, lax) \
 		.setLocatable(locatable)
 
-	if isinstance(obj, Path):
+	if serialized:
+		evaluatorBuilder = evaluatorBuilder.loadSerialized(obj)
+	elif isinstance(obj, Path):
 		evaluatorBuilder = evaluatorBuilder.loadFile(obj)
 	elif isinstance(obj, str):
 		if len(obj) < 1024 and os.path.isfile(obj):
@@ -365,6 +1207,50 @@ def make_evaluator(obj, backend = "jpype", lax = False, locatable = False, repor
 
 	return evaluatorBuilder.build()
 
+def _loadSerializedPMML(backend, obj):
+	if isinstance(obj, bytes):
+		javaInputStream = backend.newObject("java.io.ByteArrayInputStream", obj)
+	else:
+		javaInputStream = backend.newObject("java.io.BufferedInputStream", backend.newObject("java.io.FileInputStream", os.fspath(obj)))
+	javaSerializer = backend.newObject("org.jpmml.model.JavaSerializer")
+	try:
+		return backend.cast("org.dmg.pmml.PMML", javaSerializer.deserialize(javaInputStream))
+	except Exception as e:
+		raise backend.toJavaError(e)
+	finally:
+		javaInputStream.close()
+
+def _saveSerializedPMML(backend, javaPMML, path):
+	javaOutputStream = backend.newObject("java.io.BufferedOutputStream", backend.newObject("java.io.FileOutputStream", os.fspath(path)))
+	javaSerializer = backend.newObject("org.jpmml.model.JavaSerializer")
+	try:
+		javaSerializer.serialize(javaPMML, javaOutputStream)
+	except Exception as e:
+		raise backend.toJavaError(e)
+	finally:
+		javaOutputStream.close()
+
+def _loadTranspiledPMML(backend, path):
+	javaURL = backend.newObject("java.io.File", str(path)).toURI().toURL()
+	try:
+		return backend.staticInvoke("org.jpmml.model.PMMLUtil", "load", javaURL)
+	except Exception as e:
+		raise backend.toJavaError(e)
+
+def _toBytes(obj):
+	if isinstance(obj, Path):
+		return obj.read_bytes()
+	elif isinstance(obj, str):
+		if len(obj) < 1024 and os.path.isfile(obj):
+			return Path(obj).read_bytes()
+		else:
+			return bytes(obj, "utf-8")
+	elif isinstance(obj, bytes):
+		return obj
+	else:
+		raise TypeError()
+
+@lru_cache(maxsize = None)
 def _package_data_jars(data_dir):
 	package_dir = Path(__import__("jpmml_evaluator").__file__).parent
 	package_data_dir = package_dir / data_dir
@@ -375,10 +1261,11 @@ def _package_data_jars(data_dir):
 		resource = resource.resolve()
 		if resource.suffix == ".jar":
 			jars.append(str(resource))
-	return jars
+	# Class data sharing archives require a stable classpath
+	return tuple(sorted(jars))
 
 def _classpath(user_classpath):
 	return _package_classpath() + user_classpath
 
 def _package_classpath():
-	return _package_data_jars("resources") + _package_data_jars("dependencies")
+	return list(_package_data_jars("resources") + _package_data_jars("dependencies"))
@@ -0,0 +1,186 @@
+import time
+
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import Future
+from threading import Condition, Lock, Thread
+
+class Histogram(object):
+	""" A thread-safe histogram with fixed bucket upper bounds.
+
+	Parameters:
+	----------
+	bounds: list of numbers
+		Bucket upper bounds (inclusive). Values above the last bound fall into an overflow bucket.
+	"""
+
+	def __init__(self, bounds):
+		self.bounds = sorted(bounds)
+		self.counts = [0] * (len(self.bounds) + 1)
+		self.count = 0
+		self.sum = 0
+		self.max = None
+		self.lock = Lock()
+
+	def observe(self, value):
+		with self.lock:
+			self.counts[bisect_left(self.bounds, value)] += 1
+			self.count += 1
+			self.sum += value
+			if self.max is None or value > self.max:
+				self.max = value
+
+	def quantile(self, q):
+		""" Returns the upper bound of the bucket that contains the q-th quantile (or the maximum value, for the overflow bucket). """
+		with self.lock:
+			if not self.count:
+				return None
+			rank = q * self.count
+			cumCount = 0
+			for bound, count in zip(self.bounds, self.counts):
+				cumCount += count
+				if cumCount >= rank and count:
+					return bound
+			return self.max
+
+	def getStats(self):
+		with self.lock:
+			return {
+				"bounds" : list(self.bounds),
+				"counts" : list(self.counts),
+				"count" : self.count,
+				"sum" : self.sum,
+				"mean" : (self.sum / self.count) if self.count else None,
+				"max" : self.max
+			}
+
+class BatchingEvaluator(object):
+	""" Coalesces concurrent single-record evaluations into batch evaluations.
+
+	Calls are queued, and flushed by a background thread as one `Evaluator.evaluateRecords` call,
+	when the queue reaches `max_batch_size` records, or when the oldest queued record has waited for `max_delay_ms` milliseconds.
+	Results and errors are routed back to the respective callers.
+
+	Parameters:
+	----------
+	evaluator: Evaluator
+		The evaluator.
+
+	max_batch_size: int
+		The maximum number of records per batch.
+
+	max_delay_ms: float
+		The maximum time that a record waits in the queue, in milliseconds.
+
+	nan_as_missing: boolean
+		See `Evaluator.evaluate`.
+
+	parallelism: int
+		See `Evaluator.evaluateRecords`.
+	"""
+
+	def __init__(self, evaluator, max_batch_size = 64, max_delay_ms = 2, nan_as_missing = True, parallelism = -1):
+		if max_batch_size < 1:
+			raise ValueError("Max batch size {0} is not positive".format(max_batch_size))
+		if max_delay_ms < 0:
+			raise ValueError("Max delay {0} is negative".format(max_delay_ms))
+		self.evaluator = evaluator
+		self.max_batch_size = max_batch_size
+		self.max_delay_ms = max_delay_ms
+		self.nan_as_missing = nan_as_missing
+		self.parallelism = parallelism
+		self.batchSizes = Histogram(_exponentialBounds(1, max_batch_size))
+		self.queueDelays = Histogram([0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000])
+		self.pending = deque()
+		self.condition = Condition()
+		self.closed = False
+		self.thread = Thread(target = self._run, name = "jpmml_evaluator-batching", daemon = True)
+		self.thread.start()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def submit(self, arguments):
+		""" Queues a data record for evaluation. Returns a Future of the results dict. """
+		future = Future()
+		with self.condition:
+			if self.closed:
+				raise RuntimeError("Batching evaluator is closed")
+			self.pending.append((arguments, future, time.monotonic()))
+			# Wake up the flusher thread when the first record arrives (to start the delay timer), and when the batch fills up
+			if len(self.pending) == 1 or len(self.pending) >= self.max_batch_size:
+				self.condition.notify()
+		return future
+
+	def evaluate(self, arguments, timeout = None):
+		""" Evaluates a data record, blocking until its batch has been evaluated. """
+		return self.submit(arguments).result(timeout)
+
+	async def evaluate_async(self, arguments):
+		""" The coroutine version of `evaluate`. """
+		import asyncio
+		return await asyncio.wrap_future(self.submit(arguments))
+
+	def close(self):
+		""" Flushes the queue, and stops the background thread. """
+		with self.condition:
+			self.closed = True
+			self.condition.notify()
+		self.thread.join()
+
+	def getStats(self):
+		""" Returns batch size and queue delay (in milliseconds) histograms. """
+		return {
+			"batch_size" : self.batchSizes.getStats(),
+			"queue_delay_ms" : self.queueDelays.getStats()
+		}
+
+	def _run(self):
+		maxDelay = self.max_delay_ms / 1000.0
+		while True:
+			with self.condition:
+				while not self.pending and not self.closed:
+					self.condition.wait()
+				if not self.pending:
+					return
+				deadline = self.pending[0][2] + maxDelay
+				while len(self.pending) < self.max_batch_size and not self.closed:
+					remaining = deadline - time.monotonic()
+					if remaining <= 0:
+						break
+					self.condition.wait(remaining)
+				batch = [self.pending.popleft() for i in range(min(len(self.pending), self.max_batch_size))]
+			self._flush(batch)
+
+	def _flush(self, batch):
+		now = time.monotonic()
+		# Skip cancelled calls
+		batch = [(arguments, future, enqueued) for arguments, future, enqueued in batch if future.set_running_or_notify_cancel()]
+		if not batch:
+			return
+		self.batchSizes.observe(len(batch))
+		for arguments, future, enqueued in batch:
+			self.queueDelays.observe((now - enqueued) * 1000.0)
+		try:
+			results = self.evaluator.evaluateRecords([arguments for arguments, future, enqueued in batch], nan_as_missing = self.nan_as_missing, parallelism = self.parallelism)
+		except Exception as e:
+			for arguments, future, enqueued in batch:
+				future.set_exception(e)
+			return
+		for (arguments, future, enqueued), result in zip(batch, results):
+			if isinstance(result, Exception):
+				future.set_exception(result)
+			else:
+				future.set_result(result)
+
+def _exponentialBounds(lower, upper):
+	bounds = []
+	bound = lower
+	while bound < upper:
+		bounds.append(bound)
+		bound *= 2
+	bounds.append(upper)
+	return bounds
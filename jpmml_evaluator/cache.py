@@ -0,0 +1,173 @@
+import hashlib
+import json
+import os
+import time
+
+from collections import OrderedDict
+from pathlib import Path
+from threading import RLock
+
+class EvaluatorCache(object):
+	""" A least-recently-used (LRU) cache of Evaluators.
+
+	Evaluators are keyed by the SHA-256 digest of the PMML document plus the Java backend and the builder options.
+	The memory footprint of an Evaluator is approximated by the size of its PMML document.
+
+	Parameters:
+	----------
+	max_entries: int, optional
+		The maximum number of Evaluators.
+
+	max_memory: int, optional
+		The maximum total size of PMML documents, in bytes.
+	"""
+
+	def __init__(self, max_entries = 128, max_memory = None):
+		if max_entries is not None and max_entries < 1:
+			raise ValueError("Max entries {0} is not positive".format(max_entries))
+		if max_memory is not None and max_memory < 1:
+			raise ValueError("Max memory {0} is not positive".format(max_memory))
+		self.max_entries = max_entries
+		self.max_memory = max_memory
+		self.entries = OrderedDict()
+		self.memory = 0
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+		self.lock = RLock()
+
+	def __len__(self):
+		with self.lock:
+			return len(self.entries)
+
+	def __contains__(self, key):
+		with self.lock:
+			return key in self.entries
+
+	def makeKey(self, pmml_bytes, backend, **options):
+		digest = hashlib.sha256(pmml_bytes)
+		digest.update(_backendKey(backend).encode("utf-8"))
+		digest.update(json.dumps(options, sort_keys = True, default = str).encode("utf-8"))
+		return digest.hexdigest()
+
+	def get(self, key):
+		with self.lock:
+			entry = self.entries.get(key)
+			if entry is None:
+				self.misses += 1
+				return None
+			self.entries.move_to_end(key)
+			self.hits += 1
+			evaluator, size = entry
+			return evaluator
+
+	def put(self, key, evaluator, size = 0):
+		with self.lock:
+			prevEntry = self.entries.pop(key, None)
+			if prevEntry is not None:
+				self.memory -= prevEntry[1]
+			self.entries[key] = (evaluator, size)
+			self.memory += size
+			self._evict()
+
+	def remove(self, key):
+		with self.lock:
+			entry = self.entries.pop(key, None)
+			if entry is None:
+				return None
+			evaluator, size = entry
+			self.memory -= size
+			return evaluator
+
+	def clear(self):
+		with self.lock:
+			self.entries.clear()
+			self.memory = 0
+
+	def getStats(self):
+		with self.lock:
+			return {
+				"entries" : len(self.entries),
+				"memory" : self.memory,
+				"hits" : self.hits,
+				"misses" : self.misses,
+				"evictions" : self.evictions
+			}
+
+	def _evict(self):
+		# The most recently used entry is never evicted
+		while len(self.entries) > 1:
+			if self.max_entries is not None and len(self.entries) > self.max_entries:
+				pass
+			elif self.max_memory is not None and self.memory > self.max_memory:
+				pass
+			else:
+				break
+			key, (evaluator, size) = self.entries.popitem(last = False)
+			self.memory -= size
+			self.evictions += 1
+
+def _backendKey(backend):
+	clazz = type(backend)
+	key = "{0}.{1}".format(clazz.__module__, clazz.__name__)
+	# Py4J backends may be connected to different JVMs
+	gateway = getattr(backend, "gateway", None)
+	if gateway is not None:
+		key += "@{0}".format(id(gateway))
+	return key
+
+class TranspilerCache(object):
+	""" A directory of transpiled PMML JAR files.
+
+	JAR files are keyed by the SHA-256 digest of the PMML document plus a version tag,
+	which changes whenever the JPMML-Evaluator-Python package or any of its Java libraries changes.
+
+	Parameters:
+	----------
+	directory: string or Path
+		The cache directory. Created if it does not exist.
+
+	version: string, optional
+		The version tag. If None, derived from the package version and the file names of the package JAR files.
+	"""
+
+	def __init__(self, directory, version = None):
+		if version is None:
+			version = _packageVersion()
+		self.directory = Path(directory)
+		self.directory.mkdir(parents = True, exist_ok = True)
+		self.version = version
+
+	def getPath(self, pmml_bytes):
+		digest = hashlib.sha256(pmml_bytes).hexdigest()
+		return self.directory / "{0}-{1}.jar".format(digest, self.version)
+
+	def getTempPath(self, path):
+		return path.with_name("{0}.{1}.tmp".format(path.name, os.getpid()))
+
+	def cleanup(self, max_tmp_age = 24 * 60 * 60):
+		""" Removes JAR files that have a different version tag, and abandoned temporary files. """
+		removed = []
+		now = time.time()
+		for path in self.directory.iterdir():
+			if path.suffix == ".jar":
+				if path.stem.endswith("-" + self.version):
+					continue
+			elif path.suffix == ".tmp":
+				if (now - path.stat().st_mtime) < max_tmp_age:
+					continue
+			else:
+				continue
+			try:
+				path.unlink()
+				removed.append(path)
+			except OSError:
+				pass
+		return removed
+
+def _packageVersion():
+	from jpmml_evaluator import __version__, _package_classpath
+	digest = hashlib.sha256(__version__.encode("utf-8"))
+	for jar in sorted(os.path.basename(jar) for jar in _package_classpath()):
+		digest.update(jar.encode("utf-8"))
+	return digest.hexdigest()[:16]
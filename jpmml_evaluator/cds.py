@@ -0,0 +1,87 @@
+""" Application class data sharing (AppCDS).
+
+An AppCDS archive contains the pre-parsed and pre-verified classes of the JDK and of the package JAR files,
+which reduces JVM startup and class loading times.
+It is opt-in: it is created once with the `python -m jpmml_evaluator cds` command,
+and then used automatically when the JVM is started by the JPype or PyJNIus backend.
+"""
+
+import os
+import subprocess
+import sys
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+def archive_path():
+	""" Returns the path of the AppCDS archive.
+
+	Defaults to a file in the user cache directory, whose name is specific to the package version.
+	The default can be overridden using the JPMML_EVALUATOR_CDS_ARCHIVE environment variable.
+	"""
+	path = os.environ.get("JPMML_EVALUATOR_CDS_ARCHIVE")
+	if path:
+		return Path(path)
+	from .cache import _packageVersion
+	cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+	return Path(cache_dir) / "jpmml_evaluator" / "jpmml-evaluator-{0}.jsa".format(_packageVersion())
+
+def jvm_options():
+	""" Returns the JVM options for using the AppCDS archive (if it exists). """
+	path = archive_path()
+	if path.is_file():
+		return ["-XX:SharedArchiveFile={0}".format(path)]
+	return []
+
+def make_archive(models = [], path = None, java = None):
+	""" Creates an AppCDS archive.
+
+	First, the list of loaded classes is recorded by loading (and verifying) the specified models in a child Python process.
+	Then, the archive is dumped by a child Java process.
+
+	Parameters:
+	----------
+	models: list of strings
+		Paths to PMML files.
+
+	path: string or Path, optional
+		The path of the AppCDS archive. If None, see `archive_path`.
+
+	java: string, optional
+		The path of the Java executable. If None, use the Java executable of the default JVM.
+	"""
+	from jpmml_evaluator import _classpath
+	if path is None:
+		path = archive_path()
+	path = Path(path)
+	if java is None:
+		java = _java()
+	path.parent.mkdir(parents = True, exist_ok = True)
+	with TemporaryDirectory() as tmpdir:
+		classlist = os.path.join(tmpdir, "classes.lst")
+		subprocess.run([sys.executable, "-m", "jpmml_evaluator.cds", classlist] + [str(model) for model in models], check = True)
+		# The archive must be created for exactly the same classpath as the one that is used at runtime
+		subprocess.run([java, "-Xshare:dump", "-XX:SharedClassListFile={0}".format(classlist), "-XX:SharedArchiveFile={0}".format(path), "-cp", os.pathsep.join(_classpath([]))], check = True, stdout = subprocess.DEVNULL)
+	return path
+
+def _java():
+	import jpype
+	# The JVM library is located at <java.home>/lib/server/libjvm.so (or <java.home>\bin\server\jvm.dll on Windows)
+	java_home = Path(jpype.getDefaultJVMPath()).parents[2]
+	return str(java_home / "bin" / ("java.exe" if os.name == "nt" else "java"))
+
+def _recordClasses(classlist, models):
+	import jpype
+
+	from jpmml_evaluator import _classpath, make_evaluator
+	from jpmml_evaluator.jpype import JPypeBackend
+
+	jpype.startJVM("-XX:DumpLoadedClassList={0}".format(classlist), classpath = _classpath([]))
+
+	backend = JPypeBackend()
+	for model in models:
+		make_evaluator(model, backend = backend) \
+			.verify()
+
+if __name__ == "__main__":
+	_recordClasses(sys.argv[1], sys.argv[2:])
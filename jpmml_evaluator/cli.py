@@ -2,37 +2,191 @@ import sys
 
 from argparse import ArgumentParser
 
-import pandas
+from jpmml_evaluator import __version__, cds, make_backend, make_evaluator, LoadingModelEvaluatorBuilder
 
-from jpmml_evaluator import __version__, make_evaluator
+def main(argv = None):
+	if argv is None:
+		argv = sys.argv[1:]
+	if argv and argv[0] in COMMANDS:
+		return COMMANDS[argv[0]](argv[1:])
+	return evaluate(argv)
 
-def main():
+def evaluate(argv):
 	version = "JPMML-Evaluator-Python {}".format(__version__)
 
-	parser = ArgumentParser(prog = "jpmml_evaluator", description = "JPMML-Evaluator command-line application")
+	parser = ArgumentParser(prog = "jpmml_evaluator", description = "JPMML-Evaluator command-line application", epilog = "Other commands: {0}. Run 'jpmml_evaluator <command> --help' for details".format(", ".join(COMMANDS)))
 	parser.add_argument("model", type = str, help = "Model PMML file")
-	parser.add_argument("--backend", type = str, default = "jpype", help = "Java backend. One of 'jpype', 'pyjnius' or 'py4j'")
+	parser.add_argument("--backend", type = str, default = "jpype", help = "Java backend. One of 'jpype', 'pyjnius', 'py4j' or 'ipc'")
+	parser.add_argument("--serialized", action = "store_true", help = "Model file is in Java serialization format")
 	parser.add_argument("--transpile", action = "store_true", help = "Transpile PMML to Java")
+	parser.add_argument("--engine", type = str, choices = ["python", "java"], default = "python", help = "CSV engine. If 'java', the input and output CSV files are read and written on the Java side")
 	parser.add_argument("-i", "--input", type = str, help = "Input CSV file. If absent, read from system input")
 	parser.add_argument("-o", "--output", type = str, help = "Output CSV file. If absent, write to system output")
 	parser.add_argument("--sep", type = str, default = ",", help = "CSV separator character")
+	parser.add_argument("--chunk-size", type = int, default = 10000, help = "Number of rows to read, evaluate and write at a time")
+	parser.add_argument("--parallelism", type = int, default = -1, help = "Number of Java threads per chunk. If -1, use the common pool")
+	parser.add_argument("--columns", type = _names, help = "Comma-separated list of result columns to write")
+	parser.add_argument("--drop", type = _names, help = "Comma-separated list of result columns not to write")
+	parser.add_argument("--error-col", type = str, default = "errors", help = "Name of the error column. If empty, errors are not written")
 	parser.add_argument("--version", action = "version", version = version)
 
-	args = parser.parse_args()
+	args = parser.parse_args(argv)
 
-	evaluator = make_evaluator(args.model, backend = args.backend, transpile = args.transpile)
+	if args.engine == "java" and not (args.input and args.output):
+		parser.error("The Java engine requires input and output CSV files")
+
+	evaluator = make_evaluator(args.model, backend = args.backend, transpile = args.transpile, serialized = args.serialized)
 	evaluator.verify()
 
+	resultFields = evaluator.getTargetFields() + evaluator.getOutputFields()
+	resultNames = [resultField.getName() for resultField in resultFields]
+	for name in (args.columns or []) + (args.drop or []):
+		if name not in resultNames:
+			parser.error("Result column {0} not in {1}".format(name, resultNames))
+	dropResultFields = [resultField for resultField in resultFields if (args.columns is not None and resultField.getName() not in args.columns) or (args.drop is not None and resultField.getName() in args.drop)]
+	evaluator.suppressResultFields(dropResultFields)
+
+	if args.engine == "java":
+		evaluator.evaluateFile(args.input, args.output, sep = args.sep, error_col = args.error_col, parallelism = args.parallelism, batch_size = args.chunk_size)
+		return
+
 	if args.input:
 		input = args.input
 	else:
 		input = sys.stdin
 
 	if args.output:
-		output = args.output
+		output = open(args.output, "w", newline = "")
 	else:
 		output = sys.stdout
 
-	arguments = pandas.read_csv(input, sep = args.sep)	
-	results = evaluator.evaluateAll(arguments)
-	results.to_csv(output, sep = args.sep, header = True, index = False)
+	import pandas
+
+	try:
+		chunks = pandas.read_csv(input, sep = args.sep, chunksize = args.chunk_size)
+		header = True
+		for results, errors in evaluator.evaluateIter(chunks, error_col = None, parallelism = args.parallelism):
+			if args.columns is not None:
+				results = results[[column for column in args.columns if column in results.columns]]
+			# The error column is written for every chunk, in order to keep the layout of the output stable
+			if args.error_col:
+				results[args.error_col] = errors
+			results.to_csv(output, sep = args.sep, header = header, index = False)
+			output.flush()
+			header = False
+	finally:
+		if output is not sys.stdout:
+			output.close()
+
+def serialize(argv):
+	parser = ArgumentParser(prog = "jpmml_evaluator serialize", description = "Converts a PMML file to Java serialization format")
+	parser.add_argument("model", type = str, help = "Model PMML file")
+	parser.add_argument("output", type = str, help = "Model file in Java serialization format")
+	parser.add_argument("--backend", type = str, default = "jpype", help = "Java backend. One of 'jpype', 'pyjnius', 'py4j' or 'ipc'")
+
+	args = parser.parse_args(argv)
+
+	backend = make_backend(args.backend)
+
+	LoadingModelEvaluatorBuilder(backend) \
+		.loadFile(args.model) \
+		.saveSerialized(args.output)
+
+def make_cds(argv):
+	parser = ArgumentParser(prog = "jpmml_evaluator cds", description = "Creates an application class data sharing (AppCDS) archive, which speeds up JVM startup and model loading with the 'jpype' and 'pyjnius' backends")
+	parser.add_argument("models", type = str, nargs = "*", help = "Model PMML files to load during the training run. If absent, only JPMML-Evaluator-Python startup classes are archived")
+	parser.add_argument("--archive", type = str, help = "AppCDS archive file. If absent, the default archive file, which is used automatically on JVM startup")
+	parser.add_argument("--java", type = str, help = "Java executable. If absent, the Java executable of the default JVM")
+
+	args = parser.parse_args(argv)
+
+	archive = cds.make_archive(args.models, path = args.archive, java = args.java)
+	print(archive)
+
+def gateway(argv):
+	parser = ArgumentParser(prog = "jpmml_evaluator gateway", description = "Runs a standalone Py4J gateway JVM, which can be shared by several Python processes via 'Py4JBackend(gateway = Py4JBackend.connectGateway(port))'")
+	parser.add_argument("--port", type = int, default = 25333, help = "Port to listen on (loopback interface)")
+	parser.add_argument("--max-heap", type = str, help = "Maximum heap size (eg. '4g')")
+	parser.add_argument("--enable-auth", action = "store_true", help = "Require clients to provide the authentication token that is printed on startup")
+	parser.add_argument("--java", type = str, help = "Java executable. If absent, the Java executable of JAVA_HOME, or 'java'")
+
+	args = parser.parse_args(argv)
+
+	import subprocess
+
+	from jpmml_evaluator import JVMOptions
+	from jpmml_evaluator.py4j import Py4JBackend
+
+	command = Py4JBackend.gatewayCommand(port = args.port, jvm_options = JVMOptions(max_heap = args.max_heap), enable_auth = args.enable_auth, java = args.java)
+	try:
+		return subprocess.call(command)
+	except KeyboardInterrupt:
+		pass
+
+def ipc(argv):
+	parser = ArgumentParser(prog = "jpmml_evaluator ipc", description = "Runs the shared scoring JVM of the 'ipc' backend as a long-lived service")
+	parser.add_argument("--socket", type = str, help = "Unix domain socket path. If absent, the default path, which is used automatically by the 'ipc' backend")
+	parser.add_argument("--port", type = int, help = "Loopback TCP port to listen on, instead of a Unix domain socket")
+	parser.add_argument("--max-heap", type = str, help = "Maximum heap size (eg. '16g')")
+	parser.add_argument("--idle-timeout", type = int, default = 0, help = "Time (in seconds) after which to exit when there are no connections. If 0, run until interrupted")
+	parser.add_argument("--java", type = str, help = "Java executable. If absent, the Java executable of JAVA_HOME, or 'java'")
+
+	args = parser.parse_args(argv)
+
+	import os
+	import subprocess
+
+	from jpmml_evaluator import JVMOptions
+	from jpmml_evaluator.ipc import IPCBackend
+
+	if args.socket and args.port is not None:
+		parser.error("The --socket and --port options are mutually exclusive")
+	address = ("127.0.0.1", args.port) if args.port is not None else args.socket
+
+	command = IPCBackend.serverCommand(address = address, jvm_options = JVMOptions(max_heap = args.max_heap), idle_timeout = args.idle_timeout, java = args.java)
+	# Use the authentication token of the JPMML_EVALUATOR_IPC_TOKEN environment variable, or generate a new one
+	env = IPCBackend.serverEnvironment(address = address, auth_token = os.environ.get("JPMML_EVALUATOR_IPC_TOKEN"))
+	try:
+		return subprocess.call(command, env = env)
+	except KeyboardInterrupt:
+		pass
+
+def serve(argv):
+	parser = ArgumentParser(prog = "jpmml_evaluator serve", description = "Serves all models in a directory over HTTP")
+	parser.add_argument("--models", type = str, required = True, help = "Directory of model PMML files (*.pmml) and Java-serialized model files (*.ser)")
+	parser.add_argument("--host", type = str, default = "127.0.0.1", help = "Host name or address to listen on")
+	parser.add_argument("--port", type = int, default = 8080, help = "Port to listen on. If 0, a free port")
+	parser.add_argument("--backend", type = str, default = "jpype", help = "Java backend. One of 'jpype', 'pyjnius', 'py4j' or 'ipc'")
+	parser.add_argument("--max-batch-size", type = int, default = 64, help = "Maximum number of single-record requests per batch evaluation")
+	parser.add_argument("--max-delay-ms", type = float, default = 2, help = "Maximum time that a single-record request waits for its batch, in milliseconds")
+	parser.add_argument("--parallelism", type = int, default = -1, help = "Number of Java threads per batch. If -1, use the common pool")
+	parser.add_argument("--verbose", action = "store_true", help = "Log requests")
+
+	args = parser.parse_args(argv)
+
+	from jpmml_evaluator.server import load_evaluators, ScoringServer
+
+	evaluators = load_evaluators(args.models, backend = args.backend)
+	if not evaluators:
+		parser.error("Directory {0} does not contain any models".format(args.models))
+
+	server = ScoringServer((args.host, args.port), evaluators, max_batch_size = args.max_batch_size, max_delay_ms = args.max_delay_ms, parallelism = args.parallelism, verbose = args.verbose)
+	host, port = server.server_address[0:2]
+	print("Serving {0} model(s) {1} on http://{2}:{3}".format(len(evaluators), sorted(evaluators), host, port), flush = True)
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+
+COMMANDS = {
+	"cds" : make_cds,
+	"gateway" : gateway,
+	"ipc" : ipc,
+	"serialize" : serialize,
+	"serve" : serve
+}
+
+def _names(value):
+	return [name.strip() for name in value.split(",") if name.strip()]
@@ -0,0 +1,267 @@
+import pickle
+import struct
+
+from pandas import Categorical, CategoricalDtype
+from pandas.arrays import BooleanArray, IntegerArray
+from pandas.api.types import infer_dtype, is_bool_dtype, is_extension_array_dtype, is_float_dtype, is_integer_dtype, is_string_dtype, is_unsigned_integer_dtype
+
+import numpy
+
+# See org.jpmml.evaluator.python.ColumnarUtil
+TYPE_DOUBLE = 1
+TYPE_LONG = 2
+TYPE_BOOLEAN = 3
+TYPE_STRING = 4
+TYPE_PICKLE = 5
+
+def _pad(position, alignment):
+	return -position % alignment
+
+class _Writer(object):
+
+	def __init__(self):
+		self.chunks = []
+		self.position = 0
+
+	def write(self, data):
+		self.chunks.append(data)
+		self.position += len(data)
+
+	def writeInt(self, value):
+		self.write(struct.pack("<i", value))
+
+	def writeByte(self, value):
+		self.write(struct.pack("<B", value))
+
+	def writeString(self, value):
+		data = value.encode("utf-8")
+		self.writeInt(len(data))
+		self.write(data)
+
+	def writePadding(self, alignment):
+		padding = _pad(self.position, alignment)
+		if padding:
+			self.write(bytes(padding))
+
+	def writeMask(self, mask):
+		if mask is not None and mask.any():
+			self.writeByte(1)
+			self.write(numpy.packbits(~mask, bitorder = "little").tobytes())
+		else:
+			self.writeByte(0)
+
+	def writeArray(self, values, alignment):
+		self.writePadding(alignment)
+		self.write(memoryview(numpy.ascontiguousarray(values)).cast("B"))
+
+	def getvalue(self):
+		return b"".join(self.chunks)
+
+class _Reader(object):
+
+	def __init__(self, buffer):
+		buffer = memoryview(buffer)
+		# Decoded arrays are views into the buffer, and must be writable
+		if buffer.readonly:
+			buffer = memoryview(bytearray(buffer))
+		self.buffer = buffer.cast("B")
+		self.position = 0
+
+	def read(self, length):
+		data = self.buffer[self.position:self.position + length]
+		self.position += length
+		return data
+
+	def readInt(self):
+		value, = struct.unpack_from("<i", self.buffer, self.position)
+		self.position += 4
+		return value
+
+	def readByte(self):
+		value = self.buffer[self.position]
+		self.position += 1
+		return value
+
+	def readString(self):
+		length = self.readInt()
+		return str(self.read(length), "utf-8")
+
+	def readMask(self, numberOfRows):
+		hasMask = self.readByte()
+		if hasMask:
+			bitmap = numpy.frombuffer(self.read((numberOfRows + 7) // 8), dtype = numpy.uint8)
+			return numpy.unpackbits(bitmap, count = numberOfRows, bitorder = "little") == 0
+		return None
+
+	def readArray(self, dtype, numberOfRows, alignment):
+		self.position += _pad(self.position, alignment)
+		dtype = numpy.dtype(dtype)
+		return numpy.frombuffer(self.read(numberOfRows * dtype.itemsize), dtype = dtype)
+
+def _writeColumn(writer, series):
+	dtype = series.dtype
+	if isinstance(dtype, CategoricalDtype):
+		categories = dtype.categories
+		if infer_dtype(categories, skipna = True) in ("string", "empty"):
+			writer.writeByte(TYPE_STRING)
+			_writeDictionary(writer, series.cat.codes.to_numpy(), categories.tolist())
+			return
+		series = series.astype(object)
+	elif is_bool_dtype(dtype):
+		mask = series.isna().to_numpy() if is_extension_array_dtype(dtype) else None
+		writer.writeByte(TYPE_BOOLEAN)
+		writer.writeMask(mask)
+		writer.writeArray(series.to_numpy(dtype = numpy.uint8, na_value = 0), 1)
+		return
+	elif is_integer_dtype(dtype) and not (is_unsigned_integer_dtype(dtype) and numpy.dtype(dtype).itemsize >= 8):
+		mask = series.isna().to_numpy() if is_extension_array_dtype(dtype) else None
+		writer.writeByte(TYPE_LONG)
+		writer.writeMask(mask)
+		writer.writeArray(series.to_numpy(dtype = "<i8", na_value = 0), 8)
+		return
+	elif is_float_dtype(dtype):
+		# NaN values are sent as-is, and are interpreted by the Java side
+		mask = series.isna().to_numpy() if is_extension_array_dtype(dtype) else None
+		writer.writeByte(TYPE_DOUBLE)
+		writer.writeMask(mask)
+		writer.writeArray(series.to_numpy(dtype = "<f8", na_value = numpy.nan), 8)
+		return
+	if (is_string_dtype(dtype) or dtype == object) and infer_dtype(series, skipna = True) in ("string", "empty"):
+		codes, uniques = series.factorize()
+		writer.writeByte(TYPE_STRING)
+		_writeDictionary(writer, codes, uniques.tolist())
+		return
+	writer.writeByte(TYPE_PICKLE)
+	data = pickle.dumps(series.tolist(), protocol = 2)
+	writer.writeInt(len(data))
+	writer.write(data)
+
+def _writeDictionary(writer, codes, dictionary):
+	writer.writeInt(len(dictionary))
+	for value in dictionary:
+		writer.writeString(value)
+	writer.writeArray(codes.astype("<i4", copy = False), 4)
+
+def _readColumn(reader, numberOfRows):
+	columnType = reader.readByte()
+	if columnType == TYPE_DOUBLE or columnType == TYPE_LONG:
+		mask = reader.readMask(numberOfRows)
+		values = reader.readArray("<f8" if columnType == TYPE_DOUBLE else "<i8", numberOfRows, 8)
+		return maskValues(values, mask)
+	elif columnType == TYPE_BOOLEAN:
+		mask = reader.readMask(numberOfRows)
+		values = reader.readArray(numpy.uint8, numberOfRows, 1).view(bool)
+		return maskValues(values, mask)
+	elif columnType == TYPE_STRING:
+		codes, dictionary = _readDictionary(reader, numberOfRows)
+		return Categorical.from_codes(codes, categories = dictionary)
+	elif columnType == TYPE_PICKLE:
+		length = reader.readInt()
+		return pickle.loads(reader.read(length))
+	else:
+		raise ValueError("Column type {0} is not supported".format(columnType))
+
+def _readDictionary(reader, numberOfRows):
+	size = reader.readInt()
+	dictionary = [reader.readString() for i in range(size)]
+	codes = reader.readArray("<i4", numberOfRows, 4)
+	return (codes, dictionary)
+
+def maskValues(values, mask):
+	""" Combines a NumPy array with a missing value mask (or None).
+
+	Float values are masked with NaN, integer and boolean values are wrapped into nullable extension arrays.
+	"""
+	if mask is None or not mask.any():
+		return values
+	if values.dtype.kind == "f":
+		values = values.copy()
+		values[mask] = numpy.nan
+		return values
+	elif values.dtype.kind == "b":
+		return BooleanArray(values, mask)
+	else:
+		return IntegerArray(values.astype(numpy.int64, copy = False), mask)
+
+def toObjectArray(values):
+	""" Converts a Categorical to an object array, where missing values are represented as None. """
+	# The trailing None is selected by the missing value code -1
+	dictionary = numpy.empty(len(values.categories) + 1, dtype = object)
+	dictionary[:-1] = values.categories.to_numpy(dtype = object)
+	return dictionary[values.codes]
+
+def _isBufferable(dtype):
+	if isinstance(dtype, CategoricalDtype) or is_bool_dtype(dtype):
+		return False
+	return is_float_dtype(dtype) or (is_integer_dtype(dtype) and not (is_unsigned_integer_dtype(dtype) and numpy.dtype(dtype).itemsize >= 8))
+
+def splitBuffers(arguments_df):
+	""" Splits a DataFrame into numeric columns and the remainder.
+
+	Numeric columns are converted to contiguous little-endian float64 or int64 arrays
+	(without copying, where the data is already laid out as such),
+	plus byte-per-row missing value masks (or None) for nullable extension dtypes.
+
+	Returns a tuple (columns, values, masks, remainder_df).
+	"""
+	columns = []
+	values = []
+	masks = []
+	other_columns = []
+	for column, series in arguments_df.items():
+		dtype = series.dtype
+		if not _isBufferable(dtype):
+			other_columns.append(column)
+			continue
+		if is_float_dtype(dtype):
+			array = series.to_numpy(dtype = "<f8", na_value = numpy.nan)
+		else:
+			array = series.to_numpy(dtype = "<i8", na_value = 0)
+		mask = series.isna().to_numpy() if is_extension_array_dtype(dtype) else None
+		if mask is not None and not mask.any():
+			mask = None
+		columns.append(str(column))
+		values.append(numpy.ascontiguousarray(array))
+		masks.append(mask.view(numpy.uint8) if mask is not None else None)
+	return (columns, values, masks, arguments_df[other_columns])
+
+def dumps(arguments_df):
+	""" Encodes a DataFrame in the columnar binary format.
+
+	Numeric and boolean columns are written as contiguous blocks of typed values,
+	string and categorical columns as dictionary-encoded blocks.
+	All other columns are pickled.
+	"""
+	writer = _Writer()
+	writer.writeInt(len(arguments_df))
+	writer.writeInt(len(arguments_df.columns))
+	for column, series in arguments_df.items():
+		writer.writeString(str(column))
+		_writeColumn(writer, series)
+	writer.writeByte(0)
+	return writer.getvalue()
+
+def loads(results):
+	""" Decodes a results dict from the columnar binary format.
+
+	Numeric and boolean columns are decoded as NumPy arrays (nullable extension arrays, if there are missing values),
+	string columns as Categoricals.
+	"""
+	reader = _Reader(results)
+	numberOfRows = reader.readInt()
+	numberOfColumns = reader.readInt()
+	columns = []
+	data = []
+	for i in range(numberOfColumns):
+		columns.append(reader.readString())
+		data.append(_readColumn(reader, numberOfRows))
+	errors = None
+	hasErrors = reader.readByte()
+	if hasErrors:
+		codes, dictionary = _readDictionary(reader, numberOfRows)
+		errors = toObjectArray(Categorical.from_codes(codes, categories = dictionary)).tolist()
+	return {
+		"columns" : columns,
+		"data" : data,
+		"errors" : errors
+	}
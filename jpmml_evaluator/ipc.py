@@ -0,0 +1,445 @@
+""" Shared-JVM local IPC backend.
+
+All Python processes on a host (eg. the workers of a pre-fork web server) talk to one local scoring JVM
+over a Unix domain socket, so that models are loaded once per host, not once per process.
+
+The scoring JVM is started on demand by the first `IPCBackend`, and exits after it has been idle (without connections) for a while.
+Alternatively, it can be run as a long-lived service with the `python -m jpmml_evaluator ipc` command.
+
+Every connection is authenticated with a shared token, which is stored next to the socket in a file that is readable by the owner only.
+Unix domain sockets require Java 16 or newer. In older Java versions, the scoring JVM falls back to a loopback TCP socket.
+"""
+
+import copy
+import io
+import os
+import pickle
+import secrets
+import socket
+import struct
+import subprocess
+import tempfile
+
+from collections import deque
+
+from jpmml_evaluator import _classpath, _jvmOptions, _warnJVMStarted, cds, Evaluator, EvaluatorCache, JavaBackend, JavaError
+
+_OP_NEW = 0
+_OP_STATIC = 1
+_OP_CALL = 2
+_OP_LOOKUP = 3
+_OP_EXPORT = 4
+_OP_UNEXPORT = 5
+
+_STATUS_VALUE = 0
+_STATUS_ERROR = 1
+_STATUS_BYTES = 2
+
+_SERVER_CLASS_NAME = "org.jpmml.evaluator.python.IPCServer"
+
+_TOKEN_VARIABLE = "JPMML_EVALUATOR_IPC_TOKEN"
+
+def default_address():
+	""" Returns the path of the Unix domain socket of the scoring JVM.
+
+	Defaults to a file in the user runtime directory (or in the temporary directory), whose name is specific to the user and the package version.
+	The default can be overridden using the JPMML_EVALUATOR_IPC_ADDRESS environment variable.
+	"""
+	address = os.environ.get("JPMML_EVALUATOR_IPC_ADDRESS")
+	if address:
+		return address
+	from .cache import _packageVersion
+	runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+	return os.path.join(runtime_dir, "jpmml_evaluator-{0}-{1}.sock".format(os.getuid(), _packageVersion()))
+
+class IPCBackend(JavaBackend):
+	""" A Java backend that talks to a shared local scoring JVM.
+
+	Java objects live in the scoring JVM, and are represented by proxy objects on the Python side.
+	Concurrent Python threads talk to the scoring JVM over independent (pooled) connections.
+
+	Evaluators that are built by `make_evaluator` are exported to the scoring JVM, and reused by all processes that build an Evaluator for the same PMML content and options.
+
+	Parameters:
+	----------
+	address: string or tuple, optional
+		The path of a Unix domain socket, or the (host, port) address of a loopback TCP socket. If None, see `default_address`.
+
+	jvm_options: JVMOptions or list of strings, optional
+		JVM startup options. Ignored (with a warning) if the scoring JVM has already been started.
+
+	spawn: boolean
+		If True, start the scoring JVM, if it is not running yet.
+
+	idle_timeout: int
+		The time (in seconds) after which a spawned scoring JVM exits when it has no connections.
+
+	auth_token: string, optional
+		The authentication token of the scoring JVM. If None, the JPMML_EVALUATOR_IPC_TOKEN environment variable, or the token file (see `token_path`).
+	"""
+
+	def __init__(self, address = None, jvm_options = None, spawn = True, idle_timeout = 300, auth_token = None):
+		super(IPCBackend, self).__init__()
+		if address is None:
+			address = default_address()
+		self.address = address
+		self.authToken = auth_token or os.environ.get(_TOKEN_VARIABLE)
+		self.pid = os.getpid()
+		self.connections = deque()
+		self.releasedIds = deque()
+		self.evaluatorCache = SharedEvaluatorCache(self)
+		try:
+			self._putConnection(self._connect())
+			_warnJVMStarted(jvm_options)
+		except (FileNotFoundError, ConnectionRefusedError):
+			if not spawn:
+				raise
+			self._spawnServer(jvm_options, idle_timeout)
+
+	def __del__(self):
+		self.close()
+
+	def close(self):
+		""" Closes all pooled connections. """
+		while True:
+			try:
+				self.connections.pop().close()
+			except IndexError:
+				break
+
+	def getDefaultCache(self):
+		return self.evaluatorCache
+
+	@classmethod
+	def serverCommand(cls, address = None, user_classpath = [], jvm_options = None, idle_timeout = 0, java = None):
+		""" Returns the command line for running the scoring JVM. """
+		if address is None:
+			address = default_address()
+		if java is None:
+			java_home = os.environ.get("JAVA_HOME")
+			java = os.path.join(java_home, "bin", "java") if java_home else "java"
+		return [java, "-cp", os.pathsep.join(_classpath(user_classpath = user_classpath))] + cds.jvm_options() + _jvmOptions(jvm_options) + [_SERVER_CLASS_NAME, _serverAddress(address), str(idle_timeout)]
+
+	@classmethod
+	def serverEnvironment(cls, address = None, auth_token = None):
+		""" Returns the environment for running the scoring JVM.
+
+		Stores the authentication token in the token file, so that other processes of the same user can connect.
+		If the authentication token is None, generates a new one.
+		"""
+		if address is None:
+			address = default_address()
+		if auth_token is None:
+			auth_token = secrets.token_hex(32)
+		fd = os.open(token_path(address), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+		with os.fdopen(fd, "w") as token_file:
+			os.fchmod(fd, 0o600)
+			token_file.write(auth_token)
+		return dict(os.environ, **{_TOKEN_VARIABLE : auth_token})
+
+	def _spawnServer(self, jvm_options, idle_timeout):
+		import fcntl
+
+		# Serialize the startup between concurrent processes
+		with open(_statePath(self.address, "lock"), "w") as lock_file:
+			fcntl.flock(lock_file, fcntl.LOCK_EX)
+			try:
+				self._putConnection(self._connect())
+				_warnJVMStarted(jvm_options)
+				return
+			except (FileNotFoundError, ConnectionRefusedError):
+				pass
+			command = IPCBackend.serverCommand(address = self.address, jvm_options = jvm_options, idle_timeout = idle_timeout)
+			env = IPCBackend.serverEnvironment(address = self.address, auth_token = self.authToken)
+			self.authToken = env[_TOKEN_VARIABLE]
+			# Detach the scoring JVM from this process, so that it outlives it
+			process = subprocess.Popen(command, stdin = subprocess.DEVNULL, stdout = subprocess.PIPE, stderr = subprocess.DEVNULL, env = env, start_new_session = True)
+			line = process.stdout.readline().decode("utf-8").strip()
+			process.stdout.close()
+			if not line:
+				raise RuntimeError("Scoring JVM exited with code {0}".format(process.wait()))
+			# The scoring JVM reports the actual port of an ephemeral TCP socket
+			if line.startswith("tcp:") and not isinstance(self.address, str):
+				self.address = (self.address[0], int(line[len("tcp:"):]))
+			self._putConnection(self._connect())
+
+	def _connect(self):
+		address = _resolveAddress(self.address)
+		if isinstance(address, str):
+			sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+		else:
+			sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+			sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+		try:
+			sock.connect(address)
+			self._authenticate(sock)
+		except BaseException:
+			sock.close()
+			raise
+		return sock
+
+	def _authenticate(self, sock):
+		auth_token = self.authToken
+		if auth_token is None:
+			try:
+				with open(token_path(self.address), "r") as token_file:
+					auth_token = token_file.read().strip()
+			except FileNotFoundError:
+				raise PermissionError("Authentication token of the scoring JVM is not available")
+		token = auth_token.encode("utf-8")
+		sock.sendall(struct.pack(">i", len(token)) + token)
+		length, = struct.unpack(">i", _recvExactly(sock, 4))
+		response = _recvExactly(sock, length)
+		if response[0] != _STATUS_VALUE:
+			raise PermissionError("Scoring JVM rejected the authentication token")
+
+	def _getConnection(self):
+		# Connections and pending releases are not inherited by forked processes
+		if self.pid != os.getpid():
+			self.pid = os.getpid()
+			self.connections.clear()
+			self.releasedIds.clear()
+		try:
+			return self.connections.pop()
+		except IndexError:
+			return self._connect()
+
+	def _putConnection(self, sock):
+		self.connections.append(sock)
+
+	def _request(self, opcode, target = None, name = None, args = ()):
+		sock = self._getConnection()
+		releasedIds = []
+		while True:
+			try:
+				releasedIds.append(self.releasedIds.popleft())
+			except IndexError:
+				break
+		# Pending releases are put back if the request fails. Object ids are never reused, so releasing an id twice is harmless
+		try:
+			buffer = io.BytesIO()
+			_Pickler(self, buffer).dump((opcode, releasedIds, target, name, tuple(args)))
+		except BaseException:
+			self.releasedIds.extend(releasedIds)
+			self._putConnection(sock)
+			raise
+		request = buffer.getbuffer()
+		try:
+			sock.sendmsg([struct.pack(">i", len(request)), request])
+			length, = struct.unpack(">i", _recvExactly(sock, 4))
+			response = _recvExactly(sock, length)
+		except BaseException:
+			self.releasedIds.extend(releasedIds)
+			# The connection is in an unknown state
+			sock.close()
+			raise
+		self._putConnection(sock)
+		status = response[0]
+		payload = memoryview(response)[1:]
+		if status == _STATUS_BYTES:
+			return bytes(payload)
+		value = _Unpickler(self, io.BytesIO(payload)).load()
+		if status == _STATUS_ERROR:
+			raise IPCJavaException(*value)
+		return value
+
+	def _release(self, id):
+		self.releasedIds.append(id)
+
+	def _loadJavaClass(self, className):
+		return className
+
+	def newObject(self, className, *args):
+		return self._request(_OP_NEW, self._ensureJavaClass(className), None, args)
+
+	def newArray(self, className, values):
+		# Lists are converted to Java arrays when passed as method arguments
+		return list(values)
+
+	def staticInvoke(self, className, methodName, *args):
+		return self._request(_OP_STATIC, self._ensureJavaClass(className), methodName, args)
+
+	def toJavaError(self, e):
+		if isinstance(e, IPCJavaException):
+			return JavaError(self, e.className, e.message, e.stackTrace)
+		return e
+
+class IPCJavaException(Exception):
+	""" A Java exception that was raised in the scoring JVM. """
+
+	def __init__(self, className, message, stackTrace):
+		super(IPCJavaException, self).__init__(className, message)
+		self.className = className
+		self.message = message
+		self.stackTrace = stackTrace
+
+	def __str__(self):
+		return "{0}: {1}".format(self.className, self.message)
+
+class JavaProxy(object):
+	""" A reference to a Java object in the scoring JVM.
+
+	Attribute access yields remote methods. The Java object is released when the proxy is garbage collected by the process that created it.
+	"""
+
+	def __init__(self, backend, id):
+		self.backend = backend
+		self.id = id
+		self.pid = os.getpid()
+
+	def __getattr__(self, name):
+		if name.startswith("__"):
+			raise AttributeError(name)
+
+		def _invoke(*args):
+			return self.backend._request(_OP_CALL, self, name, args)
+
+		return _invoke
+
+	def __str__(self):
+		return self.backend._request(_OP_CALL, self, "toString")
+
+	def __repr__(self):
+		return "JavaProxy({0})".format(self.id)
+
+	def __del__(self):
+		# Proxies that are inherited by forked processes refer to Java objects that are still in use by the parent process
+		if self.pid == os.getpid():
+			self.backend._release(self.id)
+
+class SharedEvaluatorCache(EvaluatorCache):
+	""" A cache of Evaluators, which is shared by all processes that use the same scoring JVM.
+
+	Java evaluators are exported to the scoring JVM under their `EvaluatorCache` key, together with their size.
+	Evaluators that are built or looked up by this process are also kept locally, so that repeated lookups do not need to re-read field metadata from the scoring JVM.
+	Evaluators that are evicted from the local cache are unexported from the scoring JVM. Processes that already hold them keep using them.
+
+	Every lookup returns a new Evaluator, so that Python-side settings (eg. suppressed result fields) are not shared between callers.
+
+	Parameters:
+	----------
+	backend: IPCBackend
+		The backend.
+
+	Other parameters are the same as for `EvaluatorCache`.
+	"""
+
+	def __init__(self, backend, max_entries = 128, max_memory = None):
+		super(SharedEvaluatorCache, self).__init__(max_entries = max_entries, max_memory = max_memory)
+		self.backend = backend
+
+	def get(self, key):
+		with self.lock:
+			entry = self.entries.get(key)
+			if entry is not None:
+				self.entries.move_to_end(key)
+				self.hits += 1
+				evaluator, size = entry
+				return copy.copy(evaluator)
+		export = self.backend._request(_OP_LOOKUP, key)
+		if export is None:
+			with self.lock:
+				self.misses += 1
+			return None
+		javaEvaluator, size = export
+		evaluator = Evaluator(self.backend, javaEvaluator)
+		with self.lock:
+			self.hits += 1
+		self._putLocal(key, evaluator, size)
+		return copy.copy(evaluator)
+
+	def put(self, key, evaluator, size = 0):
+		self.backend._request(_OP_EXPORT, key, (evaluator.javaEvaluator, size))
+		self._putLocal(key, copy.copy(evaluator), size)
+
+	def remove(self, key):
+		evaluator = super(SharedEvaluatorCache, self).remove(key)
+		self.backend._request(_OP_UNEXPORT, key)
+		return evaluator
+
+	def clear(self):
+		with self.lock:
+			keys = list(self.entries)
+			super(SharedEvaluatorCache, self).clear()
+		for key in keys:
+			self.backend._request(_OP_UNEXPORT, key)
+
+	def _putLocal(self, key, evaluator, size):
+		with self.lock:
+			keys = set(self.entries)
+			super(SharedEvaluatorCache, self).put(key, evaluator, size)
+			evictedKeys = keys.difference(self.entries)
+		for evictedKey in evictedKeys:
+			self.backend._request(_OP_UNEXPORT, evictedKey)
+
+class _Pickler(pickle.Pickler):
+
+	def __init__(self, backend, file):
+		super(_Pickler, self).__init__(file, protocol = 3)
+		self.backend = backend
+
+	def persistent_id(self, obj):
+		if isinstance(obj, JavaProxy):
+			if obj.backend is not self.backend:
+				raise ValueError("Java object belongs to a different backend")
+			return obj.id
+		return None
+
+class _Unpickler(pickle.Unpickler):
+
+	# The scoring JVM pickles byte arrays, arrays of primitive values and big numbers using these classes
+	SAFE_CLASSES = {
+		("__builtin__", "bytearray"),
+		("builtins", "bytearray"),
+		("_codecs", "encode"),
+		("array", "array"),
+		("decimal", "Decimal")
+	}
+
+	def __init__(self, backend, file):
+		super(_Unpickler, self).__init__(file)
+		self.backend = backend
+
+	def persistent_load(self, pid):
+		return JavaProxy(self.backend, pid)
+
+	def find_class(self, module, name):
+		if (module, name) not in _Unpickler.SAFE_CLASSES:
+			raise pickle.UnpicklingError("Class {0}.{1} is not allowed".format(module, name))
+		return super(_Unpickler, self).find_class(module, name)
+
+def token_path(address):
+	""" Returns the path of the file that stores the authentication token of the scoring JVM. """
+	return _statePath(address, "token")
+
+def _statePath(address, extension):
+	if isinstance(address, str):
+		return "{0}.{1}".format(address, extension)
+	host, port = address
+	return os.path.join(tempfile.gettempdir(), "jpmml_evaluator-{0}-{1}.{2}".format(os.getuid(), port, extension))
+
+def _resolveAddress(address):
+	# A scoring JVM that does not support Unix domain sockets (Java 15 and older) writes the address of its TCP socket in place of the socket
+	if isinstance(address, str) and os.path.isfile(address):
+		with open(address, "r") as address_file:
+			line = address_file.read().strip()
+		if line.startswith("tcp:"):
+			return ("127.0.0.1", int(line[len("tcp:"):]))
+	return address
+
+def _serverAddress(address):
+	if isinstance(address, str):
+		return address
+	host, port = address
+	return "tcp:{0}".format(port)
+
+def _recvExactly(sock, n):
+	buffer = bytearray(n)
+	view = memoryview(buffer)
+	while n:
+		count = sock.recv_into(view, n)
+		if not count:
+			raise ConnectionError("Scoring JVM closed the connection")
+		view = view[count:]
+		n -= count
+	return buffer
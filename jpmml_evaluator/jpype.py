@@ -1,39 +1,54 @@
-import importlib
-
 import jpype
-import jpype.imports
+import jpype.nio
 
-from jpmml_evaluator import _classpath, JavaError, JNIBackend, PythonEvaluatorUtil
+from jpmml_evaluator import _classpath, _jvmOptions, _warnJVMStarted, cds, JavaError, JNIBackend, PythonEvaluatorUtil
 
 class JPypeBackend(JNIBackend):
 
-	def __init__(self):
+	transports = ["buffer", "columnar", "pickle"]
+
+	def __init__(self, jvm_options = None):
 		super(JPypeBackend, self).__init__()
-		JPypeBackend.ensureJVM()
+		JPypeBackend.ensureJVM(jvm_options = jvm_options)
 
 	@classmethod
-	def ensureJVM(cls):
+	def ensureJVM(cls, jvm_options = None):
 		if not jpype.isJVMStarted():
-			cls.createJVM()
-		importlib.import_module(PythonEvaluatorUtil.JAVA_CLASS_NAME)
+			cls.createJVM(jvm_options = jvm_options)
+		else:
+			_warnJVMStarted(jvm_options)
+		jpype.JClass(PythonEvaluatorUtil.JAVA_CLASS_NAME)
 
 	@classmethod
-	def createJVM(cls, user_classpath = []):
-		jpype.startJVM(classpath = _classpath(user_classpath = user_classpath))
+	def createJVM(cls, user_classpath = [], jvm_options = None):
+		jpype.startJVM(*(cds.jvm_options() + _jvmOptions(jvm_options)), classpath = _classpath(user_classpath = user_classpath))
 
 	@classmethod
 	def destroyJVM(cls):
 		jpype.shutdownJVM()
 
 	def _loadJavaClass(self, className):
-		return importlib.import_module(className)
+		# Not using the jpype.imports module, because its import hook would shadow missing Python packages (eg. pyarrow) with the same-named Java packages of the PMML-Python library
+		return jpype.JClass(className)
 
 	def newObject(self, className, *args):
 		javaClass = self._ensureJavaClass(className)
 		return javaClass(*args)
 
 	def newArray(self, className, values):
-		return list(values)
+		# A Java array can be passed to any number of calls, whereas a list is converted anew on every call
+		return jpype.JArray(self._ensureJavaClass(className))(list(values))
+
+	def newBuffer(self, values):
+		ByteOrder = self._ensureJavaClass("java.nio.ByteOrder")
+		# Zero-copy view of the NumPy array memory
+		buffer = jpype.nio.convertToDirectBuffer(values) \
+			.order(ByteOrder.LITTLE_ENDIAN)
+		if values.dtype.kind == "f":
+			return buffer.asDoubleBuffer()
+		elif values.dtype.kind == "i":
+			return buffer.asLongBuffer()
+		return buffer
 
 	def staticInvoke(self, className, methodName, *args):
 		javaClass = self._ensureJavaClass(className)
@@ -2,32 +2,85 @@ from __future__ import absolute_import
 
 import os
 
-from py4j.java_gateway import JavaGateway
+from threading import Barrier, Thread
+
+from py4j.java_gateway import find_jar_path, GatewayParameters, JavaGateway
 from py4j.protocol import Py4JJavaError
 
-from jpmml_evaluator import _classpath, JavaBackend, JavaError, PythonEvaluatorUtil
+from jpmml_evaluator import _classpath, _jvmOptions, _warnJVMStarted, JavaBackend, JavaError, PythonEvaluatorUtil
 
 class Py4JBackend(JavaBackend):
 
 	gateway = None
 
 
-	def __init__(self, gateway = None):
+	def __init__(self, gateway = None, jvm_options = None, pool_size = None):
 		super(Py4JBackend, self).__init__()
 		if not gateway:
-			gateway = Py4JBackend.ensureGateway()
+			gateway = Py4JBackend.ensureGateway(jvm_options = jvm_options)
+		elif jvm_options is not None:
+			raise ValueError("JVM options cannot be applied to an existing gateway")
 		self.gateway = gateway
+		if pool_size is not None:
+			self.warmupConnections(pool_size)
+
+	def warmupConnections(self, pool_size):
+		""" Warms up the connection pool of the gateway client, so that up to `pool_size` concurrent Python threads are likely to find an open connection.
+
+		The gateway client hands out idle connections to calling threads, opens new ones on demand, and keeps them for reuse.
+		This method makes `pool_size` overlapping calls using the public API only. It is best-effort: fewer connections are opened if the calls do not overlap.
+		"""
+		if pool_size < 1:
+			raise ValueError("Pool size {0} is not positive".format(pool_size))
+		barrier = Barrier(pool_size)
+
+		def _call():
+			try:
+				barrier.wait()
+				self.staticInvoke("java.lang.Thread", "sleep", 10)
+			except Exception:
+				pass
+
+		threads = [Thread(target = _call) for i in range(pool_size)]
+		for thread in threads:
+			thread.start()
+		for thread in threads:
+			thread.join()
 
 	@classmethod
-	def ensureGateway(cls):
+	def ensureGateway(cls, jvm_options = None):
 		if not cls.gateway:
-			cls.createGateway()
+			cls.createGateway(jvm_options = jvm_options)
+		else:
+			_warnJVMStarted(jvm_options)
 		getattr(cls.gateway.jvm, PythonEvaluatorUtil.JAVA_CLASS_NAME)
 		return cls.gateway
 
 	@classmethod
-	def createGateway(cls, user_classpath = []):
-		cls.gateway = JavaGateway.launch_gateway(classpath = os.pathsep.join(_classpath(user_classpath = user_classpath)))
+	def createGateway(cls, user_classpath = [], jvm_options = None):
+		cls.gateway = JavaGateway.launch_gateway(classpath = os.pathsep.join(_classpath(user_classpath = user_classpath)), javaopts = _jvmOptions(jvm_options))
+
+	@classmethod
+	def connectGateway(cls, port = 25333, address = "127.0.0.1", auth_token = None):
+		""" Connects to an already running gateway JVM (eg. one that has been started using the `jpmml_evaluator gateway` command), which may be shared between several Python processes.
+
+		The gateway JVM is not shut down when the Python process exits.
+		"""
+		gateway = JavaGateway(gateway_parameters = GatewayParameters(address = address, port = port, auth_token = auth_token, eager_load = True))
+		getattr(gateway.jvm, PythonEvaluatorUtil.JAVA_CLASS_NAME)
+		return gateway
+
+	@classmethod
+	def gatewayCommand(cls, port = 25333, user_classpath = [], jvm_options = None, enable_auth = False, java = None):
+		""" Returns the command line for running a standalone gateway JVM, which accepts connections on the loopback interface. """
+		if java is None:
+			java_home = os.environ.get("JAVA_HOME")
+			java = os.path.join(java_home, "bin", "java") if java_home else "java"
+		command = [java, "-classpath", os.pathsep.join([find_jar_path()] + _classpath(user_classpath = user_classpath))] + _jvmOptions(jvm_options) + ["py4j.GatewayServer"]
+		if enable_auth:
+			command.append("--enable-auth")
+		command.append(str(port))
+		return command
 
 	@classmethod
 	def destroyGateway(cls):
@@ -42,6 +95,9 @@ class Py4JBackend(JavaBackend):
 		return javaClass(*args)
 
 	def newArray(self, className, values):
+		# Transfer string arrays in one round trip, rather than one round trip per element
+		if className == "java.lang.String":
+			return self.staticInvoke(PythonEvaluatorUtil.JAVA_CLASS_NAME, "newStringArray", self.dumps(list(values)))
 		javaClass = self._ensureJavaClass(className)
 		javaArray = self.gateway.new_array(javaClass, len(values))
 		for idx, value in enumerate(values):
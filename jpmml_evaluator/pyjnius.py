@@ -1,23 +1,26 @@
-from jpmml_evaluator import _classpath, JavaError, JNIBackend, PythonEvaluatorUtil
+from jpmml_evaluator import _classpath, _jvmOptions, _warnJVMStarted, cds, JavaError, JNIBackend, PythonEvaluatorUtil
 
 class PyJNIusBackend(JNIBackend):
 
-	def __init__(self):
+	def __init__(self, jvm_options = None):
 		super(PyJNIusBackend, self).__init__()
-		PyJNIusBackend.ensureJVM()
+		PyJNIusBackend.ensureJVM(jvm_options = jvm_options)
 
 	@classmethod
-	def ensureJVM(cls):
+	def ensureJVM(cls, jvm_options = None):
 		import jnius_config
 		if jnius_config.classpath is None:
-			cls.createJVM()
+			cls.createJVM(jvm_options = jvm_options)
+		else:
+			_warnJVMStarted(jvm_options)
 		from jnius import autoclass
 		autoclass(PythonEvaluatorUtil.JAVA_CLASS_NAME)
 
 	@classmethod
-	def createJVM(cls, user_classpath = []):
+	def createJVM(cls, user_classpath = [], jvm_options = None):
 		import jnius_config
 
+		jnius_config.add_options(*(cds.jvm_options() + _jvmOptions(jvm_options)))
 		jnius_config.set_classpath(*_classpath(user_classpath = user_classpath))
 
 	@classmethod
@@ -29,6 +32,10 @@ class PyJNIusBackend(JNIBackend):
 		results = bytearray(results[:])
 		return super(PyJNIusBackend, self).loads(results)
 
+	def loadsColumnar(self, results):
+		results = bytearray(results[:])
+		return super(PyJNIusBackend, self).loadsColumnar(results)
+
 	def _loadJavaClass(self, className):
 		from jnius import autoclass
 		return autoclass(className)
@@ -40,6 +47,10 @@ class PyJNIusBackend(JNIBackend):
 	def newArray(self, className, values):
 		return list(values)
 
+	def cast(self, className, javaObject):
+		from jnius import cast
+		return cast(className, javaObject)
+
 	def staticInvoke(self, className, methodName, *args):
 		if className == "java.lang.Class" and methodName == "forName":
 			from jnius import find_javaclass
@@ -0,0 +1,265 @@
+""" Multi-model HTTP scoring server.
+
+Endpoints:
+
+* `GET /models` - lists models and their fields.
+* `GET /models/<name>` - describes a model.
+* `POST /models/<name>` - evaluates a JSON object (single record), a JSON array of objects (batch), or a CSV document (batch).
+* `GET /metrics` - per-model request, record, error, latency and throughput statistics, as JSON.
+* `GET /health` - liveness check.
+"""
+
+import io
+import json
+import math
+import os
+import time
+
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock
+
+from .batching import BatchingEvaluator, Histogram
+
+class ModelMetrics(object):
+	""" Request statistics of a model.
+
+	Throughput is measured over a sliding window of the last `WINDOW_S` seconds (or less, if the model has been up for less).
+	"""
+
+	WINDOW_S = 60
+
+	def __init__(self):
+		self.requests = 0
+		self.records = 0
+		self.errors = 0
+		self.latencies = Histogram([0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000])
+		self.started = time.monotonic()
+		# Per-second record counts
+		self.recordBuckets = deque()
+		self.lock = Lock()
+
+	def observe(self, records, errors, latency_ms):
+		now = time.monotonic()
+		with self.lock:
+			self.requests += 1
+			self.records += records
+			self.errors += errors
+			second = int(now)
+			if self.recordBuckets and self.recordBuckets[-1][0] == second:
+				self.recordBuckets[-1][1] += records
+			else:
+				self.recordBuckets.append([second, records])
+			self._expireBuckets(now)
+		self.latencies.observe(latency_ms)
+
+	def _expireBuckets(self, now):
+		while self.recordBuckets and self.recordBuckets[0][0] <= (now - ModelMetrics.WINDOW_S):
+			self.recordBuckets.popleft()
+
+	def getStats(self):
+		now = time.monotonic()
+		with self.lock:
+			self._expireBuckets(now)
+			window = min(now - self.started, ModelMetrics.WINDOW_S)
+			stats = {
+				"requests" : self.requests,
+				"records" : self.records,
+				"errors" : self.errors,
+				"throughput_records_per_s" : (sum(count for second, count in self.recordBuckets) / window) if window > 0 else None,
+				"throughput_window_s" : ModelMetrics.WINDOW_S
+			}
+		stats["latency_ms"] = self.latencies.getStats()
+		stats["latency_ms"]["p50"] = self.latencies.quantile(0.5)
+		stats["latency_ms"]["p99"] = self.latencies.quantile(0.99)
+		return stats
+
+class ScoredModel(object):
+
+	def __init__(self, name, evaluator, max_batch_size = 64, max_delay_ms = 2, parallelism = -1):
+		self.name = name
+		self.evaluator = evaluator
+		self.parallelism = parallelism
+		self.batcher = BatchingEvaluator(evaluator, max_batch_size = max_batch_size, max_delay_ms = max_delay_ms, parallelism = parallelism)
+		self.metrics = ModelMetrics()
+
+	def describe(self):
+		return {
+			"name" : self.name,
+			"inputFields" : [inputField.getName() for inputField in self.evaluator.getInputFields()],
+			"targetFields" : [targetField.getName() for targetField in self.evaluator.getTargetFields()],
+			"outputFields" : [outputField.getName() for outputField in self.evaluator.getOutputFields()]
+		}
+
+	def getStats(self):
+		stats = self.metrics.getStats()
+		stats["batching"] = self.batcher.getStats()
+		return stats
+
+	def close(self):
+		self.batcher.close()
+
+class ScoringServer(ThreadingHTTPServer):
+	""" A threaded HTTP server that evaluates requests against a collection of models.
+
+	Single-record JSON requests from concurrent clients are coalesced into batch evaluations.
+
+	Parameters:
+	----------
+	address: tuple
+		The (host, port) address. Port 0 selects a free port.
+
+	evaluators: dict
+		Evaluators, keyed by model name.
+	"""
+
+	daemon_threads = True
+
+	def __init__(self, address, evaluators, max_batch_size = 64, max_delay_ms = 2, parallelism = -1, verbose = False):
+		self.models = {name : ScoredModel(name, evaluator, max_batch_size = max_batch_size, max_delay_ms = max_delay_ms, parallelism = parallelism) for name, evaluator in evaluators.items()}
+		self.verbose = verbose
+		super(ScoringServer, self).__init__(address, _RequestHandler)
+
+	def server_close(self):
+		super(ScoringServer, self).server_close()
+		for model in self.models.values():
+			model.close()
+
+def load_evaluators(directory, backend = "jpype", lax = False):
+	""" Loads every PMML file (*.pmml) and Java-serialized PMML file (*.ser) in a directory.
+
+	Returns a dict of evaluators, keyed by file name stem.
+	"""
+	from jpmml_evaluator import make_backend, make_evaluator
+
+	if isinstance(backend, str):
+		backend = make_backend(backend)
+	evaluators = {}
+	for name in sorted(os.listdir(directory)):
+		stem, ext = os.path.splitext(name)
+		if ext.lower() not in (".pmml", ".ser"):
+			continue
+		if stem in evaluators:
+			raise ValueError("Model name {0} is not unique".format(stem))
+		evaluators[stem] = make_evaluator(os.path.join(directory, name), backend = backend, lax = lax, serialized = (ext.lower() == ".ser")) \
+			.verify()
+	return evaluators
+
+class _HTTPError(Exception):
+
+	def __init__(self, status, message):
+		super(_HTTPError, self).__init__(message)
+		self.status = status
+
+class _RequestHandler(BaseHTTPRequestHandler):
+
+	# Keep-alive connections
+	protocol_version = "HTTP/1.1"
+
+	def do_GET(self):
+		self._handle(self._get)
+
+	def do_POST(self):
+		self._handle(self._post)
+
+	def log_message(self, format, *args):
+		if self.server.verbose:
+			super(_RequestHandler, self).log_message(format, *args)
+
+	def _handle(self, method):
+		try:
+			status, contentType, body = method(self.path.split("?", 1)[0].rstrip("/"))
+		except _HTTPError as he:
+			status, contentType, body = he.status, "application/json", _toJSON({"error" : str(he)})
+		except Exception as e:
+			self.log_error("%s", e)
+			status, contentType, body = 500, "application/json", _toJSON({"error" : str(e)})
+		self.send_response(status)
+		self.send_header("Content-Type", contentType)
+		self.send_header("Content-Length", str(len(body)))
+		self.end_headers()
+		self.wfile.write(body)
+
+	def _get(self, path):
+		models = self.server.models
+		if path == "/health":
+			return (200, "application/json", _toJSON({"status" : "ok"}))
+		elif path == "/metrics":
+			return (200, "application/json", _toJSON({name : model.getStats() for name, model in models.items()}))
+		elif path == "/models":
+			return (200, "application/json", _toJSON([model.describe() for model in models.values()]))
+		return (200, "application/json", _toJSON(self._getModel(path).describe()))
+
+	def _post(self, path):
+		model = self._getModel(path)
+		length = int(self.headers.get("Content-Length", 0))
+		body = self.rfile.read(length)
+		contentType = (self.headers.get("Content-Type") or "application/json").split(";", 1)[0].strip().lower()
+		begin = time.perf_counter()
+		if contentType == "application/json":
+			status, records, errors, response = self._evaluateJSON(model, body)
+			response = (status, "application/json", _toJSON(response))
+		elif contentType == "text/csv":
+			status, records, errors, response = self._evaluateCSV(model, body)
+			response = (status, "text/csv", response)
+		else:
+			raise _HTTPError(415, "Content type {0} not in {1}".format(contentType, ["application/json", "text/csv"]))
+		model.metrics.observe(records, errors, (time.perf_counter() - begin) * 1000.0)
+		return response
+
+	def _evaluateJSON(self, model, body):
+		try:
+			arguments = json.loads(body)
+		except ValueError as ve:
+			raise _HTTPError(400, "Invalid JSON: {0}".format(ve))
+		if isinstance(arguments, dict):
+			try:
+				return (200, 1, 0, model.batcher.evaluate(arguments))
+			except Exception as e:
+				return (422, 1, 1, {"error" : str(e)})
+		elif isinstance(arguments, list):
+			if not all(isinstance(record, dict) for record in arguments):
+				raise _HTTPError(400, "Expected a JSON array of objects")
+			results = model.evaluator.evaluateRecords(arguments, parallelism = model.parallelism)
+			errors = [result for result in results if isinstance(result, Exception)]
+			return (200, len(results), len(errors), [{"error" : str(result)} if isinstance(result, Exception) else result for result in results])
+		raise _HTTPError(400, "Expected a JSON object or a JSON array of objects")
+
+	def _evaluateCSV(self, model, body):
+		import pandas
+
+		from jpmml_evaluator import JavaError
+
+		try:
+			arguments_df = pandas.read_csv(io.BytesIO(body))
+		except ValueError as ve:
+			raise _HTTPError(400, "Invalid CSV: {0}".format(ve))
+		try:
+			results_df = model.evaluator.evaluateAll(arguments_df, parallelism = model.parallelism)
+		except JavaError as je:
+			raise _HTTPError(422, str(je))
+		errors = int(results_df["errors"].notna().sum()) if "errors" in results_df.columns else 0
+		return (200, len(results_df), errors, results_df.to_csv(index = False).encode("utf-8"))
+
+	def _getModel(self, path):
+		prefix = "/models/"
+		if not path.startswith(prefix):
+			raise _HTTPError(404, "Path {0} not found".format(path))
+		name = path[len(prefix):]
+		model = self.server.models.get(name)
+		if model is None:
+			raise _HTTPError(404, "Model {0} not in {1}".format(name, sorted(self.server.models)))
+		return model
+
+def _toJSON(obj):
+	return json.dumps(_toFinite(obj), default = str, allow_nan = False).encode("utf-8")
+
+def _toFinite(obj):
+	# NaN and infinite values are not valid JSON
+	if isinstance(obj, float):
+		return obj if math.isfinite(obj) else None
+	elif isinstance(obj, dict):
+		return {key : _toFinite(value) for key, value in obj.items()}
+	elif isinstance(obj, (list, tuple)):
+		return [_toFinite(value) for value in obj]
+	return obj
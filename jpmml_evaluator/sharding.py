@@ -0,0 +1,260 @@
+import multiprocessing
+import os
+import traceback
+
+from threading import Lock
+
+class WorkerError(Exception):
+	""" An error that was raised in a worker process.
+
+	Java errors are re-raised in the parent process as WorkerErrors, because JavaError objects are bound to the Java backend of the worker process.
+	"""
+
+	def __init__(self, className, message):
+		super(WorkerError, self).__init__(className, message)
+		self.className = className
+		self.message = message
+
+	def __str__(self):
+		return "{0}: {1}".format(self.className, self.message)
+
+class ShardedEvaluator(object):
+	""" Evaluates DataFrames in parallel across multiple worker processes, each running its own JVM.
+
+	Every worker process builds its own Java backend and evaluator from the same PMML bytes.
+	`evaluateAll` splits the DataFrame into contiguous row partitions, evaluates them in parallel,
+	and re-assembles the results (with the original index, and the error column).
+	Worker processes that have exited (eg. crashed) are respawned, and their partitions are retried.
+
+	Worker processes are started using the "spawn" start method, so the main module of the program must be import-safe (ie. guarded by `if __name__ == "__main__"`).
+
+	Parameters:
+	----------
+	obj: string or bytes
+		The object to load. See `make_evaluator`.
+
+	workers: int, optional
+		The number of worker processes. If None, the number of CPUs.
+
+	backend: string
+		The Java backend alias.
+
+	jvm_options: JVMOptions or list of strings, optional
+		The JVM options of worker processes.
+
+	max_retries: int
+		The maximum number of times a partition is retried after its worker process has exited.
+
+	options: dict
+		Other `make_evaluator` options (eg. `lax`, `transpile`).
+	"""
+
+	def __init__(self, obj, workers = None, backend = "jpype", jvm_options = None, max_retries = 1, **options):
+		from jpmml_evaluator import _toBytes
+
+		if workers is None:
+			workers = os.cpu_count() or 1
+		if workers < 1:
+			raise ValueError("Workers {0} is not positive".format(workers))
+		if not isinstance(backend, str):
+			raise TypeError("Java backend must be specified by alias")
+		self.pmml_bytes = _toBytes(obj)
+		self.backend = backend
+		self.jvm_options = jvm_options
+		self.max_retries = max_retries
+		self.options = options
+		# Forking a process that has a running JVM is not supported
+		self.context = multiprocessing.get_context("spawn")
+		self.workers = [None] * workers
+		self.respawns = 0
+		self.lock = Lock()
+		for i in range(workers):
+			self._startWorker(i)
+		for i in range(workers):
+			self._awaitWorker(i)
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		self.close()
+
+	def getWorkers(self):
+		return len(self.workers)
+
+	def getRespawns(self):
+		return self.respawns
+
+	def evaluate(self, arguments, nan_as_missing = True, fields = None):
+		with self.lock:
+			return self._callAll([("evaluate", (arguments, ), {"nan_as_missing" : nan_as_missing, "fields" : fields})])[0]
+
+	def evaluateAll(self, arguments_df, nan_as_missing = True, error_col = "errors", parallelism = -1, transport = None, fields = None):
+		kwargs = {
+			"nan_as_missing" : nan_as_missing,
+			"error_col" : None,
+			"parallelism" : parallelism,
+			"transport" : transport,
+			"fields" : fields
+		}
+		partitions = _splitRows(arguments_df, len(self.workers))
+		with self.lock:
+			results = self._callAll([("evaluateAll", (partition, ), kwargs) for partition in partitions])
+		return _combine(partitions, results, error_col)
+
+	def close(self):
+		with self.lock:
+			for i, worker in enumerate(self.workers):
+				if worker is None:
+					continue
+				process, conn = worker
+				try:
+					conn.send(None)
+				except (OSError, EOFError):
+					pass
+				process.join(timeout = 10)
+				if process.is_alive():
+					process.terminate()
+				conn.close()
+				self.workers[i] = None
+
+	def _startWorker(self, i):
+		parentConn, childConn = self.context.Pipe()
+		process = self.context.Process(target = _workerMain, args = (childConn, self.pmml_bytes, self.backend, self.jvm_options, self.options), name = "jpmml_evaluator-shard-{0}".format(i), daemon = True)
+		process.start()
+		childConn.close()
+		self.workers[i] = (process, parentConn)
+
+	def _awaitWorker(self, i):
+		process, conn = self.workers[i]
+		try:
+			status, result = conn.recv()
+		except EOFError:
+			process.join()
+			raise RuntimeError("Worker process exited with code {0} during startup".format(process.exitcode))
+		if status != "ok":
+			raise _toException(status, result)
+
+	def _respawnWorker(self, i):
+		process, conn = self.workers[i]
+		if process.is_alive():
+			process.terminate()
+		process.join()
+		conn.close()
+		self.respawns += 1
+		self._startWorker(i)
+		self._awaitWorker(i)
+
+	def _callAll(self, calls):
+		# The i-th call is dispatched to the i-th worker process
+		results = [None] * len(calls)
+		pending = list(range(len(calls)))
+		retries = 0
+		while pending:
+			failed = []
+			error = None
+			for i in pending:
+				process, conn = self.workers[i]
+				try:
+					conn.send(calls[i])
+				except (OSError, EOFError):
+					failed.append(i)
+			# Collect all replies before raising, so that every worker process is ready for the next call
+			for i in pending:
+				if i in failed:
+					continue
+				process, conn = self.workers[i]
+				try:
+					status, result = conn.recv()
+				except (OSError, EOFError):
+					failed.append(i)
+					continue
+				if status == "ok":
+					results[i] = result
+				elif error is None:
+					error = _toException(status, result)
+			for i in failed:
+				self._respawnWorker(i)
+			if error is not None:
+				raise error
+			if failed and retries >= self.max_retries:
+				raise RuntimeError("Worker process(es) {0} exited".format(sorted(failed)))
+			retries += 1
+			pending = sorted(failed)
+		return results
+
+def _splitRows(arguments_df, numberOfPartitions):
+	numberOfRows = len(arguments_df)
+	numberOfPartitions = max(min(numberOfPartitions, numberOfRows), 1)
+	size, remainder = divmod(numberOfRows, numberOfPartitions)
+	partitions = []
+	begin = 0
+	for i in range(numberOfPartitions):
+		end = begin + size + (1 if i < remainder else 0)
+		partitions.append(arguments_df.iloc[begin:end])
+		begin = end
+	return partitions
+
+def _combine(partitions, results, error_col):
+	import pandas
+
+	results_dfs = []
+	errors = []
+	for partition, (results_df, partition_errors) in zip(partitions, results):
+		results_dfs.append(results_df)
+		if partition_errors is None:
+			partition_errors = pandas.Series([None] * len(partition), index = partition.index, dtype = object)
+		errors.append(partition_errors)
+	results_df = pandas.concat(results_dfs)
+	errors = pandas.concat(errors)
+	if errors.isna().all():
+		errors = None
+	else:
+		errors = errors.astype(object).where(errors.notna(), None)
+		errors.name = error_col
+	if error_col:
+		if errors is not None:
+			results_df[error_col] = errors
+		return results_df
+	else:
+		return (results_df, errors)
+
+def _toException(status, result):
+	if status == "java_error":
+		return WorkerError(*result)
+	return RuntimeError("Worker process failed: {0}".format(result))
+
+def _formatJavaError(je):
+	# Java strings (eg. JPype ones) cannot be pickled
+	return (str(je.className), str(je.message) if je.message is not None else None)
+
+def _workerMain(conn, pmml_bytes, backend, jvm_options, options):
+	from jpmml_evaluator import make_backend, make_evaluator, JavaError
+
+	try:
+		evaluator = make_evaluator(pmml_bytes, backend = make_backend(backend, jvm_options = jvm_options), **options) \
+			.verify()
+	except JavaError as je:
+		conn.send(("java_error", _formatJavaError(je)))
+		return
+	except Exception:
+		conn.send(("error", traceback.format_exc()))
+		return
+	conn.send(("ok", None))
+	while True:
+		try:
+			call = conn.recv()
+		except EOFError:
+			return
+		if call is None:
+			return
+		method, args, kwargs = call
+		try:
+			result = getattr(evaluator, method)(*args, **kwargs)
+		except JavaError as je:
+			conn.send(("java_error", _formatJavaError(je)))
+			continue
+		except Exception:
+			conn.send(("error", traceback.format_exc()))
+			continue
+		conn.send(("ok", result))
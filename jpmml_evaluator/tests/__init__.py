@@ -1,12 +1,16 @@
+import asyncio
 import os
+import time
 
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 import numpy
 import pandas
 
-from jpmml_evaluator import make_backend, make_evaluator, Evaluator, JavaError, PythonEvaluatorUtil
+from jpmml_evaluator import make_backend, make_evaluator, DataTypeError, Evaluator, EvaluatorCache, JavaError, LoadingModelEvaluatorBuilder, PythonEvaluatorUtil
 
 def _resource(name):
 	return os.path.join(os.path.dirname(__file__), "resources", name)
@@ -52,6 +56,55 @@ class EvaluatorBuilderTest(TestCase):
 
 		self.assertIsInstance(evaluator, Evaluator)
 
+		with TemporaryDirectory() as tmpdir:
+			ser_path = os.path.join(tmpdir, "DecisionTreeIris.ser")
+
+			LoadingModelEvaluatorBuilder(backend) \
+				.loadFile(resource) \
+				.saveSerialized(ser_path)
+
+			evaluator = make_evaluator(ser_path, backend = backend, serialized = True) \
+				.verify()
+
+			self.assertIsInstance(evaluator, Evaluator)
+			self.assertEqual(4, len(evaluator.getOutputFields()))
+
+			with open(ser_path, "rb") as file:
+				ser_bytes = file.read()
+
+			evaluator = make_evaluator(ser_bytes, backend = backend, lax = True, reporting = True, serialized = True)
+
+			self.assertIsInstance(evaluator, Evaluator)
+
+		cache = EvaluatorCache(max_entries = 1)
+
+		evaluator = make_evaluator(resource, backend = backend, cache = cache)
+
+		self.assertIs(evaluator, make_evaluator(resource_path, backend = backend, cache = cache))
+		self.assertIs(evaluator, make_evaluator(resource_bytes, backend = backend, cache = cache))
+		self.assertIsNot(evaluator, make_evaluator(resource_bytes, backend = backend, lax = True, cache = cache))
+		self.assertEqual({"entries" : 1, "memory" : len(resource_bytes), "hits" : 2, "misses" : 2, "evictions" : 1}, cache.getStats())
+
+class ConcurrencyTest(TestCase):
+
+	def workflow(self, backend, threads = 4, millis = 250):
+
+		if isinstance(backend, str):
+			backend = make_backend(backend)
+
+		backend.staticInvoke("java.lang.Thread", "sleep", 1)
+
+		def _sleep(i):
+			backend.staticInvoke("java.lang.Thread", "sleep", millis)
+
+		# Concurrent Java calls overlap only if the GIL is released for their duration
+		begin = time.perf_counter()
+		with ThreadPoolExecutor(max_workers = threads) as executor:
+			list(executor.map(_sleep, range(threads)))
+		elapsed = time.perf_counter() - begin
+
+		self.assertLess(elapsed, (threads * millis / 1000) / 2)
+
 class EvaluatorTest(TestCase):
 
 	def workflow(self, backend, lax):
@@ -81,6 +134,29 @@ class EvaluatorTest(TestCase):
 
 		self.assertDictEqual({"int8" : 1, "int16" : 1, "int32" : 1, "float32" : float(1.0), "float64" : float(1.0)}, numpyResults)
 
+		nanArguments = {
+			"float" : float("NaN"),
+			"float64" : numpy.float64("NaN")
+		}
+		nanResults = PythonEvaluatorUtil.evaluate(backend, None, nanArguments, None)
+
+		self.assertDictEqual({"float" : None, "float64" : None}, nanResults)
+
+		nanResults = PythonEvaluatorUtil.evaluate(backend, None, nanArguments, None, nan_as_missing = False)
+
+		self.assertTrue(numpy.isnan(nanResults["float"]))
+		self.assertTrue(numpy.isnan(nanResults["float64"]))
+
+		with TemporaryDirectory() as tmpdir:
+			transpiled_evaluator = make_evaluator(_resource("DecisionTreeIris.pmml"), backend = backend, lax = lax, transpile = True, transpile_cache = tmpdir)
+
+			self.assertEqual(1, len(os.listdir(tmpdir)))
+
+			cached_transpiled_evaluator = make_evaluator(_resource("DecisionTreeIris.pmml"), backend = backend, lax = lax, transpile = True, transpile_cache = tmpdir) \
+				.verify()
+
+			self.assertEqual(len(transpiled_evaluator.getOutputFields()), len(cached_transpiled_evaluator.getOutputFields()))
+
 		evaluator = make_evaluator(_resource("DecisionTreeIris.pmml"), backend = backend, lax = lax, reporting = True, transpile = True) \
 			.verify()
 
@@ -96,6 +172,21 @@ class EvaluatorTest(TestCase):
 		self.assertEqual("Species", targetField.getName())
 		self.assertEqual("string", targetField.getDataType())
 		self.assertEqual("categorical", targetField.getOpType())
+		self.assertEqual(["setosa", "versicolor", "virginica"], targetField.getCategories())
+
+		inputField = evaluator.getInputFields()[0]
+
+		self.assertEqual("continuous", inputField.getOpType())
+		self.assertIsNone(inputField.getDiscreteDomain())
+		self.assertIsNone(inputField.getContinuousDomain())
+
+		intervalEvaluator = make_evaluator(_resource("RegressionInterval.pmml"), backend = backend)
+
+		self.assertEqual([[(0.0, 10.0)], [(-1.0, None)]], [inputField.getContinuousDomain() for inputField in intervalEvaluator.getInputFields()])
+
+		iterations = evaluator.warmup(n = 500, batch_size = 50)
+
+		self.assertTrue(0 < iterations <= 500)
 
 		arguments = {
 			"Sepal.Length" : "error",
@@ -140,15 +231,65 @@ class EvaluatorTest(TestCase):
 		self.assertEqual(0.0, results["probability(virginica)"])
 		self.assertTrue(results["report(probability(versicolor))"].startswith("<math "))
 
+		errorArguments = dict(arguments)
+		errorArguments["Petal.Length"] = "error"
+
+		for parallelism in [1, -1, 2]:
+			records = evaluator.evaluateRecords([arguments, errorArguments, arguments], parallelism = parallelism)
+
+			self.assertEqual(3, len(records))
+			self.assertEqual(results, records[0])
+			self.assertIsInstance(records[1], JavaError)
+			self.assertTrue(records[1].isInstance("org.jpmml.evaluator.EvaluationException"))
+			self.assertEqual(results, records[2])
+
+		self.assertEqual([], evaluator.evaluateRecords([]))
+
+		self.assertEqual({"Species" : "setosa", "probability(setosa)" : 1.0}, evaluator.evaluate(arguments, fields = ["probability(setosa)", "Species"]))
+		self.assertEqual([{"Species" : "setosa"}], evaluator.evaluateRecords([arguments], fields = ["Species"]))
+
+		with self.assertRaises(ValueError):
+			evaluator.evaluate(arguments, fields = ["Sepal.Length"])
+
+		extraArguments = dict(arguments, **{"extra_{}".format(i) : "extra" for i in range(10)})
+
+		self.assertEqual(results, evaluator.evaluate(extraArguments))
+		self.assertEqual([results], evaluator.evaluateRecords([extraArguments]))
+		self.assertEqual(results, evaluator.evaluate(extraArguments, prune_inputs = False))
+
+		prunedArguments = {"Petal.Length" : 1.4, "Petal.Width" : 0.2}
+
+		self.assertEqual(prunedArguments, evaluator._pruneRecord(dict(prunedArguments, extra = "extra")))
+		self.assertIs(prunedArguments, evaluator._pruneRecord(prunedArguments))
+
+		with ThreadPoolExecutor(max_workers = 4) as executor:
+			self.assertEqual([results] * 100, list(executor.map(evaluator.evaluate, [arguments] * 100)))
+
+		prepared = evaluator.prepare(["Petal.Width", "Petal.Length"], ["Species", "probability(setosa)"])
+
+		self.assertEqual(["Petal.Width", "Petal.Length"], prepared.getInputNames())
+		self.assertEqual(("setosa", 1.0), prepared((0.2, 1.4)))
+		self.assertEqual(("setosa", 1.0), prepared(numpy.array([0.2, 1.4])))
+
+		with self.assertRaises(JavaError):
+			prepared((0.2, ))
+
+		prepared = evaluator.prepare()
+
+		self.assertEqual(tuple(results[name] for name in prepared.getOutputNames()), prepared((arguments[name] for name in prepared.getInputNames())))
+
+		with self.assertRaises(JavaError):
+			evaluator.prepare(["Sepal.Length"])
+
 		evaluator.suppressResultFields([targetField])
-		self.assertTrue(hasattr(evaluator, "dropColumns"))
+		self.assertEqual((targetField.getName(), ), evaluator.resultSelection.dropColumns)
 
 		results = evaluator.evaluate(arguments)
 
 		self.assertEqual(4, len(results))
 
 		evaluator.suppressResultFields([])
-		self.assertFalse(hasattr(evaluator, "dropColumns"))
+		self.assertIsNone(evaluator.resultSelection.dropColumns)
 
 		arguments_df = pandas.read_csv(_resource("Iris.csv"), sep = ",")
 		print(arguments_df.head(5))
@@ -160,6 +301,85 @@ class EvaluatorTest(TestCase):
 		self.assertEqual(arguments_df.index.tolist(), results_df.index.tolist())
 		self.assertIsNot(arguments_df.index, results_df.index)
 
+		self.assertIsInstance(results_df["Species"].dtype, pandas.CategoricalDtype)
+		self.assertEqual(["setosa", "versicolor", "virginica"], results_df["Species"].cat.categories.tolist())
+		self.assertEqual(numpy.float64, results_df["probability(setosa)"].dtype)
+
+		async def _evaluateAsync():
+			return await asyncio.gather(
+				evaluator.evaluateAll_async(arguments_df, parallelism = 1),
+				*[evaluator.evaluate_async(arguments) for i in range(4)]
+			)
+
+		evaluator.setAsyncOptions(max_concurrency = 2)
+
+		async_results = asyncio.run(_evaluateAsync())
+
+		self.assertTrue(results_df.equals(async_results[0]))
+		self.assertEqual([evaluator.evaluate(arguments)] * 4, async_results[1:])
+
+		pickle_results_df = evaluator.evaluateAll(arguments_df, parallelism = 1, transport = "pickle")
+
+		self.assertEqual(results_df.columns.tolist(), pickle_results_df.columns.tolist())
+		self.assertEqual(results_df["Species"].tolist(), pickle_results_df["Species"].tolist())
+		self.assertEqual(results_df.dtypes.tolist(), pickle_results_df.dtypes.tolist())
+
+		if "buffer" in backend.transports:
+			buffer_results_df = evaluator.evaluateAll(arguments_df, parallelism = 1, transport = "buffer")
+
+			self.assertEqual(results_df.columns.tolist(), buffer_results_df.columns.tolist())
+			self.assertEqual(results_df["Species"].tolist(), buffer_results_df["Species"].tolist())
+			self.assertEqual(results_df["probability(setosa)"].tolist(), buffer_results_df["probability(setosa)"].tolist())
+
+		extra_results_df = evaluator.evaluateAll(arguments_df.assign(extra = "extra"), parallelism = 1)
+
+		self.assertTrue(results_df.equals(extra_results_df))
+
+		for transport in backend.transports:
+			fields_results_df = evaluator.evaluateAll(arguments_df, parallelism = 1, transport = transport, fields = ["probability(setosa)", "Species"])
+
+			self.assertEqual(["Species", "probability(setosa)"], fields_results_df.columns.tolist())
+			self.assertEqual(results_df["Species"].tolist(), fields_results_df["Species"].tolist())
+
+		results_dfs = list(evaluator.evaluateIter(pandas.read_csv(_resource("Iris.csv"), sep = ",", chunksize = 40), parallelism = 1, prefetch = 2))
+
+		self.assertEqual([40, 40, 40, 30], [len(chunk_results_df) for chunk_results_df in results_dfs])
+		self.assertEqual(results_df.index.tolist(), pandas.concat(results_dfs).index.tolist())
+		self.assertEqual(results_df["Species"].tolist(), pandas.concat(results_dfs)["Species"].tolist())
+
+		backend.setEvaluationPool(2, batch_size = 16)
+
+		try:
+			pool_results_df = evaluator.evaluateAll(arguments_df)
+
+			self.assertEqual(results_df["Species"].tolist(), pool_results_df["Species"].tolist())
+		finally:
+			backend.setEvaluationPool(-1)
+
+		with self.assertRaises(JavaError):
+			backend.setEvaluationPool(PythonEvaluatorUtil.MAX_PARALLELISM + 1)
+
+		results_dfs = list(evaluator.evaluateIter(arguments_df, chunk_size = 100, prefetch = 0))
+
+		self.assertEqual([100, 50], [len(chunk_results_df) for chunk_results_df in results_dfs])
+
+		with self.assertRaises(ValueError):
+			list(evaluator.evaluateIter(arguments_df, prefetch = -1))
+
+		with TemporaryDirectory() as tmpdir:
+			output_path = os.path.join(tmpdir, "DecisionTreeIris.csv")
+
+			count = evaluator.evaluateFile(_resource("Iris.csv"), output_path, batch_size = 64)
+
+			self.assertEqual(150, count)
+
+			file_results_df = pandas.read_csv(output_path, sep = ",")
+
+			self.assertEqual(results_df.columns.tolist() + ["errors"], file_results_df.columns.tolist())
+			self.assertEqual(results_df["Species"].tolist(), file_results_df["Species"].tolist())
+			self.assertTrue(numpy.allclose(results_df["probability(setosa)"], file_results_df["probability(setosa)"]))
+			self.assertEqual(0, file_results_df["errors"].count())
+
 		arguments_df.set_index(("row_{}".format(row + 1) for row in arguments_df.index.tolist()), inplace = True) 
 
 		evaluator.suppressResultFields([reportOutputField])
@@ -186,6 +406,15 @@ class EvaluatorTest(TestCase):
 		arguments_df = arguments_df.astype(object)
 		arguments_df.iloc[13, :] = "error"
 
+		inputNames = [inputField.getName() for inputField in evaluator.getInputFields()]
+
+		with self.assertRaises(DataTypeError) as context:
+			evaluator.evaluateAll(arguments_df, check_dtypes = True)
+
+		self.assertEqual(inputNames, context.exception.report.index.tolist())
+		self.assertEqual([1] * len(inputNames), context.exception.report["count"].tolist())
+		self.assertEqual([arguments_df.index[13]] * len(inputNames), context.exception.report["first_row"].tolist())
+
 		results_df = evaluator.evaluateAll(arguments_df)
 
 		self.assertEqual((150, 5), results_df.shape)
@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from unittest import TestCase
+
+from jpmml_evaluator import BatchingEvaluator
+from jpmml_evaluator.batching import Histogram
+
+class _RecordsEvaluator(object):
+
+	def __init__(self):
+		self.batches = []
+		self.lock = Lock()
+
+	def evaluateRecords(self, records, nan_as_missing = True, parallelism = -1):
+		with self.lock:
+			self.batches.append(len(records))
+		return [ValueError(record["x"]) if record["x"] < 0 else {"y" : 2 * record["x"]} for record in records]
+
+class BatchingEvaluatorTest(TestCase):
+
+	def test_evaluate(self):
+		evaluator = _RecordsEvaluator()
+		with BatchingEvaluator(evaluator, max_batch_size = 8, max_delay_ms = 50) as batcher:
+			with ThreadPoolExecutor(max_workers = 32) as executor:
+				results = list(executor.map(lambda x: batcher.evaluate({"x" : x}), range(32)))
+			self.assertEqual([{"y" : 2 * x} for x in range(32)], results)
+			with self.assertRaises(ValueError):
+				batcher.evaluate({"x" : -1})
+			stats = batcher.getStats()
+		self.assertEqual(33, sum(evaluator.batches))
+		self.assertTrue(max(evaluator.batches) <= 8)
+		self.assertTrue(len(evaluator.batches) < 33)
+		self.assertEqual(len(evaluator.batches), stats["batch_size"]["count"])
+		self.assertEqual(33, stats["queue_delay_ms"]["count"])
+
+	def test_maxDelay(self):
+		evaluator = _RecordsEvaluator()
+		with BatchingEvaluator(evaluator, max_batch_size = 1000, max_delay_ms = 20) as batcher:
+			begin = time.monotonic()
+			self.assertEqual({"y" : 2}, batcher.evaluate({"x" : 1}))
+			self.assertTrue(time.monotonic() - begin >= 0.02)
+		self.assertEqual([1], evaluator.batches)
+
+	def test_evaluate_async(self):
+		evaluator = _RecordsEvaluator()
+
+		async def _evaluate(batcher):
+			return await asyncio.gather(*[batcher.evaluate_async({"x" : x}) for x in range(10)])
+
+		with BatchingEvaluator(evaluator, max_batch_size = 10, max_delay_ms = 1000) as batcher:
+			results = asyncio.run(_evaluate(batcher))
+		self.assertEqual([{"y" : 2 * x} for x in range(10)], results)
+		self.assertEqual([10], evaluator.batches)
+
+	def test_close(self):
+		evaluator = _RecordsEvaluator()
+		batcher = BatchingEvaluator(evaluator, max_batch_size = 100, max_delay_ms = 60 * 1000)
+		future = batcher.submit({"x" : 1})
+		batcher.close()
+		self.assertEqual({"y" : 2}, future.result(timeout = 0))
+		with self.assertRaises(RuntimeError):
+			batcher.submit({"x" : 1})
+
+class HistogramTest(TestCase):
+
+	def test_observe(self):
+		histogram = Histogram([1, 2, 4])
+		for value in [1, 1, 2, 3, 10]:
+			histogram.observe(value)
+		stats = histogram.getStats()
+		self.assertEqual([2, 1, 1, 1], stats["counts"])
+		self.assertEqual(5, stats["count"])
+		self.assertEqual(17, stats["sum"])
+		self.assertEqual(1, histogram.quantile(0.4))
+		self.assertEqual(4, histogram.quantile(0.8))
+		self.assertEqual(10, histogram.quantile(1.0))
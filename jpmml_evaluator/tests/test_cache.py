@@ -0,0 +1,65 @@
+import os
+
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from jpmml_evaluator import EvaluatorCache, TranspilerCache
+
+class EvaluatorCacheTest(TestCase):
+
+	def test_makeKey(self):
+		cache = EvaluatorCache()
+		key = cache.makeKey(b"<PMML/>", None, lax = False)
+		self.assertEqual(64, len(key))
+		self.assertEqual(key, cache.makeKey(b"<PMML/>", None, lax = False))
+		self.assertNotEqual(key, cache.makeKey(b"<PMML/>", None, lax = True))
+		self.assertNotEqual(key, cache.makeKey(b"<PMML />", None, lax = False))
+
+	def test_maxEntries(self):
+		cache = EvaluatorCache(max_entries = 2)
+		cache.put("a", "A")
+		cache.put("b", "B")
+		self.assertEqual("A", cache.get("a"))
+		cache.put("c", "C")
+		self.assertEqual(2, len(cache))
+		self.assertIsNone(cache.get("b"))
+		self.assertEqual("A", cache.get("a"))
+		self.assertEqual("C", cache.get("c"))
+		self.assertEqual({"entries" : 2, "memory" : 0, "hits" : 3, "misses" : 1, "evictions" : 1}, cache.getStats())
+
+	def test_maxMemory(self):
+		cache = EvaluatorCache(max_entries = None, max_memory = 100)
+		cache.put("a", "A", 60)
+		cache.put("b", "B", 30)
+		cache.put("c", "C", 30)
+		self.assertEqual(["b", "c"], [key for key in ["a", "b", "c"] if key in cache])
+		self.assertEqual(60, cache.getStats()["memory"])
+		# Oversized entries are retained until the next put
+		cache.put("d", "D", 200)
+		self.assertEqual(["d"], [key for key in ["a", "b", "c", "d"] if key in cache])
+		self.assertEqual("D", cache.remove("d"))
+		self.assertEqual(0, cache.getStats()["memory"])
+
+class TranspilerCacheTest(TestCase):
+
+	def test_cleanup(self):
+		with TemporaryDirectory() as tmpdir:
+			cache = TranspilerCache(tmpdir, version = "2")
+			path = cache.getPath(b"<PMML/>")
+			self.assertTrue(path.name.endswith("-2.jar"))
+			self.assertEqual(path, TranspilerCache(tmpdir, version = "2").getPath(b"<PMML/>"))
+			self.assertNotEqual(path, TranspilerCache(tmpdir, version = "3").getPath(b"<PMML/>"))
+			path.touch()
+			stale_path = TranspilerCache(tmpdir, version = "1").getPath(b"<PMML/>")
+			stale_path.touch()
+			tmp_path = cache.getTempPath(path)
+			tmp_path.touch()
+			os.utime(tmp_path, (0, 0))
+			self.assertEqual(sorted([stale_path, tmp_path]), sorted(cache.cleanup()))
+			self.assertEqual([path], list(cache.directory.iterdir()))
+
+	def test_version(self):
+		with TemporaryDirectory() as tmpdir:
+			cache = TranspilerCache(tmpdir)
+			self.assertEqual(16, len(cache.version))
+			self.assertEqual(cache.version, TranspilerCache(tmpdir).version)
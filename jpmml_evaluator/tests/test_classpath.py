@@ -1,9 +1,40 @@
-from unittest import TestCase
+import os
 
-from jpmml_evaluator import _classpath
+from tempfile import TemporaryDirectory
+from unittest import mock, TestCase
+
+from jpmml_evaluator import _classpath, _jvmOptions, cds, JVMOptions
 
 class ClasspathTest(TestCase):
 
 	def test_classpath(self):
 		classpath = _classpath([])
 		self.assertEqual(1 + 25, len(classpath))
+		self.assertEqual(classpath, _classpath([]))
+
+class CDSTest(TestCase):
+
+	def test_jvm_options(self):
+		with TemporaryDirectory() as tmpdir:
+			archive = os.path.join(tmpdir, "test.jsa")
+			with mock.patch.dict(os.environ, {"JPMML_EVALUATOR_CDS_ARCHIVE" : archive}):
+				self.assertEqual(archive, str(cds.archive_path()))
+				self.assertEqual([], cds.jvm_options())
+				open(archive, "wb").close()
+				self.assertEqual(["-XX:SharedArchiveFile=" + archive], cds.jvm_options())
+			with mock.patch.dict(os.environ, {"JPMML_EVALUATOR_CDS_ARCHIVE" : "", "XDG_CACHE_HOME" : tmpdir}):
+				archive = cds.archive_path()
+				self.assertEqual(os.path.join(tmpdir, "jpmml_evaluator"), str(archive.parent))
+				self.assertTrue(archive.name.endswith(".jsa"))
+
+class JVMOptionsTest(TestCase):
+
+	def test_getOptions(self):
+		jvm_options = JVMOptions(max_heap = "2g", initial_heap = "512m", gc = "ZGC", active_processor_count = 2, system_properties = {"user.language" : "en"}, flags = ["-XX:TieredStopAtLevel=1"])
+		self.assertEqual(["-Xms512m", "-Xmx2g", "-XX:+UseZGC", "-XX:ActiveProcessorCount=2", "-Duser.language=en", "-XX:TieredStopAtLevel=1"], jvm_options.getOptions())
+		self.assertEqual([], _jvmOptions(None))
+		self.assertEqual(["-Xmx1g"], _jvmOptions(["-Xmx1g"]))
+		with self.assertRaises(ValueError):
+			JVMOptions(gc = "cms")
+		with self.assertRaises(ValueError):
+			JVMOptions(active_processor_count = 0)
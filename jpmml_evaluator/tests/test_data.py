@@ -3,27 +3,182 @@ from unittest import TestCase
 from pandas import DataFrame
 
 import numpy
+import pandas
 
-from jpmml_evaluator import _canonicalize, _canonicalizeAll
-
-class DataTest(TestCase):
-
-	def test_canonicalize(self):
-		arguments = {
-			"A" : int(1),
-			"B" : numpy.nan,
-			"C" : str("3")
-		}
-		arguments = _canonicalize(arguments, nan_as_missing = True)
-		self.assertEqual(3, len(arguments))
-		self.assertEqual(int(1), arguments["A"])
-		self.assertEqual(None, arguments["B"])
-		self.assertEqual(str("3"), arguments["C"])
-
-	def test_canonicalizeAll(self):
-		arguments_df = DataFrame([[int(1)], [numpy.nan], [str("3")]], columns = ["X"])
-		self.assertEqual(object, arguments_df["X"].dtype)
-		arguments_df = _canonicalizeAll(arguments_df, nan_as_missing = True)
-		self.assertEqual((3, 1), arguments_df.shape)
-		self.assertEqual(object, arguments_df["X"].dtype)
-		self.assertEqual([int(1), None, str("3")], arguments_df["X"].tolist())
+from jpmml_evaluator import _checkDataTypes, _formatColumn, _sampleArguments, columnar, DataTypeError, TargetField
+
+class ColumnarTest(TestCase):
+
+	def test_roundtrip(self):
+		arguments_df = DataFrame({
+			"float" : [1.5, numpy.nan, -3.0],
+			"int" : [1, 2, 3],
+			"nullable_int" : pandas.array([1, None, 3], dtype = "Int64"),
+			"bool" : [True, False, True],
+			"str" : ["a", None, "a"],
+			"category" : pandas.Categorical(["x", "y", None]),
+			"mixed" : [1, "two", numpy.nan]
+		})
+		results = columnar.loads(columnar.dumps(arguments_df))
+		self.assertEqual(arguments_df.columns.tolist(), results["columns"])
+		self.assertIsNone(results["errors"])
+		data = dict(zip(results["columns"], results["data"]))
+		self.assertEqual(numpy.float64, data["float"].dtype)
+		self.assertTrue(numpy.array_equal([1.5, numpy.nan, -3.0], data["float"], equal_nan = True))
+		self.assertEqual(numpy.int64, data["int"].dtype)
+		self.assertEqual([1, 2, 3], data["int"].tolist())
+		self.assertEqual("Int64", data["nullable_int"].dtype)
+		self.assertEqual([1, None, 3], data["nullable_int"].to_numpy(dtype = object, na_value = None).tolist())
+		self.assertEqual([True, False, True], data["bool"].tolist())
+		self.assertIsInstance(data["str"], pandas.Categorical)
+		self.assertEqual(["a"], data["str"].categories.tolist())
+		self.assertEqual(["a", None, "a"], columnar.toObjectArray(data["str"]).tolist())
+		self.assertEqual(["x", "y", None], columnar.toObjectArray(data["category"]).tolist())
+		self.assertEqual([1, "two"], data["mixed"][0:2])
+		self.assertTrue(numpy.isnan(data["mixed"][2]))
+
+	def test_maskValues(self):
+		mask = numpy.array([False, True, False])
+		values = columnar.maskValues(numpy.array([1.5, 2.0, 3.0]), mask)
+		self.assertTrue(numpy.array_equal([1.5, numpy.nan, 3.0], values, equal_nan = True))
+		values = columnar.maskValues(numpy.array([1, 2, 3]), mask)
+		self.assertEqual("Int64", values.dtype)
+		self.assertEqual([1, None, 3], values.to_numpy(dtype = object, na_value = None).tolist())
+		values = columnar.maskValues(numpy.array([True, False, True]), mask)
+		self.assertEqual("boolean", values.dtype)
+		self.assertEqual([True, None, True], values.to_numpy(dtype = object, na_value = None).tolist())
+		values = numpy.array([1, 2, 3])
+		self.assertIs(values, columnar.maskValues(values, numpy.zeros(3, dtype = bool)))
+
+	def test_alignment(self):
+		arguments_df = DataFrame({
+			"s" : ["abc", "de"],
+			"x" : [1.0, 2.0]
+		})
+		data = columnar.dumps(arguments_df)
+		# Header (8) + name (4 + 1) + type (1) + dictionary (4 + 7 + 6) + padding (1) + codes (8) + name (4 + 1) + type (1) + mask (1) + padding (1) + values (16) + errors (1)
+		self.assertEqual(65, len(data))
+		results = columnar.loads(data)
+		self.assertEqual([1.0, 2.0], results["data"][1].tolist())
+
+	def test_errors(self):
+		writer = columnar._Writer()
+		writer.writeInt(3)
+		writer.writeInt(0)
+		writer.writeByte(1)
+		columnar._writeDictionary(writer, numpy.array([-1, 0, -1]), ["Invalid value"])
+		results = columnar.loads(writer.getvalue())
+		self.assertEqual([None, "Invalid value", None], results["errors"])
+
+	def test_splitBuffers(self):
+		arguments_df = DataFrame({
+			"float" : [1.5, numpy.nan, -3.0],
+			"nullable_float" : pandas.array([1.5, None, -3.0], dtype = "Float64"),
+			"int" : numpy.array([1, 2, 3], dtype = numpy.int32),
+			"str" : ["a", "b", "c"]
+		})
+		columns, values, masks, other_df = columnar.splitBuffers(arguments_df)
+		self.assertEqual(["float", "nullable_float", "int"], columns)
+		self.assertEqual(numpy.float64, values[0].dtype)
+		self.assertTrue(numpy.shares_memory(arguments_df["float"].to_numpy(), values[0]))
+		self.assertTrue(numpy.isnan(values[0][1]))
+		self.assertIsNone(masks[0])
+		self.assertEqual(numpy.float64, values[1].dtype)
+		self.assertEqual([0, 1, 0], masks[1].tolist())
+		self.assertEqual(numpy.int64, values[2].dtype)
+		self.assertIsNone(masks[2])
+		self.assertEqual(["str"], other_df.columns.tolist())
+
+class SampleArgumentsTest(TestCase):
+
+	def test_sampleArguments(self):
+		inputFields = [
+			_InputField("x", "double", continuousDomain = [(1.0, 2.0)]),
+			_InputField("n", "integer", continuousDomain = [(None, 5.0)]),
+			_InputField("c", "string", discreteDomain = ["a", "b"]),
+			_InputField("flag", "boolean")
+		]
+		records = _sampleArguments(inputFields, 100)
+		self.assertEqual(100, len(records))
+		for record in records:
+			self.assertTrue(1.0 <= record["x"] <= 2.0)
+			self.assertTrue(4 <= record["n"] <= 5)
+			self.assertIn(record["c"], ["a", "b"])
+			self.assertIsInstance(record["flag"], bool)
+		self.assertEqual(records, _sampleArguments(inputFields, 100))
+
+class CheckDataTypesTest(TestCase):
+
+	def test_checkDataTypes(self):
+		arguments_df = DataFrame({
+			"x" : [1.5, None, 3.0],
+			"n" : [1.0, 2.5, numpy.nan],
+			"str_x" : ["1", "two", None],
+			"category_x" : pandas.Categorical(["1", "x", "x"]),
+			"nan_x" : ["NaN", "2", "3.5"],
+			"int_n" : [1, 2, 3],
+			"s" : ["a", "b", "c"],
+			"extra" : ["a", "b", "c"]
+		}, index = ["a", "b", "c"])
+		inputFields = [
+			_InputField("x", "double"),
+			_InputField("n", "integer"),
+			_InputField("str_x", "double"),
+			_InputField("category_x", "float"),
+			_InputField("nan_x", "double"),
+			_InputField("int_n", "integer"),
+			_InputField("s", "string"),
+			_InputField("missing", "double")
+		]
+		with self.assertRaises(DataTypeError) as context:
+			_checkDataTypes(inputFields, arguments_df)
+		report = context.exception.report
+		self.assertEqual(["n", "str_x", "category_x"], report.index.tolist())
+		self.assertEqual([1, 1, 2], report["count"].tolist())
+		self.assertEqual(["b", "b", "b"], report["first_row"].tolist())
+		self.assertEqual([2.5, "two", "x"], report["first_value"].tolist())
+		_checkDataTypes(inputFields[:1] + inputFields[4:], arguments_df)
+
+class FormatColumnTest(TestCase):
+
+	def test_formatColumn(self):
+		targetField = _TargetField("y", "string", "categorical", ["a", "b"])
+		column = _formatColumn(["b", "c", None, "a"], targetField)
+		self.assertEqual(["a", "b", "c"], column.categories.tolist())
+		self.assertEqual(["b", "c", None, "a"], [(value if isinstance(value, str) else None) for value in column])
+		column = _formatColumn(pandas.Categorical(["c", "a"]), targetField)
+		self.assertEqual(["a", "b", "c"], column.categories.tolist())
+		self.assertEqual(["c", "a"], column.tolist())
+		column = _formatColumn(["a", "b"], targetField)
+		self.assertEqual(["a", "b"], column.categories.tolist())
+		doubleField = _TargetField("y", "double", "continuous", None)
+		self.assertEqual(numpy.float64, _formatColumn([1.5, None], doubleField).dtype)
+		self.assertEqual([1.5, "invalid"], _formatColumn([1.5, "invalid"], doubleField))
+
+class _TargetField(TargetField):
+
+	def __init__(self, name, dataType, opType, categories):
+		self.name = name
+		self.dataType = dataType
+		self.opType = opType
+		self.categories = categories
+
+class _InputField(object):
+
+	def __init__(self, name, dataType, discreteDomain = None, continuousDomain = None):
+		self.name = name
+		self.dataType = dataType
+		self.discreteDomain = discreteDomain
+		self.continuousDomain = continuousDomain
+
+	def getName(self):
+		return self.name
+
+	def getDataType(self):
+		return self.dataType
+
+	def getDiscreteDomain(self):
+		return self.discreteDomain
+
+	def getContinuousDomain(self):
+		return self.continuousDomain
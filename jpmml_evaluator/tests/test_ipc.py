@@ -0,0 +1,187 @@
+import io
+import os
+import pickle
+import socket
+
+from collections import deque
+from tempfile import TemporaryDirectory
+from threading import Thread
+from unittest import TestCase
+
+from jpmml_evaluator import make_evaluator, JVMOptions
+
+from jpmml_evaluator.ipc import _Pickler, _recvExactly, _resolveAddress, _Unpickler, IPCBackend, IPCJavaException, JavaProxy, SharedEvaluatorCache
+
+from . import _resource, EvaluatorTest, EvaluatorBuilderTest
+
+class _Backend(object):
+
+	def __init__(self):
+		self.releasedIds = deque()
+
+	def _release(self, id):
+		self.releasedIds.append(id)
+
+class IPCProtocolTest(TestCase):
+
+	def test_pickle(self):
+		backend = _Backend()
+
+		buffer = io.BytesIO()
+		_Pickler(backend, buffer).dump((2, [], JavaProxy(backend, 7), "getName", (b"\x00\x01", None)))
+
+		request = _Unpickler(backend, io.BytesIO(buffer.getvalue())).load()
+		self.assertIsInstance(request[2], JavaProxy)
+		self.assertEqual(7, request[2].id)
+		self.assertEqual((b"\x00\x01", None), request[4])
+
+		del request
+		self.assertEqual([7, 7], list(backend.releasedIds))
+
+		with self.assertRaises(ValueError):
+			_Pickler(backend, io.BytesIO()).dump(JavaProxy(_Backend(), 1))
+
+		with self.assertRaises(pickle.UnpicklingError):
+			_Unpickler(backend, io.BytesIO(pickle.dumps(os.system, protocol = 2))).load()
+
+		self.assertEqual(bytearray(b"abc"), _Unpickler(backend, io.BytesIO(pickle.dumps(bytearray(b"abc"), protocol = 2))).load())
+
+	def test_inheritedProxy(self):
+		backend = _Backend()
+
+		proxy = JavaProxy(backend, 7)
+		# Simulate a proxy that has been inherited from the parent process
+		proxy.pid = -1
+
+		del proxy
+		self.assertEqual([], list(backend.releasedIds))
+
+	def test_recvExactly(self):
+		left, right = socket.socketpair()
+
+		def _send():
+			for i in range(0, 10000, 1000):
+				left.sendall(bytes(range(10)) * 100)
+			left.close()
+
+		thread = Thread(target = _send)
+		thread.start()
+
+		try:
+			self.assertEqual(bytes(range(10)) * 1000, bytes(_recvExactly(right, 10000)))
+			with self.assertRaises(ConnectionError):
+				_recvExactly(right, 1)
+		finally:
+			thread.join()
+			right.close()
+
+	def test_resolveAddress(self):
+		with TemporaryDirectory() as tmpdir:
+			path = os.path.join(tmpdir, "ipc.sock")
+			self.assertEqual(path, _resolveAddress(path))
+
+			with open(path, "w") as address_file:
+				address_file.write("tcp:12345")
+			self.assertEqual(("127.0.0.1", 12345), _resolveAddress(path))
+
+		self.assertEqual(("127.0.0.1", 12345), _resolveAddress(("127.0.0.1", 12345)))
+
+	def test_serverCommand(self):
+		command = IPCBackend.serverCommand(address = "/tmp/test.sock", jvm_options = JVMOptions(max_heap = "1g"), idle_timeout = 60, java = "java")
+		self.assertEqual(["-Xmx1g", "org.jpmml.evaluator.python.IPCServer", "/tmp/test.sock", "60"], command[-4:])
+
+		command = IPCBackend.serverCommand(address = ("127.0.0.1", 0), java = "java")
+		self.assertEqual(["org.jpmml.evaluator.python.IPCServer", "tcp:0", "0"], command[-3:])
+
+class IPCEvaluatorTest(TestCase):
+
+	def setUp(self):
+		self.tmpdir = TemporaryDirectory()
+		self.backend = IPCBackend(address = os.path.join(self.tmpdir.name, "ipc.sock"), jvm_options = JVMOptions(max_heap = "512m", system_properties = {"jpmml_evaluator.test" : "ipc"}), idle_timeout = 1)
+
+	def tearDown(self):
+		self.backend.close()
+		self.tmpdir.cleanup()
+
+	def test_jvmOptions(self):
+		self.assertEqual("ipc", self.backend.staticInvoke("java.lang.System", "getProperty", "jpmml_evaluator.test"))
+
+	def test_authentication(self):
+		self.assertEqual(0o600, os.stat(self.backend.address + ".token").st_mode & 0o777)
+
+		with self.assertRaises(PermissionError):
+			IPCBackend(address = self.backend.address, spawn = False, auth_token = "invalid")
+
+	def test_releasedIds(self):
+		self.backend.releasedIds.append(-1)
+
+		sock = self.backend._getConnection()
+		sock.close()
+		self.backend._putConnection(sock)
+
+		with self.assertRaises(OSError):
+			self.backend.staticInvoke("java.lang.System", "getProperty", "jpmml_evaluator.test")
+		self.assertEqual([-1], list(self.backend.releasedIds))
+
+		# Simulate a forked process
+		self.backend.pid = -1
+		self.backend._putConnection(self.backend._getConnection())
+		self.assertEqual([], list(self.backend.releasedIds))
+
+	def test_permissions(self):
+		with self.assertRaises(IPCJavaException) as context:
+			self.backend.staticInvoke("java.lang.Runtime", "getRuntime")
+		self.assertEqual("java.lang.SecurityException", context.exception.className)
+
+		with self.assertRaises(IPCJavaException) as context:
+			self.backend.newObject("java.io.File", "ipc.sock").delete()
+		self.assertEqual("java.lang.SecurityException", context.exception.className)
+
+		with self.assertRaises(IPCJavaException) as context:
+			self.backend.staticInvoke("java.lang.Class", "forName", "java.lang.Runtime").getMethods()
+		self.assertEqual("java.lang.SecurityException", context.exception.className)
+
+	def test_sharedEvaluators(self):
+		evaluator = make_evaluator(_resource("DecisionTreeIris.pmml"), backend = self.backend)
+
+		other_backend = IPCBackend(address = self.backend.address, spawn = False)
+		try:
+			other_evaluator = make_evaluator(_resource("DecisionTreeIris.pmml"), backend = other_backend)
+
+			self.assertIsNot(evaluator, other_evaluator)
+			self.assertEqual(self.backend.staticInvoke("java.lang.System", "identityHashCode", evaluator.javaEvaluator), other_backend.staticInvoke("java.lang.System", "identityHashCode", other_evaluator.javaEvaluator))
+			self.assertEqual({"entries" : 1, "memory" : os.path.getsize(_resource("DecisionTreeIris.pmml")), "hits" : 1, "misses" : 0, "evictions" : 0}, other_backend.getDefaultCache().getStats())
+		finally:
+			other_backend.close()
+
+	def test_continuousDomain(self):
+		evaluator = make_evaluator(_resource("RegressionInterval.pmml"), backend = self.backend) \
+			.verify()
+
+		self.assertEqual([[(0.0, 10.0)], [(-1.0, None)]], [inputField.getContinuousDomain() for inputField in evaluator.getInputFields()])
+		self.assertEqual({"y" : 1.0 + 2.0 * 3.0 - 1.0 * 2.0}, evaluator.evaluate({"x1" : 3.0, "x2" : 2.0}))
+
+	def test_sharedEvaluatorCache(self):
+		cache = SharedEvaluatorCache(self.backend, max_entries = 1)
+
+		evaluator = make_evaluator(_resource("DecisionTreeIris.pmml"), backend = self.backend, cache = cache)
+		key, = cache.entries
+
+		other_evaluator = make_evaluator(_resource("DecisionTreeIris.pmml"), backend = self.backend, cache = cache)
+		self.assertIsNot(evaluator, other_evaluator)
+		self.assertIs(evaluator.javaEvaluator, other_evaluator.javaEvaluator)
+
+		make_evaluator(_resource("RegressionInterval.pmml"), backend = self.backend, cache = cache)
+		self.assertEqual({"entries" : 1, "memory" : os.path.getsize(_resource("RegressionInterval.pmml")), "hits" : 1, "misses" : 2, "evictions" : 1}, cache.getStats())
+
+		# Evicted evaluators are unexported
+		self.assertIsNone(SharedEvaluatorCache(self.backend).get(key))
+
+		# Evaluators that are in use keep working
+		self.assertEqual("setosa", evaluator.evaluate({"Petal.Length" : 1.4, "Petal.Width" : 0.2})["Species"])
+
+	def test_evaluatorBuilder(self):
+		EvaluatorBuilderTest().workflow(self.backend)
+
+	def test_evaluator(self):
+		EvaluatorTest().workflow(self.backend, lax = False)
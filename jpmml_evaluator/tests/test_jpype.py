@@ -1,19 +1,28 @@
 from unittest import TestCase
 
+from jpmml_evaluator import make_backend, JVMOptions
+
 from jpmml_evaluator.jpype import JPypeBackend
 
-from . import EvaluatorTest, EvaluatorBuilderTest
+from . import ConcurrencyTest, EvaluatorTest, EvaluatorBuilderTest
 
 class JPypeEvaluatorTest(TestCase):
 
 	def setUp(self):
-		JPypeBackend.createJVM()
+		JPypeBackend.createJVM(jvm_options = JVMOptions(max_heap = "512m", system_properties = {"jpmml_evaluator.test" : "jpype"}))
 
 	def tearDown(self):
 		JPypeBackend.destroyJVM()
 
+	def test_jvmOptions(self):
+		backend = make_backend("jpype")
+		self.assertEqual("jpype", backend.staticInvoke("java.lang.System", "getProperty", "jpmml_evaluator.test"))
+
 	def test_evaluatorBuilder(self):
 		EvaluatorBuilderTest().workflow("jpype")
 
+	def test_concurrency(self):
+		ConcurrencyTest().workflow("jpype")
+
 	def test_evaluator(self):
 		EvaluatorTest().workflow("jpype", lax = False)
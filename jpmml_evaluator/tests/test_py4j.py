@@ -1,5 +1,7 @@
 from unittest import TestCase
 
+from jpmml_evaluator import make_backend, JVMOptions
+
 from jpmml_evaluator.py4j import Py4JBackend
 
 from . import EvaluatorTest, EvaluatorBuilderTest
@@ -7,13 +9,32 @@ from . import EvaluatorTest, EvaluatorBuilderTest
 class Py4JEvaluatorTest(TestCase):
 
 	def setUp(self):
-		Py4JBackend.createGateway()
+		Py4JBackend.createGateway(jvm_options = JVMOptions(max_heap = "512m", system_properties = {"jpmml_evaluator.test" : "py4j"}))
 
 	def tearDown(self):
 		Py4JBackend.destroyGateway()
 
+	def test_jvmOptions(self):
+		backend = make_backend("py4j")
+		self.assertEqual("py4j", backend.staticInvoke("java.lang.System", "getProperty", "jpmml_evaluator.test"))
+
 	def test_evaluatorBuilder(self):
 		EvaluatorBuilderTest().workflow("py4j")
 
 	def test_evaluator(self):
 		EvaluatorTest().workflow("py4j", lax = False)
+
+	def test_connectGateway(self):
+		port = Py4JBackend.gateway.gateway_parameters.port
+		gateway = Py4JBackend.connectGateway(port = port)
+		try:
+			backend = Py4JBackend(gateway = gateway, pool_size = 3)
+			self.assertEqual("py4j", backend.staticInvoke("java.lang.System", "getProperty", "jpmml_evaluator.test"))
+			with self.assertRaises(ValueError):
+				backend.warmupConnections(0)
+		finally:
+			gateway.close()
+
+	def test_gatewayCommand(self):
+		command = Py4JBackend.gatewayCommand(port = 25334, jvm_options = JVMOptions(max_heap = "1g"), enable_auth = True, java = "java")
+		self.assertEqual(["-Xmx1g", "py4j.GatewayServer", "--enable-auth", "25334"], command[3:])
@@ -1,19 +1,28 @@
 from unittest import TestCase
 
+from jpmml_evaluator import make_backend, JVMOptions
+
 from jpmml_evaluator.pyjnius import PyJNIusBackend
 
-from . import EvaluatorTest, EvaluatorBuilderTest
+from . import ConcurrencyTest, EvaluatorTest, EvaluatorBuilderTest
 
 class PyJNIusEvaluatorTest(TestCase):
 
 	def setUp(self):
-		PyJNIusBackend.createJVM()
+		PyJNIusBackend.createJVM(jvm_options = JVMOptions(max_heap = "512m", system_properties = {"jpmml_evaluator.test" : "pyjnius"}))
 
 	def tearDown(self):
 		PyJNIusBackend.destroyJVM()
 
+	def test_jvmOptions(self):
+		backend = make_backend("pyjnius")
+		self.assertEqual("pyjnius", backend.staticInvoke("java.lang.System", "getProperty", "jpmml_evaluator.test"))
+
 	def test_evaluatorBuilder(self):
 		EvaluatorBuilderTest().workflow("pyjnius")
 
+	def test_concurrency(self):
+		ConcurrencyTest().workflow("pyjnius")
+
 	def test_evaluator(self):
 		EvaluatorTest().workflow("pyjnius", lax = True)
@@ -0,0 +1,95 @@
+import json
+
+from threading import Thread
+from unittest import TestCase
+from urllib.error import HTTPError
+from urllib.request import urlopen, Request
+
+import pandas
+
+from jpmml_evaluator.server import _toJSON, ModelMetrics, ScoringServer
+
+class _Field(object):
+
+	def __init__(self, name):
+		self.name = name
+
+	def getName(self):
+		return self.name
+
+class _DoublingEvaluator(object):
+
+	def getInputFields(self):
+		return [_Field("x")]
+
+	def getTargetFields(self):
+		return [_Field("y")]
+
+	def getOutputFields(self):
+		return []
+
+	def evaluateRecords(self, records, nan_as_missing = True, parallelism = -1):
+		return [ValueError("Negative x") if record["x"] < 0 else {"y" : 2 * record["x"]} for record in records]
+
+	def evaluateAll(self, arguments_df, parallelism = -1):
+		return pandas.DataFrame({"y" : 2 * arguments_df["x"]})
+
+class ModelMetricsTest(TestCase):
+
+	def test_getStats(self):
+		metrics = ModelMetrics()
+		metrics.started -= 2 * ModelMetrics.WINDOW_S
+		metrics.observe(100, 0, 1.0)
+		metrics.recordBuckets[0][0] -= 2 * ModelMetrics.WINDOW_S
+		metrics.observe(30, 1, 1.0)
+		stats = metrics.getStats()
+		self.assertEqual(130, stats["records"])
+		self.assertEqual(30 / ModelMetrics.WINDOW_S, stats["throughput_records_per_s"])
+		self.assertEqual(1, len(metrics.recordBuckets))
+
+	def test_toJSON(self):
+		self.assertEqual({"x" : None, "y" : [1.5, None, None]}, json.loads(_toJSON({"x" : float("NaN"), "y" : (1.5, float("inf"), float("-inf"))})))
+
+class ScoringServerTest(TestCase):
+
+	def setUp(self):
+		self.server = ScoringServer(("127.0.0.1", 0), {"double" : _DoublingEvaluator()}, max_delay_ms = 1)
+		self.thread = Thread(target = self.server.serve_forever, daemon = True)
+		self.thread.start()
+		self.url = "http://127.0.0.1:{0}".format(self.server.server_address[1])
+
+	def tearDown(self):
+		self.server.shutdown()
+		self.server.server_close()
+
+	def _request(self, path, data = None, contentType = "application/json"):
+		request = Request(self.url + path, data = data, headers = {"Content-Type" : contentType})
+		with urlopen(request) as response:
+			return response.read()
+
+	def test_models(self):
+		models = json.loads(self._request("/models"))
+		self.assertEqual([{"name" : "double", "inputFields" : ["x"], "targetFields" : ["y"], "outputFields" : []}], models)
+		with self.assertRaises(HTTPError) as context:
+			self._request("/models/triple")
+		self.assertEqual(404, context.exception.code)
+
+	def test_evaluate(self):
+		self.assertEqual({"y" : 4}, json.loads(self._request("/models/double", json.dumps({"x" : 2}).encode("utf-8"))))
+		with self.assertRaises(HTTPError) as context:
+			self._request("/models/double", json.dumps({"x" : -1}).encode("utf-8"))
+		self.assertEqual(422, context.exception.code)
+		results = json.loads(self._request("/models/double", json.dumps([{"x" : 1}, {"x" : -1}]).encode("utf-8")))
+		self.assertEqual([{"y" : 2}, {"error" : "Negative x"}], results)
+		results = self._request("/models/double", b"x\n1\n3\n", contentType = "text/csv")
+		self.assertEqual("y\n2\n6\n", results.decode("utf-8").replace("\r\n", "\n"))
+		with self.assertRaises(HTTPError) as context:
+			self._request("/models/double", b"x", contentType = "text/plain")
+		self.assertEqual(415, context.exception.code)
+
+		metrics = json.loads(self._request("/metrics"))["double"]
+		self.assertEqual(4, metrics["requests"])
+		self.assertEqual(6, metrics["records"])
+		self.assertEqual(2, metrics["errors"])
+		self.assertEqual(4, metrics["latency_ms"]["count"])
+		self.assertEqual(2, metrics["batching"]["batch_size"]["sum"])
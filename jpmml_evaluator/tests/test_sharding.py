@@ -0,0 +1,70 @@
+from unittest import TestCase
+
+import pandas
+
+from jpmml_evaluator import ShardedEvaluator, WorkerError
+from jpmml_evaluator.sharding import _combine, _splitRows
+from jpmml_evaluator.tests import _resource
+
+class ShardedEvaluatorTest(TestCase):
+
+	def test_splitRows(self):
+		df = pandas.DataFrame({"x" : range(10)}, index = range(100, 110))
+
+		partitions = _splitRows(df, 3)
+		self.assertEqual([4, 3, 3], [len(partition) for partition in partitions])
+		self.assertEqual(df.index.tolist(), pandas.concat(partitions).index.tolist())
+
+		partitions = _splitRows(df.iloc[0:2], 4)
+		self.assertEqual([1, 1], [len(partition) for partition in partitions])
+
+		partitions = _splitRows(df.iloc[0:0], 4)
+		self.assertEqual([0], [len(partition) for partition in partitions])
+
+	def test_combine(self):
+		df = pandas.DataFrame({"x" : [1, -1, 2, 3]}, index = [3, 2, 1, 0])
+
+		partitions = _splitRows(df, 2)
+		results = [
+			(pandas.DataFrame({"y" : [2.0, None]}, index = partitions[0].index), pandas.Series([None, "Negative"], index = partitions[0].index, dtype = object)),
+			(pandas.DataFrame({"y" : [4.0, 6.0]}, index = partitions[1].index), None)
+		]
+
+		results_df = _combine(partitions, results, "errors")
+		self.assertEqual([3, 2, 1, 0], results_df.index.tolist())
+		self.assertEqual(["y", "errors"], results_df.columns.tolist())
+		self.assertEqual([None, "Negative", None, None], results_df["errors"].tolist())
+
+		results_df, errors = _combine(partitions, results, None)
+		self.assertEqual(["y"], results_df.columns.tolist())
+		self.assertEqual([None, "Negative", None, None], errors.tolist())
+
+		results = [(results_df.iloc[0:2], None), (results_df.iloc[2:4], None)]
+
+		results_df = _combine(partitions, results, "errors")
+		self.assertEqual(["y"], results_df.columns.tolist())
+
+		results_df, errors = _combine(partitions, results, None)
+		self.assertIsNone(errors)
+
+	def test_evaluateAll(self):
+		arguments_df = pandas.read_csv(_resource("Iris.csv"), sep = ",")
+		arguments_df.index = arguments_df.index * 10
+
+		with ShardedEvaluator(_resource("DecisionTreeIris.pmml"), workers = 2, backend = "jpype") as evaluator:
+			self.assertEqual(2, evaluator.getWorkers())
+
+			results_df = evaluator.evaluateAll(arguments_df)
+			self.assertEqual(arguments_df.index.tolist(), results_df.index.tolist())
+			self.assertEqual(["setosa", "versicolor", "virginica"], sorted(results_df["Species"].unique().tolist()))
+
+			# Kill a worker process, and check that it gets respawned
+			process, conn = evaluator.workers[1]
+			process.kill()
+			process.join()
+
+			self.assertTrue(results_df.equals(evaluator.evaluateAll(arguments_df)))
+			self.assertEqual(1, evaluator.getRespawns())
+
+			with self.assertRaises(WorkerError):
+				evaluator.evaluate({"Petal.Length" : "error"})
@@ -28,7 +28,7 @@ setup(
 	install_requires = [
 		"jpype1",
 		"pandas",
-		"py4j",
+		"py4j>=0.10.7",
 		"pyjnius>=1.2.1"
 	]
 )
@@ -0,0 +1,120 @@
+/*
+ * Copyright (c) 2026 Villu Ruusmann
+ *
+ * This file is part of JPMML-Evaluator
+ *
+ * JPMML-Evaluator is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Affero General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * JPMML-Evaluator is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU Affero General Public License for more details.
+ *
+ * You should have received a copy of the GNU Affero General Public License
+ * along with JPMML-Evaluator.  If not, see <http://www.gnu.org/licenses/>.
+ */
+package org.jpmml.evaluator.python;
+
+import java.util.Comparator;
+import java.util.Spliterator;
+import java.util.function.Consumer;
+
+/**
+ * <p>
+ * A spliterator that does not split below the specified batch size.
+ * </p>
+ */
+public class BatchSpliterator<E> implements Spliterator<E> {
+
+	private Spliterator<E> spliterator = null;
+
+	private int batchSize = 0;
+
+
+	public BatchSpliterator(Spliterator<E> spliterator, int batchSize){
+		setSpliterator(spliterator);
+		setBatchSize(batchSize);
+	}
+
+	@Override
+	public Spliterator<E> trySplit(){
+		Spliterator<E> spliterator = getSpliterator();
+		int batchSize = getBatchSize();
+
+		// Both halves must contain at least one full batch
+		if(spliterator.estimateSize() < 2L * batchSize){
+			return null;
+		}
+
+		Spliterator<E> prefix = spliterator.trySplit();
+		if(prefix == null){
+			return null;
+		}
+
+		return new BatchSpliterator<>(prefix, batchSize);
+	}
+
+	@Override
+	public boolean tryAdvance(Consumer<? super E> action){
+		Spliterator<E> spliterator = getSpliterator();
+
+		return spliterator.tryAdvance(action);
+	}
+
+	@Override
+	public void forEachRemaining(Consumer<? super E> action){
+		Spliterator<E> spliterator = getSpliterator();
+
+		spliterator.forEachRemaining(action);
+	}
+
+	@Override
+	public long estimateSize(){
+		Spliterator<E> spliterator = getSpliterator();
+
+		return spliterator.estimateSize();
+	}
+
+	@Override
+	public int characteristics(){
+		Spliterator<E> spliterator = getSpliterator();
+
+		return spliterator.characteristics();
+	}
+
+	@Override
+	public Comparator<? super E> getComparator(){
+		Spliterator<E> spliterator = getSpliterator();
+
+		return spliterator.getComparator();
+	}
+
+	public Spliterator<E> getSpliterator(){
+		return this.spliterator;
+	}
+
+	private void setSpliterator(Spliterator<E> spliterator){
+
+		if(spliterator == null){
+			throw new IllegalArgumentException();
+		}
+
+		this.spliterator = spliterator;
+	}
+
+	public int getBatchSize(){
+		return this.batchSize;
+	}
+
+	private void setBatchSize(int batchSize){
+
+		if(batchSize < 1){
+			throw new IllegalArgumentException();
+		}
+
+		this.batchSize = batchSize;
+	}
+}
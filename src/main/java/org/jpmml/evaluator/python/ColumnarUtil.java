@@ -0,0 +1,864 @@
+/*
+ * Copyright (c) 2026 Villu Ruusmann
+ *
+ * This file is part of JPMML-Evaluator
+ *
+ * JPMML-Evaluator is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Affero General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * JPMML-Evaluator is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU Affero General Public License for more details.
+ *
+ * You should have received a copy of the GNU Affero General Public License
+ * along with JPMML-Evaluator.  If not, see <http://www.gnu.org/licenses/>.
+ */
+package org.jpmml.evaluator.python;
+
+import java.io.IOException;
+import java.nio.Buffer;
+import java.nio.ByteBuffer;
+import java.nio.ByteOrder;
+import java.nio.DoubleBuffer;
+import java.nio.IntBuffer;
+import java.nio.LongBuffer;
+import java.nio.charset.StandardCharsets;
+import java.util.AbstractList;
+import java.util.ArrayList;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.RandomAccess;
+import java.util.function.IntPredicate;
+
+import com.google.common.collect.Lists;
+import net.razorvine.pickle.Pickler;
+import net.razorvine.pickle.Unpickler;
+import org.jpmml.evaluator.Table;
+
+/**
+ * <p>
+ * Columnar binary encoding of tables.
+ * </p>
+ *
+ * All numbers are little-endian. A table is laid out as follows:
+ * <pre>
+ * int32 numberOfRows
+ * int32 numberOfColumns
+ * column*
+ * uint8 hasErrors
+ * (STRING column payload)?
+ * </pre>
+ *
+ * A column is its UTF-8 name (int32 length + bytes), a type byte, and a type-specific payload:
+ * <ul>
+ *   <li>{@link #TYPE_DOUBLE}, {@link #TYPE_LONG}: validity bitmap, padding to an 8-byte boundary, and a block of 64-bit values.</li>
+ *   <li>{@link #TYPE_BOOLEAN}: validity bitmap and a block of 8-bit values.</li>
+ *   <li>{@link #TYPE_STRING}: dictionary of distinct values, padding to a 4-byte boundary, and a block of 32-bit dictionary codes (-1 for missing values).</li>
+ *   <li>{@link #TYPE_PICKLE}: pickled list of values.</li>
+ * </ul>
+ *
+ * A validity bitmap is a presence byte, optionally followed by a least significant bit-first bitmap of <code>(numberOfRows + 7) / 8</code> bytes.
+ */
+public class ColumnarUtil {
+
+	private ColumnarUtil(){
+	}
+
+	/**
+	 * @param nanAsMissing If <code>true</code>, then floating-point NaN values are decoded as missing values.
+	 */
+	static
+	public Table decodeTable(ByteBuffer buffer, boolean nanAsMissing) throws IOException {
+		buffer = buffer.slice()
+			.order(ByteOrder.LITTLE_ENDIAN);
+
+		int numberOfRows = buffer.getInt();
+		int numberOfColumns = buffer.getInt();
+
+		Map<String, List<?>> data = new LinkedHashMap<>();
+
+		for(int i = 0; i < numberOfColumns; i++){
+			String column = readString(buffer);
+			List<?> values = decodeValues(buffer, numberOfRows, nanAsMissing);
+
+			data.put(column, values);
+		}
+
+		Table result = new Table(new ArrayList<>(data.keySet()), numberOfRows);
+
+		for(Map.Entry<String, List<?>> entry : data.entrySet()){
+			result.setValues(entry.getKey(), entry.getValue());
+		}
+
+		return result;
+	}
+
+	static
+	public byte[] encodeTable(Table table) throws IOException {
+		return encodeTable(table, table.getNumberOfRows());
+	}
+
+	static
+	public byte[] encodeTable(Table table, int numberOfRows) throws IOException {
+		List<String> columns = table.getColumns();
+
+		List<ColumnEncoder> encoders = new ArrayList<>();
+
+		for(String column : columns){
+			List<?> values = table.getValues(column);
+
+			encoders.add(createEncoder(column, values));
+		}
+
+		ColumnEncoder errorsEncoder = null;
+
+		if(table.hasExceptions()){
+			List<Exception> exceptions = table.getExceptions();
+
+			List<String> errors = new ArrayList<>(numberOfRows);
+
+			for(int i = 0; i < numberOfRows; i++){
+				Exception exception = (i < exceptions.size() ? exceptions.get(i) : null);
+
+				errors.add(exception != null ? exception.toString() : null);
+			}
+
+			errorsEncoder = new StringEncoder(null, errors);
+		}
+
+		int size = 4 + 4;
+
+		for(ColumnEncoder encoder : encoders){
+			size = encoder.measure(size);
+		}
+
+		size += 1;
+
+		if(errorsEncoder != null){
+			size = errorsEncoder.measurePayload(size);
+		}
+
+		ByteBuffer buffer = ByteBuffer.allocate(size)
+			.order(ByteOrder.LITTLE_ENDIAN);
+
+		buffer.putInt(numberOfRows);
+		buffer.putInt(encoders.size());
+
+		for(ColumnEncoder encoder : encoders){
+			encoder.write(buffer);
+		}
+
+		if(errorsEncoder != null){
+			buffer.put((byte)1);
+
+			errorsEncoder.writePayload(buffer);
+		} else
+
+		{
+			buffer.put((byte)0);
+		}
+
+		return buffer.array();
+	}
+
+	/**
+	 * <p>
+	 * Sets the values of a column to a view of a {@link DoubleBuffer} or a {@link LongBuffer}.
+	 * </p>
+	 *
+	 * @param mask A byte-per-row mask, where a non-zero byte denotes a missing value. May be <code>null</code>.
+	 */
+	static
+	public void setValues(Table table, String column, Buffer values, ByteBuffer mask, boolean nanAsMissing){
+		IntPredicate missing = null;
+
+		if(mask != null){
+			missing = (index) -> (mask.get(index) != 0);
+		} // End if
+
+		if(values instanceof DoubleBuffer){
+			DoubleBuffer doubleValues = (DoubleBuffer)values;
+
+			if(nanAsMissing){
+				missing = orNaN(missing, doubleValues);
+			}
+
+			table.setValues(column, new DoubleList(doubleValues, missing));
+		} else
+
+		if(values instanceof LongBuffer){
+			table.setValues(column, new LongList((LongBuffer)values, missing));
+		} else
+
+		{
+			throw new IllegalArgumentException("Buffer type " + (values.getClass()).getName() + " is not supported");
+		}
+	}
+
+	/**
+	 * <p>
+	 * Copies the values of a column into a {@link DoubleBuffer} or a {@link LongBuffer}.
+	 * </p>
+	 *
+	 * @param mask A byte-per-row mask, which receives a non-zero byte for each missing value.
+	 */
+	static
+	public void copyValues(Table table, String column, Buffer values, ByteBuffer mask){
+		List<?> columnValues = table.getValues(column);
+
+		for(int i = 0, max = values.limit(); i < max; i++){
+			Object value = (columnValues != null && i < columnValues.size()) ? columnValues.get(i) : null;
+
+			if(value != null && !(value instanceof Number)){
+				throw new IllegalArgumentException("Column " + column + " contains a non-numeric value " + value);
+			}
+
+			Number number = (Number)value;
+
+			if(values instanceof DoubleBuffer){
+				DoubleBuffer doubleValues = (DoubleBuffer)values;
+
+				doubleValues.put(i, number != null ? number.doubleValue() : Double.NaN);
+			} else
+
+			if(values instanceof LongBuffer){
+				LongBuffer longValues = (LongBuffer)values;
+
+				longValues.put(i, number != null ? number.longValue() : 0L);
+			} else
+
+			{
+				throw new IllegalArgumentException("Buffer type " + (values.getClass()).getName() + " is not supported");
+			}
+
+			mask.put(i, number != null ? (byte)0 : (byte)1);
+		}
+	}
+
+	static
+	private List<?> decodeValues(ByteBuffer buffer, int numberOfRows, boolean nanAsMissing) throws IOException {
+		byte type = buffer.get();
+
+		switch(type){
+			case TYPE_DOUBLE:
+				{
+					IntPredicate missing = readMask(buffer, numberOfRows);
+
+					align(buffer, 8);
+
+					DoubleBuffer values = readBytes(buffer, numberOfRows * 8).asDoubleBuffer();
+
+					if(nanAsMissing){
+						missing = orNaN(missing, values);
+					}
+
+					return new DoubleList(values, missing);
+				}
+			case TYPE_LONG:
+				{
+					IntPredicate missing = readMask(buffer, numberOfRows);
+
+					align(buffer, 8);
+
+					LongBuffer values = readBytes(buffer, numberOfRows * 8).asLongBuffer();
+
+					return new LongList(values, missing);
+				}
+			case TYPE_BOOLEAN:
+				{
+					IntPredicate missing = readMask(buffer, numberOfRows);
+
+					ByteBuffer values = readBytes(buffer, numberOfRows);
+
+					return new BooleanList(values, missing);
+				}
+			case TYPE_STRING:
+				{
+					int size = buffer.getInt();
+
+					String[] dictionary = new String[size];
+
+					for(int i = 0; i < size; i++){
+						dictionary[i] = readString(buffer);
+					}
+
+					align(buffer, 4);
+
+					IntBuffer codes = readBytes(buffer, numberOfRows * 4).asIntBuffer();
+
+					return new StringList(dictionary, codes);
+				}
+			case TYPE_PICKLE:
+				{
+					int length = buffer.getInt();
+
+					byte[] bytes = new byte[length];
+
+					buffer.get(bytes);
+
+					Unpickler unpickler = new Unpickler();
+
+					List<?> values = (List<?>)unpickler.loads(bytes);
+					if(values.size() != numberOfRows){
+						throw new IllegalArgumentException();
+					} // End if
+
+					if(nanAsMissing){
+						values = replaceNaN(values);
+					}
+
+					return values;
+				}
+			default:
+				throw new IllegalArgumentException("Column type " + type + " is not supported");
+		}
+	}
+
+	static
+	private ColumnEncoder createEncoder(String column, List<?> values) throws IOException {
+		Class<?> clazz = null;
+
+		for(Object value : values){
+
+			if(value == null){
+				continue;
+			}
+
+			Class<?> valueClazz;
+
+			if((value instanceof Double) || (value instanceof Float)){
+				valueClazz = Double.class;
+			} else
+
+			if((value instanceof Long) || (value instanceof Integer) || (value instanceof Short) || (value instanceof Byte)){
+				valueClazz = Long.class;
+			} else
+
+			if(value instanceof Boolean){
+				valueClazz = Boolean.class;
+			} else
+
+			if(value instanceof String){
+				valueClazz = String.class;
+			} else
+
+			{
+				return new PickleEncoder(column, values);
+			} // End if
+
+			if(clazz == null){
+				clazz = valueClazz;
+			} else
+
+			if(!(clazz).equals(valueClazz)){
+				return new PickleEncoder(column, values);
+			}
+		}
+
+		if(clazz == null || (Double.class).equals(clazz)){
+			return new DoubleEncoder(column, values);
+		} else
+
+		if((Long.class).equals(clazz)){
+			return new LongEncoder(column, values);
+		} else
+
+		if((Boolean.class).equals(clazz)){
+			return new BooleanEncoder(column, values);
+		} else
+
+		{
+			return new StringEncoder(column, values);
+		}
+	}
+
+	static
+	private IntPredicate readMask(ByteBuffer buffer, int numberOfRows){
+		boolean hasMask = (buffer.get() != 0);
+
+		if(hasMask){
+			ByteBuffer mask = readBytes(buffer, (numberOfRows + 7) / 8);
+
+			return (index) -> (mask.get(index >> 3) & (1 << (index & 7))) == 0;
+		}
+
+		return null;
+	}
+
+	static
+	private ByteBuffer readBytes(ByteBuffer buffer, int length){
+		ByteBuffer result = buffer.slice();
+		result.limit(length);
+
+		buffer.position(buffer.position() + length);
+
+		return result.order(ByteOrder.LITTLE_ENDIAN);
+	}
+
+	static
+	private String readString(ByteBuffer buffer){
+		int length = buffer.getInt();
+
+		byte[] bytes = new byte[length];
+
+		buffer.get(bytes);
+
+		return new String(bytes, StandardCharsets.UTF_8);
+	}
+
+	static
+	private void align(ByteBuffer buffer, int alignment){
+		buffer.position(pad(buffer.position(), alignment));
+	}
+
+	static
+	private int pad(int position, int alignment){
+		int remainder = (position % alignment);
+
+		if(remainder != 0){
+			return position + (alignment - remainder);
+		}
+
+		return position;
+	}
+
+	static
+	public boolean isNaN(Object value){
+
+		if(value instanceof Double){
+			return ((Double)value).isNaN();
+		} else
+
+		if(value instanceof Float){
+			return ((Float)value).isNaN();
+		}
+
+		return false;
+	}
+
+	/**
+	 * <p>
+	 * Returns a view of the list, where floating-point NaN values are replaced with <code>null</code>.
+	 * </p>
+	 */
+	static
+	public List<?> replaceNaN(List<?> values){
+		return Lists.transform(values, value -> isNaN(value) ? null : value);
+	}
+
+	static
+	private IntPredicate orNaN(IntPredicate missing, DoubleBuffer values){
+		IntPredicate nan = (index) -> Double.isNaN(values.get(index));
+
+		return (missing != null ? missing.or(nan) : nan);
+	}
+
+	static
+	private boolean isMissing(IntPredicate missing, int index){
+		return (missing != null && missing.test(index));
+	}
+
+	static
+	private byte[] toBytes(String string){
+		return string.getBytes(StandardCharsets.UTF_8);
+	}
+
+	abstract
+	static private class ColumnEncoder {
+
+		private byte[] name = null;
+
+		private List<?> values = null;
+
+
+		private ColumnEncoder(String name, List<?> values){
+			this.name = (name != null ? toBytes(name) : null);
+			this.values = values;
+		}
+
+		abstract
+		public byte getType();
+
+		abstract
+		public int measurePayload(int position);
+
+		abstract
+		public void writePayload(ByteBuffer buffer);
+
+		public int measure(int position){
+			position += (4 + this.name.length);
+			position += 1;
+
+			return measurePayload(position);
+		}
+
+		public void write(ByteBuffer buffer){
+			buffer.putInt(this.name.length);
+			buffer.put(this.name);
+			buffer.put(getType());
+
+			writePayload(buffer);
+		}
+
+		public List<?> getValues(){
+			return this.values;
+		}
+
+		protected int measureMask(int position){
+			List<?> values = getValues();
+
+			position += 1;
+
+			if(values.contains(null)){
+				position += (values.size() + 7) / 8;
+			}
+
+			return position;
+		}
+
+		protected void writeMask(ByteBuffer buffer){
+			List<?> values = getValues();
+
+			if(values.contains(null)){
+				buffer.put((byte)1);
+
+				byte[] mask = new byte[(values.size() + 7) / 8];
+
+				for(int i = 0; i < values.size(); i++){
+
+					if(values.get(i) != null){
+						mask[i >> 3] |= (byte)(1 << (i & 7));
+					}
+				}
+
+				buffer.put(mask);
+			} else
+
+			{
+				buffer.put((byte)0);
+			}
+		}
+
+		static
+		protected void writePadding(ByteBuffer buffer, int alignment){
+			int position = buffer.position();
+
+			for(int i = position, max = pad(position, alignment); i < max; i++){
+				buffer.put((byte)0);
+			}
+		}
+	}
+
+	static
+	private class DoubleEncoder extends ColumnEncoder {
+
+		private DoubleEncoder(String name, List<?> values){
+			super(name, values);
+		}
+
+		@Override
+		public byte getType(){
+			return TYPE_DOUBLE;
+		}
+
+		@Override
+		public int measurePayload(int position){
+			List<?> values = getValues();
+
+			return pad(measureMask(position), 8) + (values.size() * 8);
+		}
+
+		@Override
+		public void writePayload(ByteBuffer buffer){
+			List<?> values = getValues();
+
+			writeMask(buffer);
+			writePadding(buffer, 8);
+
+			for(Object value : values){
+				buffer.putDouble(value != null ? ((Number)value).doubleValue() : Double.NaN);
+			}
+		}
+	}
+
+	static
+	private class LongEncoder extends ColumnEncoder {
+
+		private LongEncoder(String name, List<?> values){
+			super(name, values);
+		}
+
+		@Override
+		public byte getType(){
+			return TYPE_LONG;
+		}
+
+		@Override
+		public int measurePayload(int position){
+			List<?> values = getValues();
+
+			return pad(measureMask(position), 8) + (values.size() * 8);
+		}
+
+		@Override
+		public void writePayload(ByteBuffer buffer){
+			List<?> values = getValues();
+
+			writeMask(buffer);
+			writePadding(buffer, 8);
+
+			for(Object value : values){
+				buffer.putLong(value != null ? ((Number)value).longValue() : 0L);
+			}
+		}
+	}
+
+	static
+	private class BooleanEncoder extends ColumnEncoder {
+
+		private BooleanEncoder(String name, List<?> values){
+			super(name, values);
+		}
+
+		@Override
+		public byte getType(){
+			return TYPE_BOOLEAN;
+		}
+
+		@Override
+		public int measurePayload(int position){
+			List<?> values = getValues();
+
+			return measureMask(position) + values.size();
+		}
+
+		@Override
+		public void writePayload(ByteBuffer buffer){
+			List<?> values = getValues();
+
+			writeMask(buffer);
+
+			for(Object value : values){
+				buffer.put((value != null && (Boolean)value) ? (byte)1 : (byte)0);
+			}
+		}
+	}
+
+	static
+	private class StringEncoder extends ColumnEncoder {
+
+		private Map<String, Integer> dictionary = new LinkedHashMap<>();
+
+		private int dictionarySize = 0;
+
+
+		private StringEncoder(String name, List<?> values){
+			super(name, values);
+
+			for(Object value : values){
+
+				if(value == null){
+					continue;
+				}
+
+				String string = (String)value;
+
+				if(!this.dictionary.containsKey(string)){
+					this.dictionary.put(string, this.dictionary.size());
+
+					this.dictionarySize += (4 + toBytes(string).length);
+				}
+			}
+		}
+
+		@Override
+		public byte getType(){
+			return TYPE_STRING;
+		}
+
+		@Override
+		public int measurePayload(int position){
+			List<?> values = getValues();
+
+			return pad(position + 4 + this.dictionarySize, 4) + (values.size() * 4);
+		}
+
+		@Override
+		public void writePayload(ByteBuffer buffer){
+			List<?> values = getValues();
+
+			buffer.putInt(this.dictionary.size());
+
+			for(String string : this.dictionary.keySet()){
+				byte[] bytes = toBytes(string);
+
+				buffer.putInt(bytes.length);
+				buffer.put(bytes);
+			}
+
+			writePadding(buffer, 4);
+
+			for(Object value : values){
+				buffer.putInt(value != null ? this.dictionary.get(value) : -1);
+			}
+		}
+	}
+
+	static
+	private class PickleEncoder extends ColumnEncoder {
+
+		private byte[] bytes = null;
+
+
+		private PickleEncoder(String name, List<?> values) throws IOException {
+			super(name, values);
+
+			Pickler pickler = new Pickler();
+
+			this.bytes = pickler.dumps(values);
+		}
+
+		@Override
+		public byte getType(){
+			return TYPE_PICKLE;
+		}
+
+		@Override
+		public int measurePayload(int position){
+			return position + 4 + this.bytes.length;
+		}
+
+		@Override
+		public void writePayload(ByteBuffer buffer){
+			buffer.putInt(this.bytes.length);
+			buffer.put(this.bytes);
+		}
+	}
+
+	static
+	private class DoubleList extends AbstractList<Double> implements RandomAccess {
+
+		private DoubleBuffer values = null;
+
+		private IntPredicate missing = null;
+
+
+		private DoubleList(DoubleBuffer values, IntPredicate missing){
+			this.values = values;
+			this.missing = missing;
+		}
+
+		@Override
+		public Double get(int index){
+
+			if(isMissing(this.missing, index)){
+				return null;
+			}
+
+			return this.values.get(index);
+		}
+
+		@Override
+		public int size(){
+			return this.values.limit();
+		}
+	}
+
+	static
+	private class LongList extends AbstractList<Long> implements RandomAccess {
+
+		private LongBuffer values = null;
+
+		private IntPredicate missing = null;
+
+
+		private LongList(LongBuffer values, IntPredicate missing){
+			this.values = values;
+			this.missing = missing;
+		}
+
+		@Override
+		public Long get(int index){
+
+			if(isMissing(this.missing, index)){
+				return null;
+			}
+
+			return this.values.get(index);
+		}
+
+		@Override
+		public int size(){
+			return this.values.limit();
+		}
+	}
+
+	static
+	private class BooleanList extends AbstractList<Boolean> implements RandomAccess {
+
+		private ByteBuffer values = null;
+
+		private IntPredicate missing = null;
+
+
+		private BooleanList(ByteBuffer values, IntPredicate missing){
+			this.values = values;
+			this.missing = missing;
+		}
+
+		@Override
+		public Boolean get(int index){
+
+			if(isMissing(this.missing, index)){
+				return null;
+			}
+
+			return (this.values.get(index) != 0);
+		}
+
+		@Override
+		public int size(){
+			return this.values.limit();
+		}
+	}
+
+	static
+	private class StringList extends AbstractList<String> implements RandomAccess {
+
+		private String[] dictionary = null;
+
+		private IntBuffer codes = null;
+
+
+		private StringList(String[] dictionary, IntBuffer codes){
+			this.dictionary = dictionary;
+			this.codes = codes;
+		}
+
+		@Override
+		public String get(int index){
+			int code = this.codes.get(index);
+
+			if(code < 0){
+				return null;
+			}
+
+			return this.dictionary[code];
+		}
+
+		@Override
+		public int size(){
+			return this.codes.limit();
+		}
+	}
+
+	public static final byte TYPE_DOUBLE = 1;
+	public static final byte TYPE_LONG = 2;
+	public static final byte TYPE_BOOLEAN = 3;
+	public static final byte TYPE_STRING = 4;
+	public static final byte TYPE_PICKLE = 5;
+}
@@ -0,0 +1,828 @@
+/*
+ * Copyright (c) 2026 Villu Ruusmann
+ *
+ * This file is part of JPMML-Evaluator
+ *
+ * JPMML-Evaluator is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Affero General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * JPMML-Evaluator is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU Affero General Public License for more details.
+ *
+ * You should have received a copy of the GNU Affero General Public License
+ * along with JPMML-Evaluator.  If not, see <http://www.gnu.org/licenses/>.
+ */
+package org.jpmml.evaluator.python;
+
+import java.io.BufferedInputStream;
+import java.io.BufferedOutputStream;
+import java.io.DataInputStream;
+import java.io.DataOutputStream;
+import java.io.EOFException;
+import java.io.IOException;
+import java.lang.reflect.Array;
+import java.lang.reflect.Constructor;
+import java.lang.reflect.Executable;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.lang.reflect.Modifier;
+import java.net.InetAddress;
+import java.net.InetSocketAddress;
+import java.net.ProtocolFamily;
+import java.net.SocketAddress;
+import java.net.StandardProtocolFamily;
+import java.net.StandardSocketOptions;
+import java.nio.channels.Channels;
+import java.nio.channels.ServerSocketChannel;
+import java.nio.channels.SocketChannel;
+import java.nio.file.Files;
+import java.nio.file.Path;
+import java.nio.file.Paths;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.attribute.PosixFilePermissions;
+import java.security.MessageDigest;
+import java.util.ArrayDeque;
+import java.util.Arrays;
+import java.util.Deque;
+import java.util.HashMap;
+import java.util.HashSet;
+import java.util.LinkedHashSet;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.ConcurrentMap;
+import java.util.concurrent.TimeUnit;
+import java.util.concurrent.atomic.AtomicInteger;
+import java.util.concurrent.atomic.AtomicLong;
+
+import net.razorvine.pickle.Pickler;
+import net.razorvine.pickle.Unpickler;
+
+/**
+ * <p>
+ * A scoring JVM that is shared by local Python processes.
+ * </p>
+ *
+ * <p>
+ * Clients connect over a Unix domain socket (or a loopback TCP socket).
+ * Every message is a frame, which consists of a 4-byte big-endian length followed by the payload.
+ * The first frame of every connection is the authentication token, which is answered with a status byte.
+ * A request payload is a pickled tuple <code>(opcode, released ids, target, name, arguments)</code>.
+ * A response payload is a status byte, followed by a pickled value, a pickled error, or raw bytes.
+ * </p>
+ *
+ * <p>
+ * Primitive values, strings, byte arrays and object arrays are passed by value.
+ * All other Java objects are passed by reference, as pickle persistent IDs.
+ * References are valid across connections, until they are released by the client.
+ * Exported objects (eg. evaluators) are shared by all clients, and live until they are unexported.
+ * </p>
+ *
+ * <p>
+ * Clients may only construct and invoke the members of permitted classes (JPMML classes, collections and basic I/O classes).
+ * </p>
+ *
+ * <p>
+ * Unix domain sockets are available in Java 16 and newer.
+ * In older Java versions, the server falls back to an ephemeral loopback TCP socket,
+ * and writes its address (<code>tcp:&lt;port&gt;</code>) to the socket path as a regular file.
+ * </p>
+ */
+public class IPCServer {
+
+	private byte[] token = null;
+
+	private ConcurrentMap<Long, Object> objects = new ConcurrentHashMap<>();
+
+	private ConcurrentMap<String, Object> exports = new ConcurrentHashMap<>();
+
+	private AtomicLong nextId = new AtomicLong(1L);
+
+	private AtomicInteger connections = new AtomicInteger(0);
+
+	private volatile long lastActive = System.nanoTime();
+
+
+	public IPCServer(byte[] token){
+		this.token = token;
+	}
+
+	public void serve(ServerSocketChannel serverChannel, boolean tcp, long idleTimeout) throws IOException {
+
+		if(idleTimeout > 0){
+			Thread watchdog = new Thread(() -> watch(idleTimeout), "jpmml-evaluator-ipc-watchdog");
+			watchdog.setDaemon(true);
+			watchdog.start();
+		}
+
+		AtomicInteger threadCount = new AtomicInteger(0);
+
+		while(true){
+			SocketChannel channel = serverChannel.accept();
+
+			if(tcp){
+				channel.setOption(StandardSocketOptions.TCP_NODELAY, true);
+			}
+
+			this.connections.incrementAndGet();
+
+			Thread thread = new Thread(() -> handle(channel), "jpmml-evaluator-ipc-" + threadCount.incrementAndGet());
+			thread.setDaemon(true);
+			thread.start();
+		}
+	}
+
+	private void watch(long idleTimeout){
+
+		while(true){
+
+			try {
+				Thread.sleep(1000L);
+			} catch(InterruptedException ie){
+				return;
+			}
+
+			if(this.connections.get() == 0 && (System.nanoTime() - this.lastActive) > TimeUnit.SECONDS.toNanos(idleTimeout)){
+				System.exit(0);
+			}
+		}
+	}
+
+	private void handle(SocketChannel channel){
+
+		try(DataInputStream is = new DataInputStream(new BufferedInputStream(Channels.newInputStream(channel), 64 * 1024));
+			DataOutputStream os = new DataOutputStream(new BufferedOutputStream(Channels.newOutputStream(channel), 64 * 1024))){
+
+			if(!authenticate(is, os)){
+				return;
+			}
+
+			while(true){
+				int length;
+
+				try {
+					length = is.readInt();
+				} catch(EOFException eofe){
+					break;
+				}
+
+				byte[] request = new byte[length];
+
+				is.readFully(request);
+
+				byte status;
+				byte[] payload;
+
+				try {
+					Object result = execute(request);
+
+					// Large results (eg. pickled or columnar tables) are sent as-is
+					if(result instanceof byte[]){
+						status = IPCServer.STATUS_BYTES;
+						payload = (byte[])result;
+					} else
+
+					{
+						status = IPCServer.STATUS_VALUE;
+						payload = pickle(result);
+					}
+				} catch(Exception | LinkageError e){
+					status = IPCServer.STATUS_ERROR;
+					payload = pickle(formatError(e));
+				}
+
+				os.writeInt(payload.length + 1);
+				os.writeByte(status);
+				os.write(payload);
+				os.flush();
+			}
+		} catch(IOException ioe){
+			// Ignored
+		} finally {
+			this.lastActive = System.nanoTime();
+
+			this.connections.decrementAndGet();
+		}
+	}
+
+	private boolean authenticate(DataInputStream is, DataOutputStream os) throws IOException {
+		int length = is.readInt();
+
+		if(length < 0 || length > IPCServer.MAX_TOKEN_LENGTH){
+			return false;
+		}
+
+		byte[] token = new byte[length];
+
+		is.readFully(token);
+
+		boolean success = MessageDigest.isEqual(this.token, token);
+
+		os.writeInt(1);
+		os.writeByte(success ? IPCServer.STATUS_VALUE : IPCServer.STATUS_ERROR);
+		os.flush();
+
+		return success;
+	}
+
+	private Object execute(byte[] request) throws Exception {
+		Unpickler unpickler = new Unpickler(){
+
+			@Override
+			protected Object persistentLoad(Object pid){
+				return getObject(pid);
+			}
+		};
+
+		Object[] tuple = (Object[])unpickler.loads(request);
+
+		int opcode = ((Number)tuple[0]).intValue();
+
+		List<?> releasedIds = (List<?>)tuple[1];
+		for(Object releasedId : releasedIds){
+			this.objects.remove(((Number)releasedId).longValue());
+		}
+
+		Object target = tuple[2];
+		Object name = tuple[3];
+		Object[] args = (Object[])tuple[4];
+
+		switch(opcode){
+			case IPCServer.OP_NEW:
+				return newObject(loadClass((String)target), args);
+			case IPCServer.OP_STATIC:
+				return invoke(loadClass((String)target), null, (String)name, args);
+			case IPCServer.OP_CALL:
+				return invoke(target.getClass(), target, (String)name, args);
+			case IPCServer.OP_LOOKUP:
+				return this.exports.get((String)target);
+			case IPCServer.OP_EXPORT:
+				{
+					Object prevObject = this.exports.putIfAbsent((String)target, name);
+
+					return (prevObject != null ? prevObject : name);
+				}
+			case IPCServer.OP_UNEXPORT:
+				return (this.exports.remove((String)target) != null);
+			default:
+				throw new IllegalArgumentException("Opcode " + opcode + " is not supported");
+		}
+	}
+
+	private Object getObject(Object id){
+		Object object = this.objects.get(((Number)id).longValue());
+
+		if(object == null){
+			throw new IllegalArgumentException("Object " + id + " is not registered");
+		}
+
+		return object;
+	}
+
+	private byte[] pickle(Object object) throws IOException {
+		Pickler pickler = new Pickler(){
+
+			@Override
+			protected Object persistentId(Object value){
+
+				if(isValue(value)){
+					return null;
+				}
+
+				Long id = IPCServer.this.nextId.getAndIncrement();
+
+				IPCServer.this.objects.put(id, value);
+
+				return id;
+			}
+		};
+
+		return pickler.dumps(object);
+	}
+
+	static
+	public void main(String... args) throws Exception {
+
+		if(args.length < 1 || args.length > 2){
+			System.err.println("Usage: java " + IPCServer.class.getName() + " <socket path or tcp:port> [<idle timeout in seconds>]");
+
+			System.exit(2);
+		}
+
+		String address = args[0];
+		long idleTimeout = (args.length > 1 ? Long.parseLong(args[1]) : 0L);
+
+		// The token is passed in the environment, because command-line arguments are visible to other users
+		String token = System.getenv(IPCServer.TOKEN_VARIABLE);
+		if(token == null || token.isEmpty()){
+			System.err.println("The " + IPCServer.TOKEN_VARIABLE + " environment variable is not set");
+
+			System.exit(2);
+		}
+
+		ServerSocketChannel serverChannel;
+
+		boolean tcp = address.startsWith("tcp:");
+		if(tcp){
+			serverChannel = openTcpServerChannel(Integer.parseInt(address.substring("tcp:".length())));
+
+			address = "tcp:" + ((InetSocketAddress)serverChannel.getLocalAddress()).getPort();
+		} else
+
+		{
+			Path path = Paths.get(address);
+
+			serverChannel = openUnixServerChannel(path);
+
+			// Fall back to an ephemeral loopback TCP socket, and advertise its port in place of the socket
+			if(serverChannel == null){
+				tcp = true;
+
+				serverChannel = openTcpServerChannel(0);
+
+				address = "tcp:" + ((InetSocketAddress)serverChannel.getLocalAddress()).getPort();
+
+				Files.write(path, address.getBytes(StandardCharsets.UTF_8));
+			}
+
+			setOwnerOnly(path);
+
+			path.toFile().deleteOnExit();
+		}
+
+		// Signal readiness to the launching process
+		System.out.println(address);
+		System.out.flush();
+
+		IPCServer server = new IPCServer(token.getBytes(StandardCharsets.UTF_8));
+		server.serve(serverChannel, tcp, idleTimeout);
+	}
+
+	static
+	private ServerSocketChannel openTcpServerChannel(int port) throws IOException {
+		ServerSocketChannel serverChannel = ServerSocketChannel.open();
+		serverChannel.bind(new InetSocketAddress(InetAddress.getLoopbackAddress(), port));
+
+		return serverChannel;
+	}
+
+	/**
+	 * @return A server channel, or <code>null</code> if Unix domain sockets are not supported.
+	 */
+	static
+	private ServerSocketChannel openUnixServerChannel(Path path) throws IOException {
+		Files.deleteIfExists(path);
+
+		SocketAddress address;
+		ProtocolFamily protocolFamily;
+
+		// Unix domain socket channels are available in Java 16 and newer
+		try {
+			Class<?> addressClazz = Class.forName("java.net.UnixDomainSocketAddress");
+
+			address = (SocketAddress)addressClazz.getMethod("of", Path.class).invoke(null, path);
+			protocolFamily = StandardProtocolFamily.valueOf("UNIX");
+		} catch(ReflectiveOperationException | IllegalArgumentException e){
+			return null;
+		}
+
+		ServerSocketChannel serverChannel;
+
+		try {
+			serverChannel = (ServerSocketChannel)ServerSocketChannel.class.getMethod("open", ProtocolFamily.class).invoke(null, protocolFamily);
+		} catch(InvocationTargetException ite){
+			Throwable cause = ite.getCause();
+
+			if(cause instanceof UnsupportedOperationException){
+				return null;
+			}
+
+			throw new IOException(cause);
+		} catch(ReflectiveOperationException roe){
+			return null;
+		}
+
+		serverChannel.bind(address);
+
+		return serverChannel;
+	}
+
+	static
+	private void setOwnerOnly(Path path) throws IOException {
+
+		try {
+			Files.setPosixFilePermissions(path, PosixFilePermissions.fromString("rw-------"));
+		} catch(UnsupportedOperationException uoe){
+			// Ignored
+		}
+	}
+
+	static
+	private Class<?> loadClass(String className) throws ClassNotFoundException {
+
+		// Prevents the initialization of arbitrary classes
+		if(!isPermitted(className, null)){
+			throw new SecurityException("Class " + className + " is not permitted");
+		}
+
+		return Class.forName(className);
+	}
+
+	static
+	private void checkPermitted(Executable executable){
+		String className = (executable.getDeclaringClass()).getName();
+		String memberName = (executable instanceof Constructor ? IPCServer.CONSTRUCTOR_NAME : executable.getName());
+
+		if(!isPermitted(className, memberName)){
+			throw new SecurityException("Member " + className + "." + memberName + " is not permitted");
+		}
+	}
+
+	/**
+	 * @param memberName The name of a method or {@link #CONSTRUCTOR_NAME}. If <code>null</code>, any member.
+	 */
+	static
+	private boolean isPermitted(String className, String memberName){
+
+		for(String packagePrefix : IPCServer.permittedPackagePrefixes){
+
+			if(className.startsWith(packagePrefix)){
+				return true;
+			}
+		}
+
+		int index = className.lastIndexOf('.');
+		if(index > 0 && IPCServer.permittedPackages.contains(className.substring(0, index))){
+			return true;
+		} // End if
+
+		if(!IPCServer.permittedMembers.containsKey(className)){
+			return false;
+		}
+
+		Set<String> memberNames = IPCServer.permittedMembers.get(className);
+
+		return (memberNames == null || memberName == null || memberNames.contains(memberName));
+	}
+
+	static
+	private Object newObject(Class<?> clazz, Object[] args) throws Exception {
+		Constructor<?>[] constructors = clazz.getConstructors();
+
+		Object[] javaArgs = new Object[args.length];
+
+		Constructor<?> constructor = (Constructor<?>)select(constructors, args, javaArgs);
+		if(constructor == null){
+			throw new IllegalArgumentException("Class " + clazz.getName() + " does not have a public constructor for " + formatTypes(args));
+		}
+
+		checkPermitted(constructor);
+
+		try {
+			return constructor.newInstance(javaArgs);
+		} catch(InvocationTargetException ite){
+			throw unwrap(ite);
+		}
+	}
+
+	static
+	private Object invoke(Class<?> clazz, Object target, String name, Object[] args) throws Exception {
+		Method[] methods = Arrays.stream(clazz.getMethods())
+			.filter(candidate -> (candidate.getName()).equals(name) && (target != null || Modifier.isStatic(candidate.getModifiers())))
+			.toArray(Method[]::new);
+
+		Object[] javaArgs = new Object[args.length];
+
+		Method method = (Method)select(methods, args, javaArgs);
+		if(method == null){
+			throw new IllegalArgumentException("Class " + clazz.getName() + " does not have a public method " + name + " for " + formatTypes(args));
+		}
+
+		method = ensureAccessible(method);
+
+		checkPermitted(method);
+
+		try {
+			return method.invoke(target, javaArgs);
+		} catch(InvocationTargetException ite){
+			throw unwrap(ite);
+		}
+	}
+
+	/**
+	 * <p>
+	 * Selects the overload that requires the least conversions.
+	 * </p>
+	 */
+	static
+	private Executable select(Executable[] executables, Object[] args, Object[] javaArgs){
+		Executable result = null;
+
+		int resultCost = Integer.MAX_VALUE;
+
+		Object[] convertedArgs = new Object[args.length];
+
+		for(Executable executable : executables){
+			Class<?>[] parameterTypes = executable.getParameterTypes();
+
+			if(parameterTypes.length != args.length){
+				continue;
+			}
+
+			int cost = 0;
+
+			for(int i = 0; i < args.length && cost < resultCost; i++){
+				Conversion conversion = convert(args[i], parameterTypes[i]);
+
+				if(conversion == null){
+					cost = Integer.MAX_VALUE;
+
+					break;
+				}
+
+				convertedArgs[i] = conversion.value;
+
+				cost += conversion.cost;
+			}
+
+			if(cost < resultCost){
+				result = executable;
+				resultCost = cost;
+
+				System.arraycopy(convertedArgs, 0, javaArgs, 0, args.length);
+			}
+		}
+
+		return result;
+	}
+
+	static
+	private Conversion convert(Object value, Class<?> type){
+
+		if(value == null){
+			return (type.isPrimitive() ? null : new Conversion(null, 1));
+		} // End if
+
+		if(type.isPrimitive()){
+			type = IPCServer.primitiveWrappers.get(type);
+		} // End if
+
+		if(type.isInstance(value)){
+			return new Conversion(value, 0);
+		} // End if
+
+		if(value instanceof Number){
+			Number number = (Number)value;
+
+			boolean integral = (value instanceof Integer || value instanceof Long || value instanceof Short || value instanceof Byte);
+
+			if(type.equals(Double.class)){
+				return new Conversion(number.doubleValue(), 1);
+			} else
+
+			if(type.equals(Float.class)){
+				return new Conversion(number.floatValue(), 1);
+			} else
+
+			if(type.equals(Long.class) && integral){
+				return new Conversion(number.longValue(), 1);
+			} else
+
+			if(type.equals(Integer.class) && integral && number.longValue() == number.intValue()){
+				return new Conversion(number.intValue(), 1);
+			} else
+
+			if(type.equals(Short.class) && integral && number.longValue() == number.shortValue()){
+				return new Conversion(number.shortValue(), 1);
+			} else
+
+			if(type.equals(Byte.class) && integral && number.longValue() == number.byteValue()){
+				return new Conversion(number.byteValue(), 1);
+			}
+
+			return null;
+		} // End if
+
+		if(type.equals(Character.class) && value instanceof String && ((String)value).length() == 1){
+			return new Conversion(((String)value).charAt(0), 1);
+		} // End if
+
+		// Python lists and tuples are unpickled as lists and object arrays, respectively
+		List<?> values = null;
+
+		if(value instanceof List){
+			values = (List<?>)value;
+		} else
+
+		if(value instanceof Object[]){
+			values = Arrays.asList((Object[])value);
+		} // End if
+
+		if(values != null){
+
+			if(type.isArray()){
+				Class<?> componentType = type.getComponentType();
+
+				Object array = Array.newInstance(componentType, values.size());
+
+				for(int i = 0; i < values.size(); i++){
+					Conversion conversion = convert(values.get(i), componentType);
+
+					if(conversion == null){
+						return null;
+					}
+
+					Array.set(array, i, conversion.value);
+				}
+
+				return new Conversion(array, 2);
+			} else
+
+			if(type.isAssignableFrom(List.class)){
+				return new Conversion(values, 2);
+			} else
+
+			if(type.isAssignableFrom(LinkedHashSet.class)){
+				return new Conversion(new LinkedHashSet<>(values), 2);
+			}
+		}
+
+		return null;
+	}
+
+	/**
+	 * <p>
+	 * Finds the same method in a public supertype, if the declaring class is not public
+	 * (eg. the method of an anonymous or private collection class).
+	 * </p>
+	 */
+	static
+	private Method ensureAccessible(Method method){
+		Class<?> declaringClazz = method.getDeclaringClass();
+
+		if(Modifier.isPublic(declaringClazz.getModifiers())){
+			return method;
+		}
+
+		Deque<Class<?>> clazzes = new ArrayDeque<>();
+		clazzes.add(declaringClazz);
+
+		Set<Class<?>> visitedClazzes = new HashSet<>();
+
+		while(!clazzes.isEmpty()){
+			Class<?> clazz = clazzes.removeFirst();
+
+			if(!visitedClazzes.add(clazz)){
+				continue;
+			} // End if
+
+			if(Modifier.isPublic(clazz.getModifiers())){
+
+				try {
+					return clazz.getMethod(method.getName(), method.getParameterTypes());
+				} catch(NoSuchMethodException nsme){
+					// Ignored
+				}
+			}
+
+			Class<?> superClazz = clazz.getSuperclass();
+			if(superClazz != null){
+				clazzes.add(superClazz);
+			}
+
+			clazzes.addAll(Arrays.asList(clazz.getInterfaces()));
+		}
+
+		return method;
+	}
+
+	static
+	private Exception unwrap(InvocationTargetException ite){
+		Throwable cause = ite.getCause();
+
+		if(cause instanceof Exception){
+			return (Exception)cause;
+		}
+
+		return ite;
+	}
+
+	static
+	private Object[] formatError(Throwable throwable){
+		String[] stackTrace = Arrays.stream(throwable.getStackTrace())
+			.map(StackTraceElement::toString)
+			.toArray(String[]::new);
+
+		return new Object[]{(throwable.getClass()).getName(), throwable.getMessage(), stackTrace};
+	}
+
+	static
+	private String formatTypes(Object[] args){
+		return Arrays.toString(Arrays.stream(args)
+			.map(arg -> (arg != null ? (arg.getClass()).getName() : null))
+			.toArray(String[]::new));
+	}
+
+	static
+	private boolean isValue(Object object){
+
+		if(object == null){
+			return true;
+		}
+
+		Class<?> clazz = object.getClass();
+
+		if(clazz.isArray()){
+			return true;
+		}
+
+		return (object instanceof String) || (object instanceof Boolean) || (object instanceof Character) || IPCServer.primitiveWrappers.containsValue(clazz);
+	}
+
+	static
+	private class Conversion {
+
+		private Object value = null;
+
+		private int cost = 0;
+
+
+		private Conversion(Object value, int cost){
+			this.value = value;
+			this.cost = cost;
+		}
+	}
+
+	private static final Map<Class<?>, Class<?>> primitiveWrappers = new HashMap<>();
+
+	private static final List<String> permittedPackagePrefixes = Arrays.asList("org.dmg.pmml.", "org.jpmml.");
+
+	private static final Set<String> permittedPackages = new HashSet<>(Arrays.asList("java.util"));
+
+	/**
+	 * Permitted classes, mapped to permitted member names (or <code>null</code> for all members).
+	 */
+	private static final Map<String, Set<String>> permittedMembers = new HashMap<>();
+
+	static {
+		primitiveWrappers.put(boolean.class, Boolean.class);
+		primitiveWrappers.put(byte.class, Byte.class);
+		primitiveWrappers.put(char.class, Character.class);
+		primitiveWrappers.put(short.class, Short.class);
+		primitiveWrappers.put(int.class, Integer.class);
+		primitiveWrappers.put(long.class, Long.class);
+		primitiveWrappers.put(float.class, Float.class);
+		primitiveWrappers.put(double.class, Double.class);
+	}
+
+	static {
+		List<String> valueClassNames = Arrays.asList(
+			"java.lang.Object", "java.lang.Iterable", "java.lang.Comparable", "java.lang.CharSequence", "java.lang.Enum", "java.lang.String",
+			"java.lang.Boolean", "java.lang.Character", "java.lang.Number", "java.lang.Byte", "java.lang.Short", "java.lang.Integer", "java.lang.Long", "java.lang.Float", "java.lang.Double",
+			"java.math.BigInteger", "java.math.BigDecimal"
+		);
+
+		for(String valueClassName : valueClassNames){
+			permittedMembers.put(valueClassName, null);
+		}
+
+		List<String> streamClassNames = Arrays.asList(
+			"java.lang.AutoCloseable", "java.io.Closeable", "java.io.Flushable",
+			"java.io.InputStream", "java.io.FilterInputStream", "java.io.BufferedInputStream", "java.io.ByteArrayInputStream", "java.io.FileInputStream",
+			"java.io.OutputStream", "java.io.FilterOutputStream", "java.io.BufferedOutputStream", "java.io.ByteArrayOutputStream", "java.io.FileOutputStream"
+		);
+
+		for(String streamClassName : streamClassNames){
+			permittedMembers.put(streamClassName, new HashSet<>(Arrays.asList(IPCServer.CONSTRUCTOR_NAME, "close", "flush", "toByteArray")));
+		}
+
+		permittedMembers.put("java.io.File", new HashSet<>(Arrays.asList(IPCServer.CONSTRUCTOR_NAME, "getName", "getPath", "toURI")));
+		permittedMembers.put("java.net.URI", new HashSet<>(Arrays.asList("toURL")));
+		permittedMembers.put("java.lang.Class", new HashSet<>(Arrays.asList("forName", "getName", "getSimpleName", "isAssignableFrom", "isInstance")));
+		permittedMembers.put("java.lang.System", new HashSet<>(Arrays.asList("getProperty", "identityHashCode")));
+		permittedMembers.put("java.lang.Thread", new HashSet<>(Arrays.asList("sleep")));
+		permittedMembers.put("java.lang.ProcessHandle", new HashSet<>(Arrays.asList("current", "pid")));
+	}
+
+	public static final int OP_NEW = 0;
+	public static final int OP_STATIC = 1;
+	public static final int OP_CALL = 2;
+	public static final int OP_LOOKUP = 3;
+	public static final int OP_EXPORT = 4;
+	public static final int OP_UNEXPORT = 5;
+
+	public static final byte STATUS_VALUE = 0;
+	public static final byte STATUS_ERROR = 1;
+	public static final byte STATUS_BYTES = 2;
+
+	public static final String CONSTRUCTOR_NAME = "<init>";
+
+	public static final String TOKEN_VARIABLE = "JPMML_EVALUATOR_IPC_TOKEN";
+
+	private static final int MAX_TOKEN_LENGTH = 1024;
+}
@@ -0,0 +1,245 @@
+/*
+ * Copyright (c) 2026 Villu Ruusmann
+ *
+ * This file is part of JPMML-Evaluator
+ *
+ * JPMML-Evaluator is free software: you can redistribute it and/or modify
+ * it under the terms of the GNU Affero General Public License as published by
+ * the Free Software Foundation, either version 3 of the License, or
+ * (at your option) any later version.
+ *
+ * JPMML-Evaluator is distributed in the hope that it will be useful,
+ * but WITHOUT ANY WARRANTY; without even the implied warranty of
+ * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+ * GNU Affero General Public License for more details.
+ *
+ * You should have received a copy of the GNU Affero General Public License
+ * along with JPMML-Evaluator.  If not, see <http://www.gnu.org/licenses/>.
+ */
+package org.jpmml.evaluator.python;
+
+import java.io.IOException;
+import java.util.AbstractMap;
+import java.util.Arrays;
+import java.util.HashMap;
+import java.util.LinkedHashMap;
+import java.util.List;
+import java.util.Map;
+import java.util.Set;
+import java.util.stream.Collectors;
+import java.util.stream.Stream;
+
+import net.razorvine.pickle.Pickler;
+import net.razorvine.pickle.Unpickler;
+import org.jpmml.evaluator.Evaluator;
+import org.jpmml.evaluator.EvaluatorUtil;
+import org.jpmml.evaluator.ModelField;
+
+/**
+ * <p>
+ * An evaluator for positional argument records.
+ * </p>
+ *
+ * <p>
+ * Input and result fields are resolved once, when the prepared evaluator is created.
+ * Arguments are passed as a list of values in input field order,
+ * and results are returned as an array of values in result field order.
+ * </p>
+ */
+public class PreparedEvaluator {
+
+	private Evaluator evaluator = null;
+
+	private String[] inputNames = null;
+
+	private String[] resultNames = null;
+
+	private boolean nanAsMissing = true;
+
+	private Map<String, Integer> inputPositions = null;
+
+
+	public PreparedEvaluator(Evaluator evaluator, String[] inputNames, String[] resultNames, boolean nanAsMissing){
+		setEvaluator(evaluator);
+		setInputNames(inputNames);
+		setResultNames(resultNames);
+		setNanAsMissing(nanAsMissing);
+
+		Set<String> validInputNames = (evaluator.getInputFields()).stream()
+			.map(ModelField::getName)
+			.collect(Collectors.toSet());
+
+		Map<String, Integer> inputPositions = new HashMap<>(2 * inputNames.length);
+
+		for(int i = 0; i < inputNames.length; i++){
+			String inputName = inputNames[i];
+
+			if(!validInputNames.contains(inputName)){
+				throw new IllegalArgumentException("Input field \"" + inputName + "\" is not defined");
+			} // End if
+
+			if(inputPositions.put(inputName, i) != null){
+				throw new IllegalArgumentException("Input field \"" + inputName + "\" is duplicated");
+			}
+		}
+
+		this.inputPositions = inputPositions;
+
+		Set<String> validResultNames = Stream.concat(
+				(evaluator.getTargetFields()).stream(),
+				(evaluator.getOutputFields()).stream()
+			)
+			.map(ModelField::getName)
+			.collect(Collectors.toSet());
+
+		for(String resultName : resultNames){
+
+			if(!validResultNames.contains(resultName)){
+				throw new IllegalArgumentException("Result field \"" + resultName + "\" is not defined");
+			}
+		}
+	}
+
+	public byte[] evaluate(byte[] tupleBytes) throws IOException {
+		Unpickler unpickler = new Unpickler();
+
+		Object values = unpickler.loads(tupleBytes);
+
+		Object[] results;
+
+		// Python tuples are unpickled as arrays, Python lists as lists
+		if(values instanceof Object[]){
+			results = evaluate(Arrays.asList((Object[])values));
+		} else
+
+		if(values instanceof List){
+			results = evaluate((List<?>)values);
+		} else
+
+		{
+			throw new IllegalArgumentException("Expected a tuple or a list, got " + (values != null ? (values.getClass()).getName() : null));
+		}
+
+		Pickler pickler = new Pickler();
+
+		return pickler.dumps(results);
+	}
+
+	public Object[] evaluate(List<?> values){
+		Evaluator evaluator = getEvaluator();
+		String[] inputNames = getInputNames();
+		String[] resultNames = getResultNames();
+		boolean nanAsMissing = getNanAsMissing();
+
+		if(values.size() != inputNames.length){
+			throw new IllegalArgumentException("Expected " + inputNames.length + " values, got " + values.size());
+		}
+
+		Object[] javaValues = new Object[inputNames.length];
+
+		for(int i = 0; i < inputNames.length; i++){
+			javaValues[i] = PythonEvaluatorUtil.toJavaPrimitive(values.get(i), nanAsMissing);
+		}
+
+		Map<String, ?> arguments = new PositionalMap(this.inputPositions, javaValues);
+
+		Map<String, ?> pmmlResults = evaluator.evaluate(arguments);
+
+		Object[] results = new Object[resultNames.length];
+
+		for(int i = 0; i < resultNames.length; i++){
+			results[i] = EvaluatorUtil.decode(pmmlResults.get(resultNames[i]));
+		}
+
+		return results;
+	}
+
+	public Evaluator getEvaluator(){
+		return this.evaluator;
+	}
+
+	private void setEvaluator(Evaluator evaluator){
+
+		if(evaluator == null){
+			throw new IllegalArgumentException();
+		}
+
+		this.evaluator = evaluator;
+	}
+
+	public String[] getInputNames(){
+		return this.inputNames;
+	}
+
+	private void setInputNames(String[] inputNames){
+
+		if(inputNames == null){
+			throw new IllegalArgumentException();
+		}
+
+		this.inputNames = inputNames;
+	}
+
+	public String[] getResultNames(){
+		return this.resultNames;
+	}
+
+	private void setResultNames(String[] resultNames){
+
+		if(resultNames == null){
+			throw new IllegalArgumentException();
+		}
+
+		this.resultNames = resultNames;
+	}
+
+	public boolean getNanAsMissing(){
+		return this.nanAsMissing;
+	}
+
+	private void setNanAsMissing(boolean nanAsMissing){
+		this.nanAsMissing = nanAsMissing;
+	}
+
+	static
+	private class PositionalMap extends AbstractMap<String, Object> {
+
+		private Map<String, Integer> positions = null;
+
+		private Object[] values = null;
+
+
+		private PositionalMap(Map<String, Integer> positions, Object[] values){
+			this.positions = positions;
+			this.values = values;
+		}
+
+		@Override
+		public Object get(Object key){
+			Integer position = this.positions.get(key);
+
+			if(position == null){
+				return null;
+			}
+
+			return this.values[position];
+		}
+
+		@Override
+		public boolean containsKey(Object key){
+			return this.positions.containsKey(key);
+		}
+
+		@Override
+		public Set<Entry<String, Object>> entrySet(){
+			Map<String, Object> result = new LinkedHashMap<>();
+
+			Set<Entry<String, Integer>> entries = this.positions.entrySet();
+			for(Entry<String, Integer> entry : entries){
+				result.put(entry.getKey(), this.values[entry.getValue()]);
+			}
+
+			return result.entrySet();
+		}
+	}
+}
@@ -19,22 +19,38 @@
 package org.jpmml.evaluator.python;
 
 import java.io.IOException;
+import java.nio.Buffer;
+import java.nio.ByteBuffer;
+import java.nio.DoubleBuffer;
+import java.nio.LongBuffer;
+import java.nio.file.Paths;
 import java.util.AbstractMap;
 import java.util.ArrayList;
 import java.util.Arrays;
+import java.util.Collection;
 import java.util.Collections;
 import java.util.HashMap;
 import java.util.HashSet;
+import java.util.Iterator;
+import java.util.LinkedHashMap;
 import java.util.List;
 import java.util.Map;
 import java.util.Set;
+import java.util.concurrent.ConcurrentHashMap;
+import java.util.concurrent.ConcurrentMap;
 import java.util.concurrent.ForkJoinPool;
 import java.util.concurrent.ForkJoinTask;
 import java.util.function.Function;
 import java.util.stream.Collectors;
 import java.util.stream.Stream;
+import java.util.stream.StreamSupport;
 
 import com.google.common.collect.Maps;
+import com.google.common.collect.Range;
+import com.google.common.collect.RangeSet;
+import de.siegmar.fastcsv.reader.CsvReader;
+import de.siegmar.fastcsv.reader.CsvRecord;
+import de.siegmar.fastcsv.writer.CsvWriter;
 import net.razorvine.pickle.Pickler;
 import net.razorvine.pickle.Unpickler;
 import net.razorvine.pickle.objects.ClassDict;
@@ -43,6 +59,7 @@ import numpy.core.ScalarUtil;
 import org.jpmml.evaluator.Evaluator;
 import org.jpmml.evaluator.EvaluatorFunction;
 import org.jpmml.evaluator.EvaluatorUtil;
+import org.jpmml.evaluator.InputField;
 import org.jpmml.evaluator.ResultField;
 import org.jpmml.evaluator.ResultTableCollector;
 import org.jpmml.evaluator.Table;
@@ -55,23 +72,23 @@ public class PythonEvaluatorUtil {
 	}
 
 	static
-	public byte[] evaluate(Evaluator evaluator, byte[] dictBytes, String[] dropColumns) throws IOException {
+	public byte[] evaluate(Evaluator evaluator, byte[] dictBytes, boolean nanAsMissing, String[] dropColumns) throws IOException {
 		Map<String, ?> arguments = (Map)unpickle(dictBytes);
 
-		Map<String, ?> results = evaluate(evaluator, arguments, dropColumns != null ? toSet(dropColumns) : null);
+		Map<String, ?> results = evaluate(evaluator, arguments, nanAsMissing, dropColumns != null ? toSet(dropColumns) : null);
 
 		return pickle(results);
 	}
 
 	static
-	public Map<String, ?> evaluate(Evaluator evaluator, Map<String, ?> arguments, Set<String> dropColumns){
+	public Map<String, ?> evaluate(Evaluator evaluator, Map<String, ?> arguments, boolean nanAsMissing, Set<String> dropColumns){
 		Map<String, Object> pmmlArguments = new AbstractMap<String, Object>(){
 
 			@Override
 			public Object get(Object key){
 				Object value = arguments.get(key);
 
-				return toJavaPrimitive(value);
+				return toJavaPrimitive(value, nanAsMissing);
 			}
 
 			@Override
@@ -80,7 +97,7 @@ public class PythonEvaluatorUtil {
 
 					@Override
 					public Object transformEntry(String key, Object value){
-						return toJavaPrimitive(value);
+						return toJavaPrimitive(value, nanAsMissing);
 					}
 				};
 
@@ -92,28 +109,244 @@ public class PythonEvaluatorUtil {
 
 		Map<String, ?> pmmlResults = (evaluator != null ? evaluator.evaluate(pmmlArguments) : pmmlArguments);
 
-		Map<String, ?> results = EvaluatorUtil.decodeAll(pmmlResults);
+		if(dropColumns == null){
+			return EvaluatorUtil.decodeAll(pmmlResults);
+		}
+
+		// Decode only the selected results
+		Map<String, Object> results = new LinkedHashMap<>(2 * pmmlResults.size());
 
-		if(dropColumns != null){
-			(results.keySet()).removeAll(dropColumns);
+		Collection<? extends Map.Entry<String, ?>> entries = pmmlResults.entrySet();
+		for(Map.Entry<String, ?> entry : entries){
+			String key = entry.getKey();
+
+			if(dropColumns.contains(key)){
+				continue;
+			}
+
+			results.put(key, EvaluatorUtil.decode(entry.getValue()));
 		}
 
 		return results;
 	}
 
 	static
-	public byte[] evaluateAll(Evaluator evaluator, byte[] dictBytes, String[] dropColumns, int parallelism) throws IOException {
+	public byte[] evaluateAll(Evaluator evaluator, byte[] dictBytes, boolean nanAsMissing, String[] dropColumns, int parallelism) throws IOException {
 		Map<String, ?> argumentsDict = (Map)unpickle(dictBytes);
 
-		Map<String, ?> resultsDict = evaluateAll(evaluator, argumentsDict, (dropColumns != null ? toSet(dropColumns) : null), parallelism);
+		Map<String, ?> resultsDict = evaluateAll(evaluator, argumentsDict, nanAsMissing, (dropColumns != null ? toSet(dropColumns) : null), parallelism);
 
 		return pickle(resultsDict);
 	}
 
 	static
-	public Map<String, ?> evaluateAll(Evaluator evaluator, Map<String, ?> argumentsDict, Set<String> dropColumns, int parallelism){
-		Table argumentsTable = parseDict(argumentsDict);
+	public Map<String, ?> evaluateAll(Evaluator evaluator, Map<String, ?> argumentsDict, boolean nanAsMissing, Set<String> dropColumns, int parallelism){
+		Table argumentsTable = parseDict(argumentsDict, nanAsMissing);
+
+		Table resultsTable = evaluateAll(evaluator, argumentsTable, dropColumns, parallelism);
+
+		return formatDict(resultsTable);
+	}
+
+	static
+	public byte[] evaluateRecords(Evaluator evaluator, byte[] listBytes, boolean nanAsMissing, String[] dropColumns, int parallelism) throws IOException {
+		List<? extends Map<String, ?>> records = (List)unpickle(listBytes);
+
+		Map<String, ?> resultsDict = evaluateRecords(evaluator, records, nanAsMissing, (dropColumns != null ? toSet(dropColumns) : null), parallelism);
+
+		return pickle(resultsDict);
+	}
+
+	/**
+	 * <p>
+	 * Evaluates a list of argument records.
+	 * </p>
+	 *
+	 * <p>
+	 * A failed record does not fail the whole list.
+	 * </p>
+	 *
+	 * @return A dict with two equally sized lists.
+	 * The <code>results</code> list holds result records, or <code>null</code> for failed records.
+	 * The <code>errors</code> list holds exception class name and message pairs, or <code>null</code> for succeeded records.
+	 */
+	static
+	public Map<String, ?> evaluateRecords(Evaluator evaluator, List<? extends Map<String, ?>> records, boolean nanAsMissing, Set<String> dropColumns, int parallelism){
+		Function<Map<String, ?>, Object> function = (arguments) -> {
+
+			try {
+				return evaluate(evaluator, arguments, nanAsMissing, dropColumns);
+			} catch(Exception e){
+				return e;
+			}
+		};
+
+		List<Object> values;
+
+		if(parallelism == 1){
+			values = records.stream()
+				.map(function)
+				.collect(Collectors.toList());
+		} else
+
+		{
+			ForkJoinPool forkJoinPool = getForkJoinPool(parallelism);
+
+			int batchSize = PythonEvaluatorUtil.batchSize;
+
+			if(forkJoinPool == null){
+				values = collect(records, function, batchSize);
+			} else
+
+			{
+				ForkJoinTask<List<Object>> forkJoinTask = ForkJoinTask.adapt(() -> {
+					return collect(records, function, batchSize);
+				});
+
+				values = forkJoinPool.invoke(forkJoinTask);
+			}
+		}
+
+		List<Object> results = new ArrayList<>(values.size());
+		List<Object> errors = new ArrayList<>(values.size());
+
+		for(Object value : values){
+
+			if(value instanceof Exception){
+				Exception exception = (Exception)value;
+
+				results.add(null);
+				errors.add(Arrays.asList(exception.getClass().getName(), exception.getMessage()));
+			} else
+
+			{
+				results.add(value);
+				errors.add(null);
+			}
+		}
+
+		Map<String, Object> resultsDict = new HashMap<>();
+		resultsDict.put("results", results);
+		resultsDict.put("errors", errors);
+
+		return resultsDict;
+	}
+
+	static
+	public byte[] evaluateAllColumnar(Evaluator evaluator, byte[] tableBytes, boolean nanAsMissing, String[] dropColumns, int parallelism) throws IOException {
+		Table argumentsTable = ColumnarUtil.decodeTable(ByteBuffer.wrap(tableBytes), nanAsMissing);
+
+		Table resultsTable = evaluateAll(evaluator, argumentsTable, (dropColumns != null ? toSet(dropColumns) : null), parallelism);
+
+		return ColumnarUtil.encodeTable(resultsTable);
+	}
+
+	/**
+	 * <p>
+	 * Evaluates a table, whose numeric columns are exchanged via (direct-) buffers, and the rest via the columnar binary encoding.
+	 * </p>
+	 *
+	 * @param columns The names of buffer-backed argument columns.
+	 * @param values The argument values, one {@link DoubleBuffer} or {@link LongBuffer} per column.
+	 * @param masks The argument missing value masks, one byte-per-row {@link ByteBuffer} or <code>null</code> per column.
+	 * @param resultColumns The names of buffer-backed result columns.
+	 * @param resultValues The preallocated result values, one {@link DoubleBuffer} or {@link LongBuffer} per column.
+	 * @param resultMasks The preallocated result missing value masks, one byte-per-row {@link ByteBuffer} per column.
+	 *
+	 * @return The remaining result columns and errors, in the columnar binary encoding.
+	 *
+	 * @see ColumnarUtil
+	 */
+	static
+	public byte[] evaluateAllBuffers(Evaluator evaluator, byte[] tableBytes, String[] columns, Buffer[] values, ByteBuffer[] masks, boolean nanAsMissing, String[] dropColumns, int parallelism, String[] resultColumns, Buffer[] resultValues, ByteBuffer[] resultMasks) throws IOException {
+		Table argumentsTable = ColumnarUtil.decodeTable(ByteBuffer.wrap(tableBytes), nanAsMissing);
+
+		for(int i = 0; i < columns.length; i++){
+			ColumnarUtil.setValues(argumentsTable, columns[i], values[i], masks[i], nanAsMissing);
+		}
+
+		Table resultsTable = evaluateAll(evaluator, argumentsTable, (dropColumns != null ? toSet(dropColumns) : null), parallelism);
+
+		int numberOfRows = resultsTable.getNumberOfRows();
+
+		for(int i = 0; i < resultColumns.length; i++){
+			ColumnarUtil.copyValues(resultsTable, resultColumns[i], resultValues[i], resultMasks[i]);
+
+			resultsTable.removeColumn(resultColumns[i]);
+		}
+
+		return ColumnarUtil.encodeTable(resultsTable, numberOfRows);
+	}
+
+	/**
+	 * <p>
+	 * Evaluates a CSV file, and writes the results into another CSV file.
+	 * </p>
+	 *
+	 * <p>
+	 * Rows are read, evaluated and written in batches.
+	 * Empty cells are interpreted as missing values.
+	 * </p>
+	 *
+	 * @param separator The CSV separator character.
+	 * @param errorColumn The name of the error column, or <code>null</code>.
+	 * @param batchSize The number of rows per batch.
+	 *
+	 * @return The number of rows.
+	 */
+	static
+	public int evaluateFile(Evaluator evaluator, String inputPath, String outputPath, String separator, String[] dropColumns, String errorColumn, int batchSize, int parallelism) throws IOException {
+
+		if(separator.length() != 1){
+			throw new IllegalArgumentException("Separator \"" + separator + "\" is not a single character");
+		} // End if
+
+		if(batchSize < 1){
+			throw new IllegalArgumentException("Batch size " + batchSize + " is not positive");
+		}
+
+		Set<String> dropColumnSet = (dropColumns != null ? toSet(dropColumns) : null);
+
+		List<String> resultColumns = getResultFields(evaluator, dropColumnSet).stream()
+			.map(ResultField::getName)
+			.collect(Collectors.toList());
+
+		int count = 0;
+
+		try(CsvReader<CsvRecord> reader = CsvReader.builder().fieldSeparator(separator.charAt(0)).ofCsvRecord(Paths.get(inputPath)); CsvWriter writer = CsvWriter.builder().fieldSeparator(separator.charAt(0)).build(Paths.get(outputPath))){
+			Iterator<CsvRecord> records = reader.iterator();
+
+			List<String> header = new ArrayList<>();
+			header.addAll(resultColumns);
+
+			if(errorColumn != null){
+				header.add(errorColumn);
+			}
+
+			writer.writeRecord(header);
+
+			if(!records.hasNext()){
+				return count;
+			}
+
+			List<String> columns = (records.next()).getFields();
+
+			while(records.hasNext()){
+				Table argumentsTable = readBatch(records, columns, batchSize);
+
+				Table resultsTable = evaluateAll(evaluator, argumentsTable, dropColumnSet, parallelism);
 
+				writeBatch(writer, resultsTable, resultColumns, argumentsTable.getNumberOfRows(), errorColumn != null);
+
+				count += argumentsTable.getNumberOfRows();
+			}
+		}
+
+		return count;
+	}
+
+	static
+	public Table evaluateAll(Evaluator evaluator, Table argumentsTable, Set<String> dropColumns, int parallelism){
 		Function<Map<String, ?>, Object> function;
 
 		TableCollector tableCollector;
@@ -121,20 +354,7 @@ public class PythonEvaluatorUtil {
 		if(evaluator != null){
 			function = new EvaluatorFunction(evaluator);
 
-			List<ResultField> resultFields = Stream.concat(
-					(evaluator.getTargetFields()).stream(),
-					(evaluator.getOutputFields()).stream()
-				)
-				.filter(resultField -> {
-					String name = resultField.getName();
-
-					if(dropColumns != null && dropColumns.contains(name)){
-						return false;
-					}
-
-					return true;
-				})
-				.collect(Collectors.toList());
+			List<ResultField> resultFields = getResultFields(evaluator, dropColumns);
 
 			tableCollector = new ResultTableCollector(resultFields, true);
 		} else
@@ -169,35 +389,166 @@ public class PythonEvaluatorUtil {
 			};
 		}
 
-		Table resultsTable;
-
-		if(parallelism == -1){
-			resultsTable = argumentsTable.parallelStream()
+		if(parallelism == 1){
+			return argumentsTable.stream()
 				.map(function)
 				.collect(tableCollector);
+		}
+
+		ForkJoinPool forkJoinPool = getForkJoinPool(parallelism);
+
+		int batchSize = PythonEvaluatorUtil.batchSize;
+
+		if(forkJoinPool == null){
+			return collect(argumentsTable, function, tableCollector, batchSize);
+		}
+
+		ForkJoinTask<Table> forkJoinTask = ForkJoinTask.adapt(() -> {
+			return collect(argumentsTable, function, tableCollector, batchSize);
+		});
+
+		return forkJoinPool.invoke(forkJoinTask);
+	}
+
+	/**
+	 * <p>
+	 * Configures the default evaluation pool, which is used when <code>parallelism</code> is <code>-1</code>.
+	 * </p>
+	 *
+	 * <p>
+	 * Pools are long-lived, and shared with evaluations that request the same <code>parallelism</code> explicitly.
+	 * The previous default evaluation pool (if any) is retired, but not shut down,
+	 * because other threads may still be evaluating in it.
+	 * </p>
+	 *
+	 * @param parallelism The number of threads, or <code>-1</code> to use the common pool.
+	 * @param batchSize The minimum number of rows per parallel task.
+	 */
+	static
+	public void setEvaluationPool(int parallelism, int batchSize){
+
+		if(batchSize < 1){
+			throw new IllegalArgumentException("Batch size " + batchSize + " is not positive");
+		}
+
+		ForkJoinPool forkJoinPool = (parallelism != -1 ? getForkJoinPool(parallelism) : null);
+
+		synchronized(PythonEvaluatorUtil.class){
+			PythonEvaluatorUtil.evaluationPool = forkJoinPool;
+			PythonEvaluatorUtil.batchSize = batchSize;
+		}
+	}
+
+	/**
+	 * <p>
+	 * Creates a string array from a pickled list of strings.
+	 * </p>
+	 *
+	 * <p>
+	 * Socket-based backends transfer the array in a single call,
+	 * instead of setting it element by element.
+	 * </p>
+	 */
+	static
+	public String[] newStringArray(byte[] listBytes) throws IOException {
+		List<?> values = (List<?>)unpickle(listBytes);
+
+		String[] result = new String[values.size()];
+
+		for(int i = 0; i < result.length; i++){
+			Object value = values.get(i);
+
+			if(value != null && !(value instanceof String)){
+				throw new IllegalArgumentException("Expected a string, got " + (value.getClass()).getName());
+			}
+
+			result[i] = (String)value;
+		}
+
+		return result;
+	}
+
+	/**
+	 * <p>
+	 * Flattens the continuous domain of an input field into an array of interval endpoints
+	 * <code>[lower_0, upper_0, lower_1, upper_1, ...]</code>.
+	 * Unbounded endpoints are represented by infinities.
+	 * </p>
+	 *
+	 * <p>
+	 * Backends get plain values, instead of Guava range objects.
+	 * </p>
+	 *
+	 * @return The array, or <code>null</code> if all values are valid.
+	 */
+	static
+	public double[] getContinuousDomain(InputField inputField){
+		RangeSet<Double> rangeSet = inputField.getContinuousDomain();
+
+		if(rangeSet == null){
+			return null;
+		}
+
+		Set<Range<Double>> ranges = rangeSet.asRanges();
+
+		double[] result = new double[2 * ranges.size()];
+
+		int i = 0;
+
+		for(Range<Double> range : ranges){
+			result[i++] = (range.hasLowerBound() ? range.lowerEndpoint() : Double.NEGATIVE_INFINITY);
+			result[i++] = (range.hasUpperBound() ? range.upperEndpoint() : Double.POSITIVE_INFINITY);
+		}
+
+		return result;
+	}
+
+	static
+	private Table collect(Table table, Function<Map<String, ?>, Object> function, TableCollector tableCollector, int batchSize){
+		Stream<Table.Row> stream = StreamSupport.stream(new BatchSpliterator<>(table.spliterator(), batchSize), true);
+
+		return stream
+			.map(function)
+			.collect(tableCollector);
+	}
+
+	static
+	private <E> List<Object> collect(List<? extends E> list, Function<? super E, Object> function, int batchSize){
+		Stream<? extends E> stream = StreamSupport.stream(new BatchSpliterator<>(list.spliterator(), batchSize), true);
+
+		return stream
+			.map(function)
+			.collect(Collectors.toList());
+	}
+
+	static
+	private ForkJoinPool getForkJoinPool(int parallelism){
+
+		if(parallelism == -1){
+			return PythonEvaluatorUtil.evaluationPool;
 		} else
 
-		if(parallelism == 1){
-			resultsTable = argumentsTable.stream()
-				.map(function)
-				.collect(tableCollector);
+		if(parallelism < 1){
+			throw new IllegalArgumentException("Parallelism " + parallelism + " is not positive");
 		} else
 
-		{
-			ForkJoinPool forkJoinPool = new ForkJoinPool(parallelism);
+		// Bounds the number of cached pools (whose idle threads are reclaimed by the pool itself)
+		if(parallelism > PythonEvaluatorUtil.MAX_PARALLELISM){
+			throw new IllegalArgumentException("Parallelism " + parallelism + " is greater than " + PythonEvaluatorUtil.MAX_PARALLELISM);
+		}
 
-			ForkJoinTask<Table> forkJoinTask = ForkJoinTask.adapt(() -> {
-				return argumentsTable.parallelStream()
-					.map(function)
-					.collect(tableCollector);
-			});
+		return PythonEvaluatorUtil.forkJoinPools.computeIfAbsent(parallelism, ForkJoinPool::new);
+	}
 
-			resultsTable = forkJoinPool.invoke(forkJoinTask);
+	static
+	public Object toJavaPrimitive(Object value, boolean nanAsMissing){
+		value = toJavaPrimitive(value);
 
-			forkJoinPool.shutdown();
+		if(nanAsMissing && ColumnarUtil.isNaN(value)){
+			return null;
 		}
 
-		return formatDict(resultsTable);
+		return value;
 	}
 
 	static
@@ -236,6 +587,87 @@ public class PythonEvaluatorUtil {
 		}
 	}
 
+	static
+	private List<ResultField> getResultFields(Evaluator evaluator, Set<String> dropColumns){
+		return Stream.concat(
+				(evaluator.getTargetFields()).stream(),
+				(evaluator.getOutputFields()).stream()
+			)
+			.filter(resultField -> {
+				String name = resultField.getName();
+
+				if(dropColumns != null && dropColumns.contains(name)){
+					return false;
+				}
+
+				return true;
+			})
+			.collect(Collectors.toList());
+	}
+
+	static
+	private Table readBatch(Iterator<CsvRecord> records, List<String> columns, int batchSize){
+		List<List<String>> data = new ArrayList<>();
+
+		for(int i = 0; i < columns.size(); i++){
+			data.add(new ArrayList<>(Math.min(batchSize, 1024)));
+		}
+
+		for(int row = 0; row < batchSize && records.hasNext(); row++){
+			CsvRecord record = records.next();
+
+			if(record.getFieldCount() != columns.size()){
+				throw new IllegalArgumentException("Expected " + columns.size() + " fields, got " + record.getFieldCount() + " fields (line " + record.getStartingLineNumber() + ")");
+			}
+
+			for(int i = 0; i < columns.size(); i++){
+				String value = record.getField(i);
+
+				data.get(i).add(!value.isEmpty() ? value : null);
+			}
+		}
+
+		Table result = new Table(columns, 0);
+
+		for(int i = 0; i < columns.size(); i++){
+			result.setValues(columns.get(i), data.get(i));
+		}
+
+		return result;
+	}
+
+	static
+	private void writeBatch(CsvWriter writer, Table table, List<String> columns, int numberOfRows, boolean writeErrors){
+		List<List<?>> data = new ArrayList<>();
+
+		for(String column : columns){
+			data.add(table.getValues(column));
+		}
+
+		List<Exception> exceptions = (table.hasExceptions() ? table.getExceptions() : null);
+
+		String[] values = new String[columns.size() + (writeErrors ? 1 : 0)];
+
+		for(int row = 0; row < numberOfRows; row++){
+
+			for(int i = 0; i < columns.size(); i++){
+				List<?> columnValues = data.get(i);
+
+				Object value = (columnValues != null && row < columnValues.size() ? columnValues.get(row) : null);
+
+				values[i] = (value != null ? value.toString() : "");
+			}
+
+			if(writeErrors){
+				Exception exception = (exceptions != null && row < exceptions.size() ? exceptions.get(row) : null);
+
+				values[columns.size()] = (exception != null ? exception.toString() : "");
+			}
+
+			writer.writeRecord(values);
+		}
+	}
+
 	static
 	private <E> Set<E> toSet(E[] values){
 
@@ -253,7 +685,7 @@ public class PythonEvaluatorUtil {
 	}
 
 	static
-	private Table parseDict(Map<String, ?> dict){
+	private Table parseDict(Map<String, ?> dict, boolean nanAsMissing){
 		List<String> columns = (List)dict.get("columns");
 		List<List<?>> data = (List)dict.get("data");
 
@@ -267,6 +699,10 @@ public class PythonEvaluatorUtil {
 			String column = columns.get(i);
 			List<?> values = data.get(i);
 
+			if(nanAsMissing){
+				values = ColumnarUtil.replaceNaN(values);
+			}
+
 			result.setValues(column, values);
 		}
 
@@ -317,6 +753,14 @@ public class PythonEvaluatorUtil {
 		return pickler.dumps(object);
 	}
 
+	private static volatile ForkJoinPool evaluationPool = null;
+
+	private static volatile int batchSize = 1;
+
+	private static final ConcurrentMap<Integer, ForkJoinPool> forkJoinPools = new ConcurrentHashMap<>();
+
+	public static final int MAX_PARALLELISM = 256;
+
 	static {
 		ClassLoader clazzLoader = PythonEvaluatorUtil.class.getClassLoader();
 